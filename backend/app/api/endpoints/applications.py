@@ -15,6 +15,7 @@ from app.schemas.application import (
 )
 from app.api.endpoints.auth import get_current_user
 from app.models.auth import User
+from app.utils.pagination import paginate
 
 
 router = APIRouter()
@@ -70,12 +71,15 @@ async def get_applications(
     current_user: User = Depends(get_current_user),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor or prev_cursor of a previous response; replaces page"),
     job_id: Optional[str] = Query(None, description="Filter by job ID"),
     candidate_id: Optional[str] = Query(None, description="Filter by candidate ID"),
     status: Optional[str] = Query(None, description="Filter by application status")
 ):
     """
-    Get all applications with optional filtering and pagination.
+    Get all applications with optional filtering and pagination, oldest first.
+    Pass a previous response's cursor (with the same filters) instead of a
+    page number to page by keyset; total is then not counted.
     """
     try:
         # Build query
@@ -89,27 +93,33 @@ async def get_applications(
         if status:
             query = query.find(Application.status == status)
         
-        # Get total count
-        total = await query.count()
+        # Get total count; cursor paging skips it, the first page already reported it
+        total = None if cursor else await query.count()
         
         # Apply pagination
-        applications = await query.skip((page - 1) * size).limit(size).to_list()
+        result = await paginate(query, size, page, cursor)
         
         # Convert to response format
         application_responses = [
             ApplicationResponse(
                 id=str(app.id),
                 **app.model_dump(exclude={"id"})
-            ) for app in applications
+            ) for app in result.items
         ]
         
         return ApplicationListResponse(
             applications=application_responses,
             total=total,
-            page=page,
-            size=size
+            page=None if cursor else page,
+            size=size,
+            next_cursor=result.next_cursor,
+            prev_cursor=result.prev_cursor
         )
         
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch applications: {str(e)}")
 
@@ -216,10 +226,12 @@ async def get_job_applications(
     current_user: User = Depends(get_current_user),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor or prev_cursor of a previous response; replaces page"),
     status: Optional[str] = Query(None, description="Filter by application status")
 ):
     """
-    Get all applications for a specific job.
+    Get all applications for a specific job, oldest first. Pass a previous
+    response's cursor instead of a page number to page by keyset.
     """
     try:
         # Verify job exists
@@ -234,26 +246,32 @@ async def get_job_applications(
         if status:
             query = query.find(Application.status == status)
         
-        # Get total count
-        total = await query.count()
+        # Get total count; cursor paging skips it, the first page already reported it
+        total = None if cursor else await query.count()
         
         # Apply pagination
-        applications = await query.skip((page - 1) * size).limit(size).to_list()
+        result = await paginate(query, size, page, cursor)
         
         # Convert to response format
         application_responses = [
             ApplicationResponse(
                 id=str(app.id),
                 **app.model_dump(exclude={"id"})
-            ) for app in applications
+            ) for app in result.items
         ]
         
         return ApplicationListResponse(
             applications=application_responses,
             total=total,
-            page=page,
-            size=size
+            page=None if cursor else page,
+            size=size,
+            next_cursor=result.next_cursor,
+            prev_cursor=result.prev_cursor
         )
         
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch job applications: {str(e)}") 
\ No newline at end of file
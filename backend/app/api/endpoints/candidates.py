@@ -1,15 +1,58 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Depends, status
+from fastapi import APIRouter, HTTPException, UploadFile, File, Depends, Query, status
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import List
+from beanie import PydanticObjectId
+from beanie.operators import In
+from typing import AsyncIterator, List, Optional
 import os
-import shutil
+import time
+import uuid
+import tempfile
 from datetime import datetime
 import logging
 
 from app.config import settings
-from app.models.candidate import Candidate, ResumeExtraction, BatchExtractionResult
-from app.services.resume_extractor import ResumeExtractor
-from app.api.endpoints.auth import verify_token
+from app.models.candidate import Candidate, CandidateSummaryFields, ResumeExtraction, BatchExtractionResult
+from app.models.job import Job
+from app.models.auth import User
+from app.services.resume_extractor import ResumeExtractor, PROMPT_VERSION
+from app.services.ingestion_pipeline import IngestionPipeline
+from app.services.extraction_cache import ExtractionCache
+from app.services.ingestion_queue import create_ingestion_queue
+from app.services.resume_storage import store_upload
+from app.services.embedding_store import candidate_text
+from app.services.skill_vocabulary import SkillVocabulary
+from app.services.bitmap_index import CandidateFilterIndex, FacetCache, FACET_KINDS, normalize_location
+from app.services.candidate_search import CandidateSearchIndex, candidate_fields
+from app.services.autocomplete import AutocompleteService, SUGGESTION_KINDS
+from app.services.fuzzy_index import CandidateFuzzyIndex, DEFAULT_THRESHOLD, FUZZY_FIELDS
+from app.services.text_index import highlight_fields
+from app.schemas.matching import JobSimilarity, CandidateJobsResponse
+from app.schemas.candidate import (
+    CandidateFilterRequest,
+    CandidateFilterResponse,
+    CandidateSearchHit,
+    CandidateSearchResponse,
+    Suggestion,
+    SuggestResponse,
+    FuzzyMatch,
+    FuzzySearchResponse,
+    CandidateSummary,
+    CandidateSummaryPage,
+    CandidateFacetRequest,
+    FacetBucket,
+    CandidateFacetResponse
+)
+from app.schemas.ingestion import (
+    SpooledUpload,
+    IngestionTask,
+    FileIngestionStatus,
+    IngestionBatchStatus,
+    IngestionBatchAccepted
+)
+from app.api.endpoints.auth import verify_token, users_db
+from app.api.endpoints.matching import embedding_service, match_updater
+from app.utils.pagination import paginate
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -23,6 +66,97 @@ security = HTTPBearer()
 # Initialize resume extractor
 resume_extractor = ResumeExtractor()
 
+# Content-addressed extraction cache shared by all uploads
+extraction_cache = ExtractionCache(settings.MISTRAL_MODEL, PROMPT_VERSION) if settings.EXTRACTION_CACHE_ENABLED else None
+
+# Canonical skills; candidates store their skills as integer IDs from it
+skill_vocabulary = SkillVocabulary()
+
+# Skill, location and job bitmaps for structured candidate filters
+candidate_filter_index = CandidateFilterIndex()
+
+# Faceted results per filter combination, dropped whenever the filter index changes
+facet_cache = FacetCache()
+
+# BM25 full-text index behind /search
+candidate_search_index = CandidateSearchIndex()
+
+# Typeahead over candidate names, skills, companies and job titles
+autocomplete = AutocompleteService(skill_vocabulary)
+
+# Trigram index for typo-tolerant lookup of names, emails and skills
+candidate_fuzzy_index = CandidateFuzzyIndex()
+
+
+async def sync_candidate_indexes():
+    """Startup: resolve missing skill IDs, then build the filter bitmaps and the search indexes"""
+    await skill_vocabulary.sync()
+    try:
+        await candidate_filter_index.rebuild()
+    except Exception as e:
+        logger.warning(f"Candidate filter index build failed: {e}")
+    try:
+        await candidate_search_index.rebuild()
+    except Exception as e:
+        logger.warning(f"Candidate search index build failed: {e}")
+    try:
+        await autocomplete.rebuild()
+    except Exception as e:
+        logger.warning(f"Autocomplete index build failed: {e}")
+    try:
+        await candidate_fuzzy_index.rebuild()
+    except Exception as e:
+        logger.warning(f"Candidate fuzzy index build failed: {e}")
+
+
+async def on_candidates_inserted(candidates: List[Candidate]):
+    """Bring vectors, filter bitmaps, search indexes and stored job matches up to date with new candidates"""
+    candidate_filter_index.add(candidates)
+    candidate_search_index.add(candidates)
+    autocomplete.add_candidates(candidates)
+    candidate_fuzzy_index.add(candidates)
+    await embedding_service.index_candidates(candidates)
+    await match_updater.candidates_added(candidates)
+
+
+# Initialize staged ingestion pipeline
+ingestion_pipeline = IngestionPipeline(
+    resume_extractor,
+    cache=extraction_cache,
+    vocabulary=skill_vocabulary,
+    on_inserted=on_candidates_inserted
+)
+
+# Queue that decouples uploads from processing
+ingestion_queue = create_ingestion_queue()
+
+
+async def process_ingestion_task(task: IngestionTask):
+    """Worker handler: run a queued batch and publish its progress"""
+    batch_status = await ingestion_queue.get_status(task.batch_id)
+    if batch_status is None:
+        batch_status = IngestionBatchStatus(
+            batch_id=task.batch_id,
+            files=[FileIngestionStatus(filename=f.filename) for f in task.files],
+            result=BatchExtractionResult(total_files=len(task.files), succeeded=0, failed=0, failed_files=[], results=[])
+        )
+    batch_status.status = "processing"
+    await ingestion_queue.save_status(batch_status)
+
+    async def on_progress(outcomes):
+        batch_status.files = [
+            FileIngestionStatus(filename=o.filename, state=o.state, error=o.error)
+            for o in outcomes
+        ]
+        batch_status.result = ingestion_pipeline.build_result(outcomes)
+        batch_status.updated_at = datetime.utcnow()
+        await ingestion_queue.save_status(batch_status)
+
+    batch_status.result = await ingestion_pipeline.run(task.files, task.uploaded_by, task.job_id, on_progress)
+    batch_status.status = "completed"
+    batch_status.updated_at = datetime.utcnow()
+    await ingestion_queue.save_status(batch_status)
+
 @router.post("/debug-extract")
 async def debug_resume_extraction(
     file: UploadFile = File(...),
@@ -34,20 +168,16 @@ async def debug_resume_extraction(
     try:
         logger.info(f"Debug extraction for file: {file.filename}")
         
-        # Save file temporarily
-        import tempfile
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
-        
-        try:
+        # Stream the file to a scratch directory; debug uploads are not kept
+        with tempfile.TemporaryDirectory() as temp_dir:
+            stored = await store_upload(file, temp_dir)
+            
             # Extract text from PDF
-            extracted_text, num_pages = resume_extractor.extract_text_from_pdf(temp_file_path)
+            extracted_text, num_pages = await ingestion_pipeline.pdf_engine.extract(stored.path)
             
             # Try LLM extraction
             try:
-                resume_data = resume_extractor.extract_resume_data(extracted_text, num_pages)
+                resume_data = await resume_extractor.extract_resume_data_async(extracted_text, num_pages)
                 llm_success = True
             except Exception as e:
                 logger.error(f"LLM extraction failed: {e}")
@@ -56,7 +186,7 @@ async def debug_resume_extraction(
             
             return {
                 "filename": file.filename,
-                "file_size": len(content),
+                "file_size": stored.size,
                 "num_pages": num_pages,
                 "extracted_text_length": len(extracted_text),
                 "extracted_text_preview": extracted_text[:1000] + "..." if len(extracted_text) > 1000 else extracted_text,
@@ -68,130 +198,345 @@ async def debug_resume_extraction(
                     "total_lines": len(extracted_text.split('\n'))
                 }
             }
-            
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
                 
     except Exception as e:
         logger.error(f"Debug extraction failed: {e}")
         raise HTTPException(status_code=500, detail=f"Debug extraction failed: {str(e)}")
 
-@router.post("/upload", response_model=BatchExtractionResult)
+@router.post("/upload", response_model=IngestionBatchAccepted, status_code=status.HTTP_202_ACCEPTED)
 async def upload_resumes(
     files: List[UploadFile] = File(...),
     job_id: str = None,  # Optional job ID for job-specific uploads
     payload: dict = Depends(verify_token)
 ):
     """
-    Upload one or more resume PDFs and extract structured data from each.
-    Returns a summary with counters and results.
+    Upload one or more resume PDFs for background extraction.
+    Returns a batch ID right away; poll /batches/{batch_id} for progress and results.
     """
     uploaded_by = payload.get("sub")  # User email from JWT
-    results = []
-    failed_files = []
-    
-    logger.info(f"Starting batch upload of {len(files)} files")
-    
+    batch_id = uuid.uuid4().hex
+
+    # Stream each PDF to its final storage location; the request's file handles close once we return
+    spooled = []
     for file in files:
-        try:
-            logger.info(f"Processing file: {file.filename}")
-            
-            # Validate file type
-            if not file.filename.lower().endswith('.pdf'):
-                logger.warning(f"File {file.filename} is not a PDF")
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"File {file.filename} is not a PDF"
-                )
-            
-            # Normalize filename
-            normalized_filename = file.filename.strip().lower()
-            
-            # Check if file already processed
-            existing_candidate = await Candidate.find_one({"filename": normalized_filename})
-            if existing_candidate:
-                logger.info(f"File already processed: {file.filename}")
-                results.append(ResumeExtraction(
-                    full_name=existing_candidate.full_name,
-                    email=existing_candidate.email,
-                    phone=existing_candidate.phone,
-                    location=existing_candidate.location,
-                    summary=existing_candidate.summary,
-                    skills=existing_candidate.skills,
-                    experience=existing_candidate.experience,
-                    education=existing_candidate.education
-                ))
+        if file.filename.lower().endswith('.pdf'):
+            spooled.append(await store_upload(file, resume_extractor.upload_dir))
+        else:
+            spooled.append(SpooledUpload(filename=file.filename))
+
+    await ingestion_queue.save_status(IngestionBatchStatus(
+        batch_id=batch_id,
+        files=[FileIngestionStatus(filename=f.filename) for f in spooled],
+        result=BatchExtractionResult(total_files=len(spooled), succeeded=0, failed=0, failed_files=[], results=[])
+    ))
+    await ingestion_queue.enqueue(IngestionTask(
+        batch_id=batch_id,
+        uploaded_by=uploaded_by,
+        job_id=job_id,
+        files=spooled
+    ))
+    logger.info(f"Queued batch {batch_id} with {len(spooled)} files")
+
+    return IngestionBatchAccepted(
+        batch_id=batch_id,
+        status_url=f"{settings.API_V1_STR}/candidates/batches/{batch_id}",
+        total_files=len(spooled)
+    )
+
+@router.get("/batches/{batch_id}", response_model=IngestionBatchStatus)
+async def get_upload_batch(batch_id: str, payload: dict = Depends(verify_token)):
+    """Per-file state and partial results of an upload batch"""
+    batch_status = await ingestion_queue.get_status(batch_id)
+    if batch_status is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return batch_status
+
+@router.get("/cache/stats")
+async def get_extraction_cache_stats(payload: dict = Depends(verify_token)):
+    """Hit/miss counters for the extraction cache in this worker"""
+    if extraction_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **extraction_cache.stats()}
+
+@router.get("/llm/status")
+async def get_llm_status(payload: dict = Depends(verify_token)):
+    """Circuit breaker state and JSON recovery counters of the Mistral client in this worker"""
+    return {
+        **resume_extractor.client_manager.stats(),
+        "json_recovery": resume_extractor.json_recovery.stats()
+    }
+
+@router.post("/skills/backfill")
+async def backfill_skill_ids(
+    rebuild: bool = Query(False, description="Re-resolve every candidate, not only those without skill IDs"),
+    payload: dict = Depends(verify_token)
+):
+    """Resolve canonical skill IDs for stored candidates in bulk"""
+    try:
+        await skill_vocabulary.load()
+        result = await skill_vocabulary.backfill(rebuild)
+        await candidate_filter_index.rebuild()
+        return result
+    except Exception as e:
+        logger.error(f"Skill ID backfill failed: {e}")
+        raise HTTPException(status_code=500, detail="Failed to backfill skill IDs")
+
+@router.get("/skills/vocabulary")
+async def get_skill_vocabulary(payload: dict = Depends(verify_token)):
+    """Size of the canonical skill vocabulary"""
+    return skill_vocabulary.stats()
+
+def resolve_filter(request: CandidateFilterRequest):
+    """
+    Bitmap keys of a filter request: (all_of, any_of, none_of, per-term
+    counts, unknown skills, whether the filter can match anybody)
+    """
+    counts = {}
+    unknown = []
+
+    def skill_keys(names: List[str]) -> list:
+        keys = []
+        for name in names:
+            skill_id = skill_vocabulary.lookup(name)
+            if skill_id is None:
+                unknown.append(name)
                 continue
-            
-            logger.info(f"Extracting data from: {file.filename}")
-            
-            # Extract resume data
-            resume_data = await resume_extractor.process_resume(file, uploaded_by)
-            
-            logger.info(f"Extraction completed for {file.filename}:")
-            logger.info(f"  - Name: {resume_data.full_name}")
-            logger.info(f"  - Email: {resume_data.email}")
-            logger.info(f"  - Skills: {len(resume_data.skills)}")
-            logger.info(f"  - Experience: {len(resume_data.experience)}")
-            logger.info(f"  - Education: {len(resume_data.education)}")
-            
-            # Save PDF file
-            file_path = os.path.join(resume_extractor.upload_dir, normalized_filename)
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
-            
-            # Create candidate document
-            candidate = Candidate(
-                filename=file.filename,
-                full_name=resume_data.full_name,
-                email=resume_data.email,
-                phone=resume_data.phone,
-                location=resume_data.location,
-                summary=resume_data.summary,
-                skills=resume_data.skills,
-                experience=resume_data.experience,
-                education=resume_data.education,
-                certifications=resume_data.certifications,
-                languages=resume_data.languages,
-                resume_url=file_path,
-                job_id=job_id,  # Job-specific upload
-                uploaded_by=uploaded_by
-            )
-            
-            # Save to database
-            await candidate.insert()
-            logger.info(f"Saved candidate to database: {candidate.id}")
-            
-            results.append(resume_data)
-            logger.info(f"Successfully processed: {file.filename}")
-            
-        except Exception as e:
-            logger.error(f"Failed to process {file.filename}: {e}")
-            failed_files.append(file.filename)
-    
-    logger.info(f"Batch upload completed:")
-    logger.info(f"  - Total files: {len(files)}")
-    logger.info(f"  - Succeeded: {len(results)}")
-    logger.info(f"  - Failed: {len(failed_files)}")
-    if failed_files:
-        logger.error(f"Failed files: {failed_files}")
-    
-    return BatchExtractionResult(
-        total_files=len(files),
-        succeeded=len(results),
-        failed=len(failed_files),
-        failed_files=failed_files,
-        results=results
+            keys.append(("skill", skill_id))
+            counts[f"skill:{skill_vocabulary.name(skill_id)}"] = len(candidate_filter_index.bitmap("skill", skill_id))
+        return keys
+
+    all_of = skill_keys(request.skills_all)
+    any_of = [skill_keys(request.skills_any)] if request.skills_any else []
+    none_of = skill_keys(request.skills_none)
+    if request.locations:
+        any_of.append([("location", key) for name in request.locations for key in normalize_location(name)[:1]])
+    if request.job_ids:
+        any_of.append([("job", job_id) for job_id in request.job_ids])
+    for kind, value in (key for group in any_of[1 if request.skills_any else 0:] for key in group):
+        counts[f"{kind}:{value}"] = len(candidate_filter_index.bitmap(kind, value))
+
+    # An unknown required skill matches nobody; any-of groups that resolved to nothing likewise
+    matchable = not (any(name in unknown for name in request.skills_all) or any(not group for group in any_of))
+    return all_of, any_of, none_of, counts, unknown, matchable
+
+@router.post("/filter", response_model=CandidateFilterResponse)
+async def filter_candidates(request: CandidateFilterRequest, payload: dict = Depends(verify_token)):
+    """
+    Candidates matching a boolean filter, e.g. Python AND Kubernetes AND NOT
+    Java, uploaded for a given job. Answered from in-memory bitmaps.
+    """
+    try:
+        if not skill_vocabulary.loaded:
+            await skill_vocabulary.load()
+        if not candidate_filter_index.built:
+            await candidate_filter_index.rebuild()
+
+        start = time.perf_counter()
+        all_of, any_of, none_of, counts, unknown, matchable = resolve_filter(request)
+        if matchable:
+            result = candidate_filter_index.evaluate(all_of, any_of, none_of)
+            total = len(result)
+            result_ids = candidate_filter_index.page(result, request.offset, request.limit)
+        else:
+            result_ids, total = [], 0
+
+        return CandidateFilterResponse(
+            total=total,
+            offset=request.offset,
+            limit=request.limit,
+            candidate_ids=result_ids,
+            counts=counts,
+            unknown_skills=unknown,
+            elapsed_us=round((time.perf_counter() - start) * 1e6, 1)
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to filter candidates: {e}")
+        raise HTTPException(status_code=500, detail="Failed to filter candidates")
+
+async def load_summaries(candidate_ids: List[str]) -> List[CandidateSummary]:
+    """Summaries of the given candidates in the given order; section sizes are counted by MongoDB"""
+    query = Candidate.find(In(Candidate.id, [PydanticObjectId(cid) for cid in candidate_ids]))
+    rows = {str(row.id): row for row in await query.project(CandidateSummaryFields).to_list()}
+    return [to_summary(rows[cid]) for cid in candidate_ids if cid in rows]
+
+def to_summary(fields: CandidateSummaryFields) -> CandidateSummary:
+    return CandidateSummary(
+        id=str(fields.id),
+        **fields.model_dump(exclude={"id", "created_at"}),
+        created_at=fields.created_at.isoformat()
     )
 
+async def facet_labels(facets: dict) -> dict:
+    """Display names for skill IDs, job IDs and uploaders (token subjects, i.e. emails) among facet values"""
+    labels = {("skill", value): skill_vocabulary.name(value) for value, _ in facets.get("skill", [])}
+    job_ids = [PydanticObjectId(value) for value, _ in facets.get("job", []) if PydanticObjectId.is_valid(value)]
+    if job_ids:
+        async for job in Job.get_pymongo_collection().find({"_id": {"$in": job_ids}}, {"title": 1}):
+            labels[("job", str(job["_id"]))] = job.get("title")
+    emails = [value for value, _ in facets.get("uploader", [])]
+    for email in emails:
+        if email in users_db:
+            labels[("uploader", email)] = users_db[email]["full_name"]
+    if emails:
+        async for user in User.get_pymongo_collection().find({"email": {"$in": emails}}, {"email": 1, "full_name": 1}):
+            labels[("uploader", user["email"])] = user.get("full_name")
+    return labels
+
+@router.post("/facets", response_model=CandidateFacetResponse)
+async def facet_candidates(request: CandidateFacetRequest, payload: dict = Depends(verify_token)):
+    """
+    A page of candidates matching a filter plus counts per skill, location,
+    job and uploader over all matches, from the in-memory bitmaps. Results
+    are cached per filter combination until candidates change.
+    """
+    try:
+        unknown_facets = set(request.facets) - set(FACET_KINDS)
+        if unknown_facets:
+            raise ValueError(f"Unknown facets: {', '.join(sorted(unknown_facets))}")
+        if not skill_vocabulary.loaded:
+            await skill_vocabulary.load()
+        if not candidate_filter_index.built:
+            await candidate_filter_index.rebuild()
+
+        start = time.perf_counter()
+        version = candidate_filter_index.version
+        cache_key = request.model_dump_json()
+        cached = facet_cache.get(cache_key, version)
+        if cached is not None:
+            return cached.model_copy(update={"cached": True, "elapsed_us": round((time.perf_counter() - start) * 1e6, 1)})
+
+        all_of, any_of, none_of, _, unknown, matchable = resolve_filter(request)
+        if matchable:
+            result = candidate_filter_index.evaluate(all_of, any_of, none_of)
+            total = len(result)
+            page_ids = candidate_filter_index.page(result, request.offset, request.limit)
+            facets = candidate_filter_index.facets(result, request.facets, request.facet_limit)
+        else:
+            total, page_ids, facets = 0, [], {kind: [] for kind in request.facets}
+
+        labels = await facet_labels(facets)
+        response = CandidateFacetResponse(
+            total=total,
+            offset=request.offset,
+            limit=request.limit,
+            candidates=await load_summaries(page_ids),
+            facets={
+                kind: [FacetBucket(value=str(value), label=labels.get((kind, value)), count=count) for value, count in buckets]
+                for kind, buckets in facets.items()
+            },
+            unknown_skills=unknown,
+            elapsed_us=round((time.perf_counter() - start) * 1e6, 1)
+        )
+        facet_cache.put(cache_key, version, response)
+        return response
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to facet candidates: {e}")
+        raise HTTPException(status_code=500, detail="Failed to facet candidates")
+
+@router.get("/filter/stats")
+async def get_filter_index_stats(payload: dict = Depends(verify_token)):
+    """Size of the candidate filter bitmaps and the facet cache in this worker"""
+    return {**candidate_filter_index.stats(), "facet_cache": facet_cache.stats()}
+
+@router.get("/suggest", response_model=SuggestResponse)
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=100, description="Prefix typed so far"),
+    kinds: List[str] = Query(list(SUGGESTION_KINDS), description="Any of: name, skill, company, job_title"),
+    limit: int = Query(10, ge=1, le=50, description="Number of suggestions"),
+    payload: dict = Depends(verify_token)
+):
+    """Typeahead suggestions for search boxes, most frequent first; any word of a suggestion can match"""
+    try:
+        unknown = set(kinds) - set(SUGGESTION_KINDS)
+        if unknown:
+            raise ValueError(f"Unknown suggestion kinds: {', '.join(sorted(unknown))}")
+        if not autocomplete.built:
+            await autocomplete.rebuild()
+        
+        start = time.perf_counter()
+        found = autocomplete.suggest(q, kinds, limit)
+        return SuggestResponse(
+            query=q,
+            suggestions=[Suggestion(kind=kind, text=text, count=count) for kind, text, count in found],
+            elapsed_us=round((time.perf_counter() - start) * 1e6, 1)
+        )
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to suggest for {q!r}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch suggestions")
+
+@router.get("/fuzzy", response_model=FuzzySearchResponse)
+async def fuzzy_search_candidates(
+    q: str = Query(..., min_length=1, max_length=200, description="Name, email or skill, typos allowed"),
+    fields: List[str] = Query(list(FUZZY_FIELDS), description="Any of: name, email, skill"),
+    limit: int = Query(20, ge=1, le=100, description="Number of candidates"),
+    threshold: float = Query(DEFAULT_THRESHOLD, gt=0, le=1, description="Minimum trigram similarity"),
+    payload: dict = Depends(verify_token)
+):
+    """
+    Typo-tolerant candidate lookup for values garbled by PDF extraction
+    (ligatures, broken hyphenation, OCR slips), ranked by trigram similarity
+    """
+    try:
+        unknown = set(fields) - set(FUZZY_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fuzzy fields: {', '.join(sorted(unknown))}")
+        if not candidate_fuzzy_index.built:
+            await candidate_fuzzy_index.rebuild()
+        
+        start = time.perf_counter()
+        found = candidate_fuzzy_index.search(q, fields, limit, threshold)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        names = {
+            str(c.id): c.full_name
+            for c in await Candidate.find(In(Candidate.id, [PydanticObjectId(cid) for cid, *_ in found])).to_list()
+        }
+        return FuzzySearchResponse(
+            query=q,
+            matches=[
+                FuzzyMatch(candidate_id=cid, full_name=names[cid], field=field, matched=value, similarity=round(score, 4))
+                for cid, field, value, score in found if cid in names
+            ],
+            elapsed_ms=round(elapsed_ms, 3)
+        )
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed fuzzy candidate search for {q!r}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to search candidates")
+
 @router.get("/all")
 async def get_all_candidates(
     job_id: str = None,  # Optional filter by job
+    size: Optional[int] = Query(None, ge=1, le=500, description="Page size; pages the list instead of returning all of it"),
+    cursor: Optional[str] = Query(None, description="next_cursor or prev_cursor of a previous page"),
+    page: int = Query(1, ge=1, description="Page number when paging without a cursor"),
     payload: dict = Depends(verify_token)
 ):
-    """Get all candidates with summary information"""
+    """
+    Get all candidates with summary information.
+
+    Only the summary fields are read, with section sizes counted by
+    MongoDB. Without ``size`` or ``cursor`` the whole list is streamed as a
+    JSON array; with them one page is returned in (created_at, _id) order
+    with cursors to its neighbours.
+    """
     try:
         # Build query
         query = Candidate.find()
@@ -200,32 +545,37 @@ async def get_all_candidates(
         if job_id:
             query = query.find(Candidate.job_id == job_id)
         
-        candidates = await query.to_list()
-        summary_list = []
+        if size is None and cursor is None:
+            return StreamingResponse(stream_summaries(query), media_type="application/json")
         
-        for candidate in candidates:
-            summary = {
-                "id": str(candidate.id),
-                "filename": candidate.filename,
-                "full_name": candidate.full_name,
-                "email": candidate.email,
-                "phone": candidate.phone,
-                "location": candidate.location,
-                "skills_count": len(candidate.skills),
-                "experience_count": len(candidate.experience),
-                "education_count": len(candidate.education),
-                "uploaded_by": candidate.uploaded_by,
-                "created_at": candidate.created_at.isoformat()
-            }
-            summary_list.append(summary)
-        
-        logger.info(f"Returning {len(summary_list)} candidate summaries")
-        return summary_list
+        size = size or 50
+        total = None if cursor else await query.count()
+        result = await paginate(query.project(CandidateSummaryFields), size, page, cursor)
+        return CandidateSummaryPage(
+            candidates=[to_summary(fields) for fields in result.items],
+            total=total,
+            page=None if cursor else page,
+            size=size,
+            next_cursor=result.next_cursor,
+            prev_cursor=result.prev_cursor
+        )
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to fetch candidates: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch candidates")
 
+async def stream_summaries(query) -> AsyncIterator[str]:
+    """The summary list as a JSON array, written as the MongoDB cursor yields batches"""
+    count = 0
+    yield "["
+    async for fields in query.project(CandidateSummaryFields):
+        yield ("," if count else "") + to_summary(fields).model_dump_json()
+        count += 1
+    yield "]"
+    logger.info(f"Streamed {count} candidate summaries")
+
 @router.get("/{candidate_id}")
 async def get_candidate(candidate_id: str, payload: dict = Depends(verify_token)):
     """Get detailed information for a specific candidate"""
@@ -259,6 +609,38 @@ async def get_candidate(candidate_id: str, payload: dict = Depends(verify_token)
         logger.error(f"Failed to fetch candidate {candidate_id}: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch candidate")
 
+@router.get("/{candidate_id}/similar-jobs", response_model=CandidateJobsResponse)
+async def get_similar_jobs(
+    candidate_id: str,
+    k: int = Query(10, ge=1, le=100, description="Number of jobs to return"),
+    nprobe: Optional[int] = Query(None, ge=1, description="Index lists to scan; higher trades latency for recall"),
+    payload: dict = Depends(verify_token)
+):
+    """Approximate top-k jobs for a candidate from the job vector index"""
+    try:
+        candidate = await Candidate.get(candidate_id)
+        if not candidate:
+            raise HTTPException(status_code=404, detail="Candidate not found")
+        
+        vector = await embedding_service.vector_for("candidates", candidate_id, candidate_text(candidate))
+        ranked, scored = embedding_service.search("jobs", vector, k, nprobe)
+        jobs = {str(j.id): j for j in await Job.find(In(Job.id, [PydanticObjectId(jid) for jid, _ in ranked])).to_list()}
+        
+        return CandidateJobsResponse(
+            candidate_id=candidate_id,
+            jobs_scored=scored,
+            jobs=[
+                JobSimilarity(job_id=jid, title=jobs[jid].title, company=jobs[jid].company, score=round(score, 4))
+                for jid, score in ranked if jid in jobs
+            ]
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to find similar jobs for candidate {candidate_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to find similar jobs")
+
 @router.delete("/{candidate_id}")
 async def delete_candidate(candidate_id: str, payload: dict = Depends(verify_token)):
     """Delete a candidate and their resume file"""
@@ -273,6 +655,12 @@ async def delete_candidate(candidate_id: str, payload: dict = Depends(verify_tok
         
         # Delete from database
         await candidate.delete()
+        candidate_filter_index.remove(str(candidate.id))
+        candidate_search_index.remove(str(candidate.id))
+        autocomplete.remove_candidate(candidate)
+        candidate_fuzzy_index.remove(str(candidate.id))
+        await embedding_service.remove_candidate(str(candidate.id))
+        match_updater.candidate_removed(str(candidate.id))
         
         return {"message": "Candidate deleted successfully"}
         
@@ -282,32 +670,48 @@ async def delete_candidate(candidate_id: str, payload: dict = Depends(verify_tok
         logger.error(f"Failed to delete candidate {candidate_id}: {e}")
         raise HTTPException(status_code=500, detail="Failed to delete candidate")
 
-@router.get("/search/{query}")
-async def search_candidates(query: str, payload: dict = Depends(verify_token)):
-    """Search candidates by name, skills, or other criteria"""
+@router.get("/search/{query}", response_model=CandidateSearchResponse)
+async def search_candidates(
+    query: str,
+    page: int = Query(1, ge=1, description="Page number"),
+    size: int = Query(20, ge=1, le=100, description="Results per page"),
+    payload: dict = Depends(verify_token)
+):
+    """Full-text candidate search over names, emails, skills, summaries and experience, ranked by BM25"""
     try:
-        # Simple search implementation
-        # You can enhance this with more sophisticated search
-        candidates = await Candidate.find({
-            "$or": [
-                {"full_name": {"$regex": query, "$options": "i"}},
-                {"skills.name": {"$regex": query, "$options": "i"}},
-                {"email": {"$regex": query, "$options": "i"}}
-            ]
-        }).to_list()
-        
+        if not candidate_search_index.built:
+            await candidate_search_index.rebuild()
+
+        start = time.perf_counter()
+        ranked, total = candidate_search_index.search(query, (page - 1) * size, size)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        terms = candidate_search_index.terms(query)
+        candidates = {
+            str(c.id): c
+            for c in await Candidate.find(In(Candidate.id, [PydanticObjectId(cid) for cid, _ in ranked])).to_list()
+        }
         results = []
-        for candidate in candidates:
-            results.append({
-                "id": str(candidate.id),
-                "full_name": candidate.full_name,
-                "email": candidate.email,
-                "skills": [skill.name for skill in candidate.skills],
-                "created_at": candidate.created_at.isoformat()
-            })
-        
-        return results
+        for candidate_id, score in ranked:
+            candidate = candidates.get(candidate_id)
+            if candidate is None:
+                continue
+            results.append(CandidateSearchHit(
+                id=candidate_id,
+                full_name=candidate.full_name,
+                email=candidate.email,
+                skills=[skill.name for skill in candidate.skills],
+                created_at=candidate.created_at.isoformat(),
+                score=round(score, 4),
+                highlights=highlight_fields(candidate_fields(candidate), terms)
+            ))
+
+        return CandidateSearchResponse(
+            query=query, total=total, page=page, size=size, results=results, elapsed_ms=round(elapsed_ms, 3)
+        )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to search candidates: {e}")
-        raise HTTPException(status_code=500, detail="Failed to search candidates") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to search candidates") 
@@ -3,6 +3,7 @@ from datetime import datetime
 from typing import List, Optional
 from fastapi import APIRouter, HTTPException, Depends, Query
 from beanie import PydanticObjectId
+from beanie.operators import In
 import logging
 
 from app.models.job import Job
@@ -12,14 +13,30 @@ from app.schemas.job import (
     JobResponse, 
     JobListResponse,
     JobParseRequest,
-    JobParseResponse
+    JobParseResponse,
+    JobParseBatchRequest,
+    JobParseBatchResponse
 )
 from app.api.endpoints.auth import get_current_user
+from app.api.endpoints.matching import embedding_service, match_updater
+from app.api.endpoints.candidates import resume_extractor, autocomplete
+from app.services.job_parser import JobParser
+from app.services.job_search import JobSearchIndex
 from app.models.auth import User
+from app.utils.pagination import paginate
 
 
 router = APIRouter()
 
+# Rule-based job description parser; shares the Mistral client for fields the rules miss
+job_parser = JobParser(resume_extractor.client_manager)
+
+# Stemmed BM25 index behind GET /jobs?search=
+job_search_index = JobSearchIndex()
+
+# Job fields that affect stored candidate matches
+MATCHED_FIELDS = {"title", "requirements", "description", "status", "is_active"}
+
 
 @router.post("/", response_model=JobResponse, summary="Create a new job posting")
 async def create_job(
@@ -70,6 +87,10 @@ async def create_job(
         
         # Save to database
         await job.insert()
+        job_search_index.add([job])
+        autocomplete.job_title_changed(str(job.id), job.title)
+        await embedding_service.index_job(job)
+        match_updater.job_changed(str(job.id))
         
         return JobResponse(
             id=str(job.id),
@@ -95,18 +116,21 @@ async def get_jobs(
     current_user: User = Depends(get_current_user),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor or prev_cursor of a previous response; replaces page"),
     status: Optional[str] = Query(None, description="Filter by status"),
     is_active: Optional[str] = Query(None, description="Filter by active status"),
     search: Optional[str] = Query(None, description="Search in title, company, or description")
 ):
     """
-    Get all jobs with optional filtering and pagination.
+    Get all jobs with optional filtering and pagination, oldest first.
     
     - **page**: Page number (default: 1)
     - **size**: Page size (default: 10, max: 100)
+    - **cursor**: Continue from a previous response's next_cursor or prev_cursor with the same filters;
+      every page then costs the same however deep it is, and total is not counted
     - **status**: Filter by job status (draft, published, closed)
     - **is_active**: Filter by active status
-    - **search**: Search term for title, company, or description
+    - **search**: Search term for title, company, or description; results are ranked by relevance
     """
     try:
         start_time = time.time()
@@ -114,6 +138,11 @@ async def get_jobs(
         # Parse boolean parameter
         is_active_bool = parse_bool_param(is_active)
         
+        if search and search.strip():
+            if cursor:
+                raise ValueError("Search results are paged by page number, not cursor")
+            return await search_jobs(search, page, size, status.strip() if status and status.strip() else None, is_active_bool)
+        
         # Build query
         query = Job.find()
         
@@ -122,22 +151,16 @@ async def get_jobs(
             query = query.find(Job.status == status)
         if is_active_bool is not None:
             query = query.find(Job.is_active == is_active_bool)
-        if search and search.strip():
-            # Search in title, company, and description
-            query = query.find(
-                (Job.title.contains(search, case_sensitive=False)) |
-                (Job.company.contains(search, case_sensitive=False)) |
-                (Job.description.contains(search, case_sensitive=False))
-            )
         
-        # Get total count
+        # Get total count; cursor paging skips it, the first page already reported it
         count_start = time.time()
-        total = await query.count()
+        total = None if cursor else await query.count()
         count_time = time.time() - count_start
         
         # Apply pagination
         data_start = time.time()
-        jobs = await query.skip((page - 1) * size).limit(size).to_list()
+        result = await paginate(query, size, page, cursor)
+        jobs = result.items
         data_time = time.time() - data_start
         
         total_time = time.time() - start_time
@@ -156,14 +179,41 @@ async def get_jobs(
         return JobListResponse(
             jobs=job_responses,
             total=total,
-            page=page,
-            size=size
+            page=None if cursor else page,
+            size=size,
+            next_cursor=result.next_cursor,
+            prev_cursor=result.prev_cursor
         )
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch jobs: {str(e)}")
 
 
+async def search_jobs(search: str, page: int, size: int, status: Optional[str], is_active: Optional[bool]) -> JobListResponse:
+    """Rank jobs for a search term on the in-memory index, then load the page from MongoDB"""
+    if not job_search_index.built:
+        await job_search_index.rebuild()
+    
+    start = time.perf_counter()
+    ranked, total = job_search_index.search(search, (page - 1) * size, size, status, is_active)
+    rank_time = time.perf_counter() - start
+    
+    jobs = {str(j.id): j for j in await Job.find(In(Job.id, [PydanticObjectId(jid) for jid, _ in ranked])).to_list()}
+    logging.info(
+        f"Jobs search performance - Rank: {rank_time * 1000:.2f}ms, "
+        f"Total: {(time.perf_counter() - start) * 1000:.2f}ms, Matches: {total}"
+    )
+    
+    return JobListResponse(
+        jobs=[JobResponse(id=jid, **jobs[jid].model_dump(exclude={"id"})) for jid, _ in ranked if jid in jobs],
+        total=total,
+        page=page,
+        size=size
+    )
+
+
 @router.get("/{job_id}", response_model=JobResponse, summary="Get a specific job")
 async def get_job(
     job_id: str,
@@ -212,6 +262,11 @@ async def update_job(
         
         # Save changes
         await job.save()
+        job_search_index.add([job])
+        autocomplete.job_title_changed(job_id, job.title)
+        await embedding_service.index_job(job)
+        if MATCHED_FIELDS & update_data.keys():
+            match_updater.job_changed(job_id)
         
         return JobResponse(
             id=str(job.id),
@@ -238,6 +293,10 @@ async def delete_job(
             raise HTTPException(status_code=404, detail="Job not found")
         
         await job.delete()
+        job_search_index.remove(job_id)
+        autocomplete.job_title_changed(job_id, None)
+        await embedding_service.remove_job(job_id)
+        match_updater.job_removed(job_id)
         
         return {"message": "Job deleted successfully"}
         
@@ -253,87 +312,43 @@ async def parse_job_description(
     current_user: User = Depends(get_current_user)
 ):
     """
-    Parse a job description using AI to extract structured data.
-    
-    This endpoint takes raw job description text and uses AI to extract:
-    - Job title
-    - Company name
-    - Location
-    - Job type
-    - Salary range
-    - Requirements
-    - Responsibilities
-    - Benefits
-    - Contact information
+    Parse a job description into structured fields.
+
+    Title, company, location, job type, salary range with currency and
+    unit, requirements, responsibilities, benefits, contact email, deadline
+    and required skills are extracted by precompiled rules; the LLM is only
+    asked for fields that are still empty.
     """
     try:
-        # For now, we'll implement a basic parsing logic
-        # TODO: Integrate with actual AI service (Mistral, OpenAI, etc.)
-        
-        # Simple parsing logic as placeholder
-        job_description = parse_request.job_description.lower()
-        
-        # Extract basic information (this is a simplified example)
-        parsed_data = {
-            "title": "",
-            "company": "",
-            "location": "",
-            "type": "full-time",
-            "salary_min": None,
-            "salary_max": None,
-            "description": parse_request.job_description,
-            "requirements": "",
-            "responsibilities": "",
-            "benefits": "",
-            "contact_email": "",
-            "application_deadline": None,
-            "confidence_score": 0.7,
-            "parsed_fields": []
-        }
-        
-        # Simple keyword extraction (replace with actual AI parsing)
-        if "senior" in job_description:
-            parsed_data["title"] = "Senior Software Engineer"
-            parsed_data["parsed_fields"].append("title")
-        
-        if "remote" in job_description:
-            parsed_data["location"] = "Remote"
-            parsed_data["parsed_fields"].append("location")
-        
-        if "full-time" in job_description:
-            parsed_data["type"] = "full-time"
-            parsed_data["parsed_fields"].append("type")
-        elif "part-time" in job_description:
-            parsed_data["type"] = "part-time"
-            parsed_data["parsed_fields"].append("type")
-        
-        # Extract salary information (basic regex)
-        import re
-        salary_pattern = r'\$?(\d{1,3}(?:,\d{3})*(?:k|K)?)'
-        salaries = re.findall(salary_pattern, job_description)
-        if len(salaries) >= 2:
-            try:
-                min_salary = int(salaries[0].replace(',', '').replace('k', '000').replace('K', '000'))
-                max_salary = int(salaries[1].replace(',', '').replace('k', '000').replace('K', '000'))
-                parsed_data["salary_min"] = min_salary
-                parsed_data["salary_max"] = max_salary
-                parsed_data["parsed_fields"].extend(["salary_min", "salary_max"])
-            except ValueError:
-                pass
-        
-        # Extract email
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, job_description)
-        if emails:
-            parsed_data["contact_email"] = emails[0]
-            parsed_data["parsed_fields"].append("contact_email")
-        
-        return JobParseResponse(**parsed_data)
-        
+        parsed = await job_parser.parse(parse_request.job_description)
+        return JobParseResponse(**parsed.model_dump())
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to parse job description: {str(e)}")
 
 
+@router.post("/parse/batch", response_model=JobParseBatchResponse, summary="Parse many job descriptions")
+async def parse_job_descriptions(
+    parse_request: JobParseBatchRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Parse up to 500 job descriptions in one call, e.g. when importing
+    postings. LLM calls for incomplete descriptions run concurrently.
+    """
+    try:
+        start = time.perf_counter()
+        parsed = await job_parser.parse_many(parse_request.job_descriptions, parse_request.use_llm)
+        return JobParseBatchResponse(
+            results=[JobParseResponse(**job.model_dump()) for job in parsed],
+            llm_fields_filled=sum(len(job.llm_fields) for job in parsed),
+            elapsed_ms=round((time.perf_counter() - start) * 1000, 1)
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to parse job descriptions: {str(e)}")
+
+
 @router.patch("/{job_id}/status", summary="Update job status")
 async def update_job_status(
     job_id: str,
@@ -356,6 +371,8 @@ async def update_job_status(
         job.status = status
         job.updated_at = datetime.utcnow()
         await job.save()
+        job_search_index.set_state(job_id, job.status, job.is_active)
+        match_updater.job_changed(job_id)
         
         return {"message": f"Job status updated to {status}"}
         
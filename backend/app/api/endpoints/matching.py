@@ -0,0 +1,144 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, HTTPException, Depends, Query
+from beanie import PydanticObjectId
+from beanie.operators import In
+import logging
+
+from app.models.job import Job
+from app.models.candidate import Candidate
+from app.models.job_matches import JobMatches
+from app.schemas.matching import CandidateMatch, JobMatchesResponse
+from app.services.matching import MatchingService, matched_skills
+from app.services.match_precompute import MatchPrecomputer
+from app.services.match_updates import MatchUpdater
+from app.services.embedding_store import EmbeddingService, job_text
+from app.api.endpoints.auth import get_current_user
+from app.models.auth import User
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Candidate matrix shared by all match requests
+matching_service = MatchingService()
+
+# Background job x candidate scoring into the job_matches collection
+match_precomputer = MatchPrecomputer(matching_service)
+
+# Patches stored matches as jobs and candidates change between full runs
+match_updater = MatchUpdater(match_precomputer)
+
+# Memory-mapped candidate and job vectors, updated as documents change
+embedding_service = EmbeddingService()
+
+
+async def _to_matches(job: Job, ranked: List[Tuple[str, float]]) -> List[CandidateMatch]:
+    """Load the ranked candidates and describe each match, keeping the ranking order"""
+    candidates = await Candidate.find(In(Candidate.id, [PydanticObjectId(cid) for cid, _ in ranked])).to_list()
+    by_id = {str(c.id): c for c in candidates}
+    matches = []
+    for candidate_id, score in ranked:
+        candidate = by_id.get(candidate_id)
+        if candidate is None:
+            # Deleted since the index was built
+            continue
+        matches.append(CandidateMatch(
+            candidate_id=candidate_id,
+            full_name=candidate.full_name,
+            email=candidate.email,
+            score=round(score, 4),
+            matched_skills=matched_skills(candidate.skills, job.title, job.requirements, job.description)
+        ))
+    return matches
+
+
+@router.post("/matches/precompute", summary="Recompute stored matches for all published jobs")
+async def precompute_matches(current_user: User = Depends(get_current_user)):
+    """
+    Score every published job against every candidate now instead of waiting
+    for the next background run. Returns the run summary.
+    """
+    try:
+        return await match_precomputer.run()
+    except Exception as e:
+        logger.error(f"Match precomputation failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to precompute matches: {str(e)}")
+
+
+@router.get("/{job_id}/matches", response_model=JobMatchesResponse, summary="Rank candidates for a job")
+async def get_job_matches(
+    job_id: str,
+    k: int = Query(20, ge=1, le=200, description="Number of candidates to return"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Best ``k`` candidates for a job, highest score first.
+
+    Published jobs are served from the precomputed job_matches table with a
+    single indexed read. Other jobs, results from an older scorer, or a ``k``
+    larger than the stored list are scored on demand against every candidate.
+    """
+    try:
+        stored = await JobMatches.find_one(JobMatches.job_id == job_id)
+        if stored and stored.scoring_version == matching_service.scoring_version and k <= match_precomputer.top_k:
+            return JobMatchesResponse(
+                job_id=job_id,
+                candidates_scored=stored.candidates_scored,
+                matches=[CandidateMatch(**entry.model_dump()) for entry in stored.matches[:k]],
+                precomputed=True,
+                scoring_version=stored.scoring_version,
+                computed_at=stored.computed_at
+            )
+
+        job = await Job.get(PydanticObjectId(job_id))
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+
+        ranked, scored = await matching_service.match(job.title, job.requirements, job.description, k)
+        matches = await _to_matches(job, ranked)
+        return JobMatchesResponse(
+            job_id=job_id,
+            candidates_scored=scored,
+            matches=matches,
+            scoring_version=matching_service.scoring_version,
+            computed_at=datetime.utcnow()
+        )
+
+    except HTTPException:
+        raise
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid job ID format")
+    except Exception as e:
+        logger.error(f"Matching failed for job {job_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to match candidates: {str(e)}")
+
+
+@router.get("/{job_id}/similar-candidates", response_model=JobMatchesResponse, summary="Nearest candidates by embedding")
+async def get_similar_candidates(
+    job_id: str,
+    k: int = Query(20, ge=1, le=200, description="Number of candidates to return"),
+    nprobe: Optional[int] = Query(None, ge=1, description="Index lists to scan; higher trades latency for recall"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Approximate top-``k`` candidates for a job from the candidate vector index.
+    ``candidates_scored`` is the number of vectors actually compared.
+    """
+    try:
+        job = await Job.get(PydanticObjectId(job_id))
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+
+        vector = await embedding_service.vector_for("jobs", job_id, job_text(job))
+        ranked, scored = embedding_service.search("candidates", vector, k, nprobe)
+        matches = await _to_matches(job, ranked)
+        return JobMatchesResponse(job_id=job_id, candidates_scored=scored, matches=matches)
+
+    except HTTPException:
+        raise
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid job ID format")
+    except Exception as e:
+        logger.error(f"Similarity search failed for job {job_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to find similar candidates: {str(e)}")
@@ -19,6 +19,41 @@ class Settings(BaseSettings):
     
     # AI/LLM
     MISTRAL_API_KEY: str = ""
+    MISTRAL_MODEL: str = "mistral-small-latest"
+    MISTRAL_SERVER_URL: str = ""  # Empty = Mistral's public API
+    MISTRAL_MAX_CONNECTIONS: int = 20  # Pooled connections shared by all LLM calls
+    MISTRAL_TIMEOUT_SECONDS: float = 60.0
+    LLM_HEALTH_PROBE_INTERVAL_SECONDS: float = 30.0  # 0 disables the background probe
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 3  # Consecutive failures before skipping the LLM
+    LLM_BREAKER_RESET_SECONDS: float = 30.0  # How long to skip it before trying again
+    LLM_CHUNK_TOKENS: int = 3000  # Longer resumes are split at section headers
+    LLM_CHUNK_CONCURRENCY: int = 4  # Chunks of one resume extracted in parallel
+    
+    # Resume ingestion
+    PDF_WORKERS: int = 0  # 0 = one worker per CPU
+    PDF_PAGES_PER_TASK: int = 8  # Larger documents are split across workers
+    PDF_TIMEOUT_SECONDS: float = 30.0  # Per-document parsing budget
+    PDF_MEMORY_LIMIT_MB: int = 512  # Extra address space per worker, 0 = unlimited
+    LLM_CONCURRENCY: int = 4  # Maximum in-flight LLM calls per batch
+    INSERT_BATCH_SIZE: int = 20  # Candidates per insert_many call
+    EXTRACTION_CACHE_ENABLED: bool = True
+    EXTRACTION_CACHE_MAX_ENTRIES: int = 50000  # LRU-evicted beyond this
+    INGESTION_QUEUE_BACKEND: str = "memory"  # memory or redis
+    INGESTION_WORKERS: int = 2  # Batches processed concurrently per process
+    REDIS_URL: str = "redis://localhost:6379/0"
+    
+    # Matching
+    MATCHING_FEATURE_DIM: int = 262144  # Hashed feature columns per candidate vector
+    MATCHING_INDEX_TTL_SECONDS: float = 300.0  # Candidate matrix is rebuilt after this
+    MATCH_PRECOMPUTE_INTERVAL_SECONDS: float = 900.0  # Full job x candidate rescoring, 0 disables
+    MATCH_PRECOMPUTE_TOP_K: int = 100  # Matches stored per published job
+    MATCH_PRECOMPUTE_BLOCK_CELLS: int = 4000000  # Dense scores per block (x4 bytes) per worker
+    MATCH_PRECOMPUTE_WORKERS: int = 0  # 0 = one thread per CPU
+    MATCH_REFRESH_DEBOUNCE_SECONDS: float = 2.0  # Batch job/candidate changes before patching stored matches
+    EMBEDDING_STORE_DIR: str = "data/embeddings"  # Memory-mapped candidate and job vectors
+    EMBEDDING_DIM: int = 256
+    ANN_NPROBE: int = 16  # IVF lists scanned per query; higher = better recall, slower
+    ANN_MIN_TRAIN_SIZE: int = 2048  # Smaller collections are searched exactly
     
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = ["http://localhost:3000"]
@@ -42,7 +42,10 @@ class Database:
                     "app.models.candidate.Candidate",
                     "app.models.job.Job",
                     "app.models.auth.User",
-                    "app.models.application.Application"
+                    "app.models.application.Application",
+                    "app.models.extraction_cache.ExtractionCacheEntry",
+                    "app.models.job_matches.JobMatches",
+                    "app.models.skill.SkillTerm"
                 ]
             )
             logger.info("Beanie initialized successfully")
@@ -1,10 +1,13 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
+import asyncio
 import uvicorn
 
 from app.config import settings
 from app.database import init_db
+from app.services.metrics import registry as metrics_registry
 
 
 @asynccontextmanager
@@ -14,11 +17,33 @@ async def lifespan(app: FastAPI):
     print("🚀 Starting Recruiter Assist API...")
     await init_db()
     print("✅ Database connected!")
+    from app.api.endpoints.candidates import (
+        resume_extractor, ingestion_queue, ingestion_pipeline, process_ingestion_task, sync_candidate_indexes
+    )
+    from app.api.endpoints.matching import embedding_service, match_precomputer, match_updater
+    from app.api.endpoints.jobs import job_search_index
+    resume_extractor.client_manager.start_health_probe()
+    ingestion_queue.start(process_ingestion_task, settings.INGESTION_WORKERS)
+    # Catch the vector stores up with documents written while we were down
+    embedding_sync = asyncio.create_task(embedding_service.sync())
+    # Resolve skill IDs of candidates stored before the vocabulary existed, then build the filter and search indexes
+    skill_sync = asyncio.create_task(sync_candidate_indexes())
+    job_search_sync = asyncio.create_task(job_search_index.sync())
+    match_precomputer.start()
     
     yield
     
     # Shutdown
     print("🛑 Shutting down Recruiter Assist API...")
+    embedding_sync.cancel()
+    skill_sync.cancel()
+    job_search_sync.cancel()
+    await match_updater.stop()
+    await match_precomputer.stop()
+    embedding_service.save_indexes()
+    await ingestion_queue.stop()
+    ingestion_pipeline.shutdown()
+    await resume_extractor.client_manager.aclose()
 
 
 # Create FastAPI app
@@ -41,17 +66,16 @@ app.add_middleware(
 )
 
 # Include routers
-from app.api.endpoints import auth, candidates, jobs, applications
+from app.api.endpoints import auth, candidates, jobs, applications, matching
 app.include_router(auth.router, prefix=settings.API_V1_STR + "/auth", tags=["authentication"])
 app.include_router(candidates.router, prefix=settings.API_V1_STR + "/candidates", tags=["candidates"])
 app.include_router(jobs.router, prefix=settings.API_V1_STR + "/jobs", tags=["jobs"])
 app.include_router(applications.router, prefix=settings.API_V1_STR + "/applications", tags=["applications"])
+app.include_router(matching.router, prefix=settings.API_V1_STR + "/jobs", tags=["matching"])
 
 # We'll add these later
-# from app.api.endpoints import jobs, upload, matching
-# app.include_router(jobs.router, prefix=settings.API_V1_STR)
+# from app.api.endpoints import upload
 # app.include_router(upload.router, prefix=settings.API_V1_STR)
-# app.include_router(matching.router, prefix=settings.API_V1_STR)
 
 
 @app.get("/")
@@ -70,6 +94,12 @@ async def health_check():
     return {"status": "healthy", "service": "recruiter-assist-api"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Ingestion stage timings and counters in the Prometheus text format"""
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     uvicorn.run(
         "app.main:app",
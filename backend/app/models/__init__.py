@@ -2,5 +2,8 @@ from .auth import User
 from .candidate import Candidate
 from .job import Job
 from .application import Application
+from .extraction_cache import ExtractionCacheEntry
+from .job_matches import JobMatches, MatchEntry
+from .skill import SkillTerm
 
-__all__ = ["User", "Candidate", "Job", "Application"]
+__all__ = ["User", "Candidate", "Job", "Application", "ExtractionCacheEntry", "JobMatches", "MatchEntry", "SkillTerm"]
@@ -2,6 +2,7 @@ from datetime import datetime
 from typing import Optional
 from beanie import Document, Indexed
 from pydantic import Field
+from pymongo import ASCENDING
 
 
 class Application(Document):
@@ -35,7 +36,11 @@ class Application(Document):
             "candidate_id", 
             "status",
             "applied_at",
-            "created_by"
+            "created_by",
+            # Keyset pagination: list order, alone and per job or candidate
+            [("created_at", ASCENDING), ("_id", ASCENDING)],
+            [("job_id", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)],
+            [("candidate_id", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)]
         ]
     
     model_config = {
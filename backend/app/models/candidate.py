@@ -1,7 +1,8 @@
-from beanie import Document
+from beanie import Document, PydanticObjectId
 from datetime import datetime
 from typing import List, Optional
 from pydantic import BaseModel, Field
+from pymongo import ASCENDING
 
 class Skill(BaseModel):
     """Individual skill with proficiency level"""
@@ -49,11 +50,13 @@ class Candidate(Document):
     location: Optional[str] = Field(default=None, description="Location/City")
     summary: Optional[str] = Field(default=None, description="Professional summary")
     skills: List[Skill] = Field(default=[], description="List of skills")
+    skill_ids: Optional[List[int]] = Field(default=None, description="Canonical skill IDs; None until resolved")
     experience: List[Experience] = Field(default=[], description="Work experience")
     education: List[Education] = Field(default=[], description="Education history")
     certifications: Optional[List[str]] = Field(default=None, description="Certifications")
     languages: Optional[List[str]] = Field(default=None, description="Languages known")
     resume_url: Optional[str] = Field(default=None, description="Path to stored PDF file")
+    content_hash: Optional[str] = Field(default=None, description="sha256 of the resume PDF bytes")
     job_id: Optional[str] = Field(None, description="Job ID if uploaded to specific job")
     uploaded_by: str = Field(description="User ID who uploaded the resume")
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -63,13 +66,48 @@ class Candidate(Document):
         name = "candidates"
         indexes = [
             "filename",
+            "content_hash",
             "email",
             "full_name",
+            "skill_ids",
             "job_id",
             "uploaded_by",
-            "created_at"
+            "created_at",
+            # Keyset pagination of candidate lists, alone and per job
+            [("created_at", ASCENDING), ("_id", ASCENDING)],
+            [("job_id", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)]
         ]
 
+class CandidateSummaryFields(BaseModel):
+    """Projection of a candidate for list views; section sizes are counted by MongoDB"""
+    id: PydanticObjectId = Field(alias="_id")
+    filename: str
+    full_name: str
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    location: Optional[str] = None
+    skills_count: int = 0
+    experience_count: int = 0
+    education_count: int = 0
+    job_id: Optional[str] = None
+    uploaded_by: str
+    created_at: datetime
+
+    class Settings:
+        projection = {
+            "filename": 1,
+            "full_name": 1,
+            "email": 1,
+            "phone": 1,
+            "location": 1,
+            "skills_count": {"$size": {"$ifNull": ["$skills", []]}},
+            "experience_count": {"$size": {"$ifNull": ["$experience", []]}},
+            "education_count": {"$size": {"$ifNull": ["$education", []]}},
+            "job_id": 1,
+            "uploaded_by": 1,
+            "created_at": 1
+        }
+
 class BatchExtractionResult(BaseModel):
     """Result of batch resume processing"""
     total_files: int
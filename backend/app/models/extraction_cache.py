@@ -0,0 +1,26 @@
+from datetime import datetime
+from beanie import Document, Indexed
+from pydantic import Field
+
+from app.models.candidate import ResumeExtraction
+
+
+class ExtractionCacheEntry(Document):
+    """Cached LLM extraction for one resume, keyed by content hash, model and prompt version"""
+
+    key: Indexed(str, unique=True) = Field(description="sha256 of content hash, model name and prompt version")
+    content_hash: str = Field(description="sha256 of the resume PDF bytes")
+    model: str = Field(description="LLM model that produced the extraction")
+    prompt_version: str = Field(description="Prompt version that produced the extraction")
+    extraction: ResumeExtraction = Field(description="Structured resume data")
+    num_pages: int = Field(default=0, description="Number of pages in the PDF")
+    hits: int = Field(default=0, description="Number of times this entry was served")
+    created_at: datetime = Field(default_factory=datetime.utcnow, description="Creation timestamp")
+    last_accessed_at: datetime = Field(default_factory=datetime.utcnow, description="Last hit, used for LRU eviction")
+
+    class Settings:
+        name = "extraction_cache"
+        indexes = [
+            "content_hash",
+            "last_accessed_at"
+        ]
@@ -2,6 +2,7 @@ from datetime import datetime
 from typing import Optional
 from beanie import Document, Indexed
 from pydantic import Field
+from pymongo import ASCENDING
 
 
 class Job(Document):
@@ -45,7 +46,10 @@ class Job(Document):
             "type",
             "created_by",
             "status",
-            "is_active"
+            "is_active",
+            # Keyset pagination: list order, alone and under the status filter
+            [("created_at", ASCENDING), ("_id", ASCENDING)],
+            [("status", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)]
         ]
     
     model_config = {
@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import List, Optional
+from beanie import Document, Indexed
+from pydantic import BaseModel, Field
+
+
+class MatchEntry(BaseModel):
+    """One precomputed candidate score, with the fields a match page shows"""
+    candidate_id: str = Field(description="Candidate ID")
+    full_name: str = Field(description="Candidate's full name")
+    email: Optional[str] = Field(default=None, description="Email address")
+    score: float = Field(description="Match score, 0-1")
+    matched_skills: List[str] = Field(default=[], description="Candidate skills named in the job posting")
+
+
+class JobMatches(Document):
+    """Top-k candidates for one job, precomputed in the background"""
+
+    job_id: Indexed(str, unique=True) = Field(description="Job ID")
+    matches: List[MatchEntry] = Field(default=[], description="Best candidates, highest score first")
+    scoring_version: str = Field(description="Scorer and feature layout that produced the scores")
+    candidates_scored: int = Field(default=0, description="Number of candidates the job was scored against")
+    computed_at: datetime = Field(default_factory=datetime.utcnow, description="When the scores were computed")
+
+    class Settings:
+        name = "job_matches"
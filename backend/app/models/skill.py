@@ -0,0 +1,17 @@
+from datetime import datetime
+from typing import List
+from beanie import Document, Indexed
+from pydantic import Field
+
+
+class SkillTerm(Document):
+    """One canonical skill and the integer ID candidates store for it"""
+
+    skill_id: Indexed(int, unique=True) = Field(description="Compact skill ID, assigned in insertion order")
+    key: Indexed(str, unique=True) = Field(description="Normalized canonical name")
+    name: str = Field(description="Display name")
+    aliases: List[str] = Field(default=[], description="Normalized alternative spellings")
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "skills"
@@ -6,7 +6,9 @@ from .job import (
     JobResponse, 
     JobListResponse,
     JobParseRequest, 
-    JobParseResponse
+    JobParseResponse,
+    JobParseBatchRequest,
+    JobParseBatchResponse
 )
 from .application import (
     ApplicationBase,
@@ -16,10 +18,38 @@ from .application import (
     ApplicationListResponse,
     ApplicationWithDetails
 )
+from .ingestion import (
+    SpooledUpload,
+    IngestionTask,
+    FileIngestionStatus,
+    IngestionBatchStatus,
+    IngestionBatchAccepted
+)
+from .matching import CandidateMatch, JobMatchesResponse, JobSimilarity, CandidateJobsResponse
+from .candidate import (
+    CandidateFilterRequest,
+    CandidateFilterResponse,
+    CandidateSearchHit,
+    CandidateSearchResponse,
+    Suggestion,
+    SuggestResponse,
+    FuzzyMatch,
+    FuzzySearchResponse,
+    CandidateSummary,
+    CandidateSummaryPage,
+    CandidateFacetRequest,
+    FacetBucket,
+    CandidateFacetResponse
+)
 
 __all__ = [
     "LoginRequest", "RegisterRequest", "UserResponse", "LoginResponse",
     "JobBase", "JobCreate", "JobUpdate", "JobResponse", "JobListResponse",
-    "JobParseRequest", "JobParseResponse",
-    "ApplicationBase", "ApplicationCreate", "ApplicationUpdate", "ApplicationResponse", "ApplicationListResponse", "ApplicationWithDetails"
+    "JobParseRequest", "JobParseResponse", "JobParseBatchRequest", "JobParseBatchResponse",
+    "ApplicationBase", "ApplicationCreate", "ApplicationUpdate", "ApplicationResponse", "ApplicationListResponse", "ApplicationWithDetails",
+    "SpooledUpload", "IngestionTask", "FileIngestionStatus", "IngestionBatchStatus", "IngestionBatchAccepted",
+    "CandidateMatch", "JobMatchesResponse", "JobSimilarity", "CandidateJobsResponse",
+    "CandidateFilterRequest", "CandidateFilterResponse", "CandidateSearchHit", "CandidateSearchResponse",
+    "Suggestion", "SuggestResponse", "FuzzyMatch", "FuzzySearchResponse",
+    "CandidateSummary", "CandidateSummaryPage", "CandidateFacetRequest", "FacetBucket", "CandidateFacetResponse"
 ]
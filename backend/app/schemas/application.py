@@ -44,9 +44,11 @@ class ApplicationResponse(ApplicationBase):
 class ApplicationListResponse(BaseModel):
     """Schema for application list response"""
     applications: list[ApplicationResponse]
-    total: int
-    page: int
+    total: Optional[int] = Field(None, description="Matching applications; not counted when paging by cursor")
+    page: Optional[int] = Field(None, description="Page number; None when paging by cursor")
     size: int
+    next_cursor: Optional[str] = Field(None, description="Cursor of the following page, None on the last")
+    prev_cursor: Optional[str] = Field(None, description="Cursor of the preceding page, None on the first")
 
 
 class ApplicationWithDetails(ApplicationResponse):
@@ -0,0 +1,129 @@
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+
+
+class CandidateFilterRequest(BaseModel):
+    """Boolean candidate filter; empty lists do not constrain"""
+    skills_all: List[str] = Field(default=[], description="Candidate has every one of these skills")
+    skills_any: List[str] = Field(default=[], description="Candidate has at least one of these skills")
+    skills_none: List[str] = Field(default=[], description="Candidate has none of these skills")
+    locations: List[str] = Field(default=[], description="Candidate location matches one of these (city, country or full string)")
+    job_ids: List[str] = Field(default=[], description="Candidate was uploaded for one of these jobs")
+    offset: int = Field(default=0, ge=0, description="Number of matching candidates to skip")
+    limit: int = Field(default=50, ge=1, le=500, description="Page size")
+
+
+class CandidateFilterResponse(BaseModel):
+    """Matching candidate count and one page of IDs, newest first"""
+    total: int = Field(..., description="Number of matching candidates")
+    offset: int = Field(..., description="Offset of this page")
+    limit: int = Field(..., description="Page size")
+    candidate_ids: List[str] = Field(..., description="Candidate IDs of this page")
+    counts: Dict[str, int] = Field(default={}, description="Candidates per filter term, e.g. 'skill:Python'")
+    unknown_skills: List[str] = Field(default=[], description="Requested skills that no candidate has")
+    elapsed_us: float = Field(..., description="Time spent evaluating the filter, in microseconds")
+
+
+class CandidateSearchHit(BaseModel):
+    """A ranked candidate with the matching passages marked up"""
+    id: str
+    full_name: str
+    email: Optional[str] = None
+    skills: List[str] = []
+    created_at: str
+    score: float = Field(..., description="BM25 relevance score")
+    highlights: Dict[str, str] = Field(default={}, description="Field -> snippet with matching terms in <mark> tags")
+
+
+class CandidateSearchResponse(BaseModel):
+    """One page of full-text search results, best match first"""
+    query: str
+    total: int = Field(..., description="Number of matching candidates")
+    page: int
+    size: int
+    results: List[CandidateSearchHit]
+    elapsed_ms: float = Field(..., description="Time spent ranking, in milliseconds")
+
+
+class Suggestion(BaseModel):
+    """One typeahead completion"""
+    kind: str = Field(..., description="name, skill, company or job_title")
+    text: str
+    count: int = Field(..., description="Candidates (or jobs, for titles) carrying this value")
+
+
+class SuggestResponse(BaseModel):
+    """Typeahead completions, most frequent first"""
+    query: str
+    suggestions: List[Suggestion]
+    elapsed_us: float = Field(..., description="Lookup time, in microseconds")
+
+
+class FuzzyMatch(BaseModel):
+    """A candidate whose name, email or a skill resembles the query"""
+    candidate_id: str
+    full_name: str
+    field: str = Field(..., description="name, email or skill")
+    matched: str = Field(..., description="Normalized value that matched")
+    similarity: float = Field(..., description="Trigram similarity, 0-1")
+
+
+class FuzzySearchResponse(BaseModel):
+    """Fuzzy matches, most similar first"""
+    query: str
+    matches: List[FuzzyMatch]
+    elapsed_ms: float = Field(..., description="Lookup time, in milliseconds")
+
+
+class CandidateSummary(BaseModel):
+    """List view of a candidate: contact fields and section sizes"""
+    id: str
+    filename: str
+    full_name: str
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    location: Optional[str] = None
+    skills_count: int
+    experience_count: int
+    education_count: int
+    job_id: Optional[str] = None
+    uploaded_by: str
+    created_at: str
+
+
+class CandidateSummaryPage(BaseModel):
+    """One page of the candidate list"""
+    candidates: List[CandidateSummary]
+    total: Optional[int] = Field(default=None, description="Matching candidates; not counted when paging by cursor")
+    page: Optional[int] = Field(default=None, description="Page number; None when paging by cursor")
+    size: int
+    next_cursor: Optional[str] = Field(default=None, description="Cursor of the following page, None on the last")
+    prev_cursor: Optional[str] = Field(default=None, description="Cursor of the preceding page, None on the first")
+
+
+class CandidateFacetRequest(CandidateFilterRequest):
+    """Boolean candidate filter plus the facets to count over its matches"""
+    facets: List[str] = Field(
+        default=["skill", "location", "job", "uploader"],
+        description="Facets to count: skill, location, job, uploader"
+    )
+    facet_limit: int = Field(default=20, ge=1, le=200, description="Buckets per facet, most frequent first")
+
+
+class FacetBucket(BaseModel):
+    """Number of matching candidates with one facet value"""
+    value: str
+    label: Optional[str] = Field(default=None, description="Display name: skill name, job title or uploader name")
+    count: int
+
+
+class CandidateFacetResponse(BaseModel):
+    """One page of matching candidates and facet counts over all matches"""
+    total: int = Field(..., description="Number of matching candidates")
+    offset: int
+    limit: int
+    candidates: List[CandidateSummary] = Field(..., description="This page, newest first")
+    facets: Dict[str, List[FacetBucket]]
+    unknown_skills: List[str] = Field(default=[], description="Requested skills that no candidate has")
+    cached: bool = Field(default=False, description="Served from the facet cache")
+    elapsed_us: float = Field(..., description="Time to answer, in microseconds")
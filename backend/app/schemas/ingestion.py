@@ -0,0 +1,45 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+from app.models.candidate import BatchExtractionResult
+
+
+class SpooledUpload(BaseModel):
+    """An uploaded file saved to disk and waiting for ingestion"""
+    filename: str = Field(..., description="Original filename as uploaded")
+    path: Optional[str] = Field(None, description="Content-addressed path on disk; unset for rejected files")
+    content_hash: Optional[str] = Field(None, description="sha256 of the file bytes")
+    size: int = Field(default=0, description="File size in bytes")
+
+
+class IngestionTask(BaseModel):
+    """Unit of work handed to the ingestion queue"""
+    batch_id: str = Field(..., description="Batch ID")
+    uploaded_by: str = Field(..., description="User who uploaded the files")
+    job_id: Optional[str] = Field(None, description="Job ID for job-specific uploads")
+    files: List[SpooledUpload] = Field(..., description="Files in upload order")
+
+
+class FileIngestionStatus(BaseModel):
+    """Processing state of one file in a batch"""
+    filename: str = Field(..., description="Original filename")
+    state: str = Field(default="queued", description="File state: queued, processing, succeeded, failed")
+    error: Optional[str] = Field(None, description="Failure reason if the file failed")
+
+
+class IngestionBatchStatus(BaseModel):
+    """Progress of an asynchronous upload batch"""
+    batch_id: str = Field(..., description="Batch ID")
+    status: str = Field(default="queued", description="Batch status: queued, processing, completed, failed")
+    files: List[FileIngestionStatus] = Field(..., description="Per-file state in upload order")
+    result: BatchExtractionResult = Field(..., description="Results so far; final once status is completed")
+    created_at: datetime = Field(default_factory=datetime.utcnow, description="When the batch was accepted")
+    updated_at: datetime = Field(default_factory=datetime.utcnow, description="Last progress update")
+
+
+class IngestionBatchAccepted(BaseModel):
+    """Response returned when an upload batch is queued"""
+    batch_id: str = Field(..., description="Batch ID to poll")
+    status_url: str = Field(..., description="Endpoint reporting batch progress")
+    total_files: int = Field(..., description="Number of files accepted")
@@ -63,9 +63,11 @@ class JobResponse(JobBase):
 class JobListResponse(BaseModel):
     """Schema for job list response"""
     jobs: List[JobResponse]
-    total: int
-    page: int
+    total: Optional[int] = Field(None, description="Matching jobs; not counted when paging by cursor")
+    page: Optional[int] = Field(None, description="Page number; None when paging by cursor")
     size: int
+    next_cursor: Optional[str] = Field(None, description="Cursor of the following page, None on the last")
+    prev_cursor: Optional[str] = Field(None, description="Cursor of the preceding page, None on the first")
 
 
 class JobParseRequest(BaseModel):
@@ -75,9 +77,26 @@ class JobParseRequest(BaseModel):
 
 class JobParseResponse(JobBase):
     """Schema for AI job parsing response"""
-    confidence_score: Optional[float] = Field(None, description="AI parsing confidence score")
+    confidence_score: Optional[float] = Field(None, description="Share of the core fields that were found, 0-1")
     parsed_fields: List[str] = Field(..., description="List of fields that were successfully parsed")
-    
-    # Override salary fields to be integers in response
-    salary_min: int = Field(..., description="Minimum salary")
-    salary_max: int = Field(..., description="Maximum salary") 
\ No newline at end of file
+    llm_fields: List[str] = Field(default=[], description="Fields filled by the LLM because the rules left them empty")
+    skills: List[str] = Field(default=[], description="Canonical skills named in the requirements")
+
+    # Salary is often not stated; the parser leaves it empty instead of guessing
+    salary_min: Optional[int] = Field(None, description="Minimum salary")
+    salary_max: Optional[int] = Field(None, description="Maximum salary")
+    salary_currency: Optional[str] = Field(None, description="ISO currency code of the salary")
+    salary_period: Optional[str] = Field(None, description="Salary unit: hour, day, week, month or year")
+
+
+class JobParseBatchRequest(BaseModel):
+    """Schema for parsing many job descriptions in one call"""
+    job_descriptions: List[str] = Field(..., min_length=1, max_length=500, description="Raw job description texts")
+    use_llm: bool = Field(default=True, description="Ask the LLM for fields the rules leave empty")
+
+
+class JobParseBatchResponse(BaseModel):
+    """Schema for batch job parsing response, in request order"""
+    results: List[JobParseResponse]
+    llm_fields_filled: int = Field(..., description="Number of fields filled by the LLM across the batch")
+    elapsed_ms: float = Field(..., description="Total parsing time")
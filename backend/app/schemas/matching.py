@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+class CandidateMatch(BaseModel):
+    """One candidate ranked against a job"""
+    candidate_id: str = Field(..., description="Candidate ID")
+    full_name: str = Field(..., description="Candidate's full name")
+    email: Optional[str] = Field(None, description="Email address")
+    score: float = Field(..., description="Cosine similarity between candidate and job, 0-1")
+    matched_skills: List[str] = Field(default=[], description="Candidate skills named in the job posting")
+
+
+class JobMatchesResponse(BaseModel):
+    """Top candidates for a job"""
+    job_id: str = Field(..., description="Job ID")
+    candidates_scored: int = Field(..., description="Number of candidates the job was scored against")
+    matches: List[CandidateMatch] = Field(..., description="Best matches, highest score first")
+    precomputed: bool = Field(default=False, description="Served from the background-computed match table")
+    scoring_version: Optional[str] = Field(None, description="Scorer that produced the scores")
+    computed_at: Optional[datetime] = Field(None, description="When the scores were computed")
+
+
+class JobSimilarity(BaseModel):
+    """One job ranked against a candidate"""
+    job_id: str = Field(..., description="Job ID")
+    title: str = Field(..., description="Job title")
+    company: str = Field(..., description="Company name")
+    score: float = Field(..., description="Cosine similarity between candidate and job embeddings")
+
+
+class CandidateJobsResponse(BaseModel):
+    """Closest jobs for a candidate"""
+    candidate_id: str = Field(..., description="Candidate ID")
+    jobs_scored: int = Field(..., description="Number of jobs the candidate was scored against")
+    jobs: List[JobSimilarity] = Field(..., description="Best matches, highest score first")
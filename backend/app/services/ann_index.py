@@ -0,0 +1,225 @@
+import logging
+import math
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+KMEANS_ITERATIONS = 12
+# k-means trains on a sample; more points barely move the centroids
+KMEANS_SAMPLE_PER_LIST = 64
+
+
+def default_nlist(count: int) -> int:
+    """Number of inverted lists for ``count`` vectors (about sqrt(n))"""
+    return max(1, int(round(math.sqrt(count))))
+
+
+def train_centroids(vectors: np.ndarray, nlist: int, iterations: int = KMEANS_ITERATIONS, seed: int = 0) -> np.ndarray:
+    """Spherical k-means: unit-length centroids under inner product"""
+    rng = np.random.default_rng(seed)
+    if len(vectors) > nlist * KMEANS_SAMPLE_PER_LIST:
+        vectors = vectors[rng.choice(len(vectors), nlist * KMEANS_SAMPLE_PER_LIST, replace=False)]
+    vectors = np.asarray(vectors, dtype=np.float32)
+    nlist = min(nlist, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, vectors)
+        counts = np.bincount(assignment, minlength=nlist)
+        # An empty list is re-seeded with a random point instead of dying
+        empty = counts == 0
+        if empty.any():
+            sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        centroids = (sums / norms).astype(np.float32)
+    return centroids
+
+
+class _InvertedList:
+    """Vectors of one IVF cell, stored contiguously with room to grow"""
+
+    __slots__ = ("vectors", "ids", "size")
+
+    def __init__(self, dim: int, capacity: int = 16):
+        self.vectors = np.empty((capacity, dim), dtype=np.float32)
+        self.ids: List[str] = []
+        self.size = 0
+
+    def append(self, doc_id: str, vector: np.ndarray) -> int:
+        if self.size == len(self.vectors):
+            grown = np.empty((max(16, 2 * self.size), self.vectors.shape[1]), dtype=np.float32)
+            grown[:self.size] = self.vectors[:self.size]
+            self.vectors = grown
+        self.vectors[self.size] = vector
+        self.ids.append(doc_id)
+        self.size += 1
+        return self.size - 1
+
+    def remove(self, position: int) -> Optional[str]:
+        """Swap-remove; returns the ID that moved into ``position``, if any"""
+        last = self.size - 1
+        moved = None
+        if position != last:
+            self.vectors[position] = self.vectors[last]
+            self.ids[position] = self.ids[last]
+            moved = self.ids[position]
+        self.ids.pop()
+        self.size -= 1
+        return moved
+
+
+class IVFIndex:
+    """
+    Inverted-file index for top-k inner-product search on unit vectors.
+
+    Vectors are bucketed by their nearest k-means centroid. A query scores
+    the ``nprobe`` closest buckets only, so latency scales with
+    ``nprobe / nlist`` of the collection and recall rises with ``nprobe``;
+    ``nprobe = nlist`` is exact search. Inserts and deletes are O(1) and
+    never retrain. An index created without centroids has a single bucket,
+    which is plain exact search.
+    """
+
+    def __init__(self, dim: int, nprobe: int = 8, centroids: Optional[np.ndarray] = None):
+        self.dim = dim
+        self.nprobe = nprobe
+        self.centroids = centroids if centroids is not None else np.zeros((1, dim), dtype=np.float32)
+        self.lists = [_InvertedList(dim) for _ in range(len(self.centroids))]
+        self.trained_size = 0
+        self._where: Dict[str, Tuple[int, int]] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    @property
+    def trained(self) -> bool:
+        return self.nlist > 1
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._where
+
+    def ids(self) -> List[str]:
+        with self._lock:
+            return list(self._where)
+
+    @classmethod
+    def build(cls, ids: Sequence[str], vectors: np.ndarray, nlist: Optional[int] = None, nprobe: int = 8) -> "IVFIndex":
+        """Train centroids on ``vectors`` and add them all"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        dim = vectors.shape[1]
+        nlist = nlist or default_nlist(len(ids))
+        if len(ids) and nlist > 1:
+            index = cls(dim, nprobe, train_centroids(vectors, nlist))
+        else:
+            index = cls(dim, nprobe)
+        index.trained_size = len(ids)
+        index.add(ids, vectors)
+        return index
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray):
+        """Insert or replace vectors"""
+        if not len(ids):
+            return
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dim)
+        assignment = np.argmax(vectors @ self.centroids.T, axis=1)
+        with self._lock:
+            for doc_id, vector, cell in zip(ids, vectors, assignment.tolist()):
+                if doc_id in self._where:
+                    self._remove(doc_id)
+                self._where[doc_id] = (cell, self.lists[cell].append(doc_id, vector))
+
+    def remove(self, ids: Sequence[str]) -> int:
+        with self._lock:
+            return sum(1 for doc_id in ids if doc_id in self._where and self._remove(doc_id))
+
+    def _remove(self, doc_id: str) -> bool:
+        cell, position = self._where.pop(doc_id)
+        moved = self.lists[cell].remove(position)
+        if moved is not None:
+            self._where[moved] = (cell, position)
+        return True
+
+    def get(self, doc_id: str) -> Optional[np.ndarray]:
+        with self._lock:
+            where = self._where.get(doc_id)
+            if where is None:
+                return None
+            cell, position = where
+            return self.lists[cell].vectors[position].copy()
+
+    def search(self, query: np.ndarray, k: int, nprobe: Optional[int] = None, exclude: Sequence[str] = ()) -> Tuple[List[Tuple[str, float]], int]:
+        """
+        Top ``k`` (id, score) pairs for one query, best first, and the number
+        of vectors scored. ``exclude`` drops IDs such as the query's own document.
+        """
+        query = np.asarray(query, dtype=np.float32).reshape(self.dim)
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+        with self._lock:
+            if nprobe >= self.nlist:
+                cells = list(range(self.nlist))
+            else:
+                cells = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe].tolist()
+            cells = [cell for cell in cells if self.lists[cell].size]
+            if not cells:
+                return [], 0
+            scores = np.concatenate([self.lists[cell].vectors[:self.lists[cell].size] @ query for cell in cells])
+            offsets = np.cumsum([0] + [self.lists[cell].size for cell in cells])
+            excluded = set(exclude)
+            want = min(k + len(excluded), len(scores))
+            top = np.argpartition(-scores, want - 1)[:want]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            results = []
+            for i in top.tolist():
+                slot = int(np.searchsorted(offsets, i, side="right")) - 1
+                doc_id = self.lists[cells[slot]].ids[i - offsets[slot]]
+                if doc_id not in excluded:
+                    results.append((doc_id, float(scores[i])))
+        return results[:k], len(scores)
+
+    def save(self, path: str):
+        """Write centroids and every vector to one .npz, atomically"""
+        with self._lock:
+            ids = [doc_id for inverted in self.lists for doc_id in inverted.ids]
+            vectors = np.concatenate([inverted.vectors[:inverted.size] for inverted in self.lists]) if ids \
+                else np.empty((0, self.dim), dtype=np.float32)
+            cells = np.repeat(np.arange(self.nlist), [inverted.size for inverted in self.lists])
+            centroids = self.centroids.copy()
+            trained_size = self.trained_size
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, centroids=centroids, vectors=vectors, cells=cells,
+                 ids=np.array(ids, dtype="U"), trained_size=trained_size)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, nprobe: int = 8) -> "IVFIndex":
+        with np.load(path) as data:
+            index = cls(data["centroids"].shape[1], nprobe, data["centroids"])
+            index.trained_size = int(data["trained_size"])
+            ids = data["ids"].tolist()
+            vectors, cells = data["vectors"], data["cells"]
+        # Reinsert under the saved assignment instead of recomputing it
+        for doc_id, vector, cell in zip(ids, vectors, cells.tolist()):
+            index._where[doc_id] = (cell, index.lists[cell].append(doc_id, vector))
+        return index
+
+    def stats(self) -> dict:
+        with self._lock:
+            sizes = [inverted.size for inverted in self.lists]
+        return {
+            "vectors": sum(sizes),
+            "nlist": self.nlist,
+            "nprobe": self.nprobe,
+            "trained_size": self.trained_size,
+            "largest_list": max(sizes) if sizes else 0
+        }
@@ -0,0 +1,289 @@
+import asyncio
+import logging
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from beanie import PydanticObjectId
+from pydantic import BaseModel, Field
+
+from app.models.candidate import Candidate
+from app.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+SUGGESTION_KINDS = ("name", "skill", "company", "job_title")
+# Prefix keys per term: the whole string plus the tails starting at its next words,
+# so "smi" finds "John Smith" and "eng" finds "Senior Engineer"
+MAX_KEY_WORDS = 4
+# Keys of new terms go to a small sorted list that is merged into the arrays past this size
+MAX_DELTA_KEYS = 100_000
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Case- and accent-insensitive form with single spaces: "  José  García" -> "jose garcia" """
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return " ".join("".join(ch for ch in decomposed if not unicodedata.combining(ch)).split())
+
+
+def _prefix_keys(normalized: str) -> List[str]:
+    words = normalized.split(" ")
+    return [" ".join(words[i:]) for i in range(min(len(words), MAX_KEY_WORDS))]
+
+
+class PrefixIndex:
+    """
+    Sorted-array prefix ranges over the keys of weighted terms.
+
+    A prefix is two bisections into the sorted keys; the matching slice is
+    ranked by term frequency with one argpartition, so a lookup costs the
+    same whether the index holds a thousand terms or a million. Counts
+    change in place; keys of new terms wait in a small sorted list until
+    they are merged into the arrays.
+    """
+
+    def __init__(self):
+        self.display: List[str] = []
+        self.counts = np.zeros(0, dtype=np.int64)
+        self._term_ids: Dict[str, int] = {}
+        self._keys: List[str] = []
+        self._key_terms = np.zeros(0, dtype=np.int32)
+        self._delta: List[Tuple[str, int]] = []
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.counts[:len(self.display)]))
+
+    def _term(self, text: str, normalized: str) -> int:
+        term_id = self._term_ids.get(normalized)
+        if term_id is None:
+            term_id = len(self.display)
+            self._term_ids[normalized] = term_id
+            self.display.append(text.strip())
+            if term_id >= len(self.counts):
+                self.counts = np.concatenate([self.counts, np.zeros(max(1024, len(self.counts)), dtype=np.int64)])
+            for key in _prefix_keys(normalized):
+                insort(self._delta, (key, term_id))
+            if len(self._delta) >= MAX_DELTA_KEYS:
+                self._merge()
+        return term_id
+
+    @classmethod
+    def build(cls, counts: Dict[str, int], display: Dict[str, str]) -> "PrefixIndex":
+        """Bulk-build from normalized term -> frequency and normalized term -> display text"""
+        index = cls()
+        pairs = []
+        for term_id, (normalized, count) in enumerate(counts.items()):
+            index._term_ids[normalized] = term_id
+            index.display.append(display[normalized])
+            pairs.extend((key, term_id) for key in _prefix_keys(normalized))
+        index.counts = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+        pairs.sort()
+        index._keys = [key for key, _ in pairs]
+        index._key_terms = np.fromiter((t for _, t in pairs), dtype=np.int32, count=len(pairs))
+        return index
+
+    def _merge(self):
+        """Splice the sorted delta into the arrays; list slices and np.insert keep it linear and in C"""
+        positions = [bisect_left(self._keys, key) for key, _ in self._delta]
+        keys: List[str] = []
+        previous = 0
+        for position, (key, _) in zip(positions, self._delta):
+            keys.extend(self._keys[previous:position])
+            keys.append(key)
+            previous = position
+        keys.extend(self._keys[previous:])
+        self._key_terms = np.insert(self._key_terms, positions, [term_id for _, term_id in self._delta]).astype(np.int32)
+        self._keys = keys
+        self._delta = []
+
+    def add(self, text: Optional[str], count: int = 1):
+        normalized = normalize_text(text)
+        if normalized:
+            term_id = self._term(text, normalized)
+            self.counts[term_id] += count
+
+    def remove(self, text: Optional[str], count: int = 1):
+        term_id = self._term_ids.get(normalize_text(text))
+        if term_id is not None:
+            self.counts[term_id] = max(0, self.counts[term_id] - count)
+
+    def complete(self, prefix: str, limit: int) -> List[Tuple[str, int]]:
+        """Up to ``limit`` (display text, frequency) pairs for terms with a word starting with ``prefix``"""
+        normalized = normalize_text(prefix)
+        if not normalized or limit <= 0:
+            return []
+        end = normalized + "\U0010ffff"
+        lo, hi = bisect_left(self._keys, normalized), bisect_left(self._keys, end)
+        terms = self._key_terms[lo:hi]
+        # A term has at most MAX_KEY_WORDS keys in any range, so this many keys cover ``limit`` distinct terms
+        want = limit * MAX_KEY_WORDS
+        if len(terms) > want:
+            terms = terms[np.argpartition(-self.counts[terms], want - 1)[:want]]
+        lo, hi = bisect_left(self._delta, (normalized,)), bisect_left(self._delta, (end,))
+        found = set(terms.tolist())
+        found.update(term_id for _, term_id in self._delta[lo:hi])
+        ranked = sorted(
+            (term_id for term_id in found if self.counts[term_id] > 0),
+            key=lambda t: (-self.counts[t], not normalize_text(self.display[t]).startswith(normalized), self.display[t])
+        )
+        return [(self.display[t], int(self.counts[t])) for t in ranked[:limit]]
+
+
+class CandidateSuggestFields(BaseModel):
+    """Projection of the candidate fields autocomplete reads"""
+    id: PydanticObjectId = Field(alias="_id")
+    full_name: Optional[str] = None
+    skill_ids: Optional[List[int]] = None
+    companies: List[str] = []
+
+
+class JobSuggestFields(BaseModel):
+    """Projection of the job fields autocomplete reads"""
+    id: PydanticObjectId = Field(alias="_id")
+    title: str
+
+
+def _companies(candidate) -> List[str]:
+    """Distinct companies of a candidate, so one resume counts once per company"""
+    names = getattr(candidate, "companies", None)
+    if names is None:
+        names = [e.company for e in candidate.experience or []]
+    return list({normalize_text(name): name for name in names if name}.values())
+
+
+class AutocompleteService:
+    """
+    Typeahead over candidate names, canonical skills, companies from work
+    experience and job titles, ranked by how many candidates (or jobs)
+    carry each one. Built from MongoDB at startup and updated by the write
+    endpoints; changes made during a rebuild are replayed afterwards.
+
+    The candidates and job titles currently counted are tracked, so adding
+    a counted candidate or removing an uncounted one is a no-op and a
+    replayed write never counts twice.
+    """
+
+    def __init__(self, vocabulary):
+        self.vocabulary = vocabulary
+        self.indexes: Dict[str, PrefixIndex] = {kind: PrefixIndex() for kind in SUGGESTION_KINDS}
+        self.built_at: Optional[float] = None
+        self._candidates: Set[str] = set()
+        self._job_titles: Dict[str, str] = {}
+        self._pending: Optional[list] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def built(self) -> bool:
+        return self.built_at is not None
+
+    def _candidate_terms(self, candidate) -> Dict[str, List[str]]:
+        skills = [self.vocabulary.name(skill_id) for skill_id in dict.fromkeys(candidate.skill_ids or [])]
+        return {
+            "name": [candidate.full_name] if candidate.full_name else [],
+            "skill": [name for name in skills if name],
+            "company": _companies(candidate),
+        }
+
+    async def rebuild(self):
+        """Count every term in MongoDB and swap the prefix arrays in"""
+        async with self._lock:
+            start = time.perf_counter()
+            pending = self._pending = []
+            try:
+                if not self.vocabulary.loaded:
+                    await self.vocabulary.load()
+                counts: Dict[str, Counter] = {kind: Counter() for kind in SUGGESTION_KINDS}
+                display: Dict[str, Dict[str, str]] = {kind: {} for kind in SUGGESTION_KINDS}
+                candidates: Set[str] = set()
+                job_titles: Dict[str, str] = {}
+
+                def count(kind: str, texts: Iterable[str]):
+                    for text in texts:
+                        normalized = normalize_text(text)
+                        if normalized:
+                            counts[kind][normalized] += 1
+                            display[kind].setdefault(normalized, text.strip())
+
+                pipeline = [{"$project": {"full_name": 1, "skill_ids": 1, "companies": "$experience.company"}}]
+                async for row in Candidate.get_pymongo_collection().aggregate(pipeline):
+                    candidate = CandidateSuggestFields.model_validate(row)
+                    candidates.add(str(candidate.id))
+                    for kind, texts in self._candidate_terms(candidate).items():
+                        count(kind, texts)
+                async for job in Job.find_all().project(JobSuggestFields):
+                    job_titles[str(job.id)] = job.title
+                    count("job_title", [job.title])
+
+                self.indexes = await asyncio.get_running_loop().run_in_executor(
+                    None, lambda: {kind: PrefixIndex.build(counts[kind], display[kind]) for kind in SUGGESTION_KINDS}
+                )
+                self._candidates, self._job_titles = candidates, job_titles
+            finally:
+                self._pending = None
+            # Writes the read already saw are skipped: their candidates and titles are counted
+            for op, arg in pending:
+                op(arg)
+            self.built_at = time.monotonic()
+            logger.info(
+                "Built autocomplete index: %s in %.2fs",
+                ", ".join(f"{len(index)} {kind}s" for kind, index in self.indexes.items()),
+                time.perf_counter() - start
+            )
+
+    def _apply(self, terms: Dict[str, List[str]], count: int):
+        for kind, texts in terms.items():
+            for text in texts:
+                if count > 0:
+                    self.indexes[kind].add(text, count)
+                else:
+                    self.indexes[kind].remove(text, -count)
+
+    def add_candidates(self, candidates: Sequence[Candidate]):
+        if self._pending is not None:
+            self._pending.append((self.add_candidates, candidates))
+        for candidate in candidates:
+            candidate_id = str(candidate.id)
+            if candidate_id not in self._candidates:
+                self._candidates.add(candidate_id)
+                self._apply(self._candidate_terms(candidate), 1)
+
+    def remove_candidate(self, candidate: Candidate):
+        if self._pending is not None:
+            self._pending.append((self.remove_candidate, candidate))
+        candidate_id = str(candidate.id)
+        if candidate_id in self._candidates:
+            self._candidates.discard(candidate_id)
+            self._apply(self._candidate_terms(candidate), -1)
+
+    def job_title_changed(self, job_id: str, title: Optional[str]):
+        """A job was created or retitled, or deleted (no title)"""
+        if self._pending is not None:
+            self._pending.append((lambda change: self.job_title_changed(*change), (job_id, title)))
+        counted = self._job_titles.pop(job_id, None)
+        if counted == title:
+            if title:
+                self._job_titles[job_id] = title
+            return
+        if counted:
+            self.indexes["job_title"].remove(counted)
+        if title:
+            self._job_titles[job_id] = title
+            self.indexes["job_title"].add(title)
+
+    def suggest(self, prefix: str, kinds: Sequence[str] = SUGGESTION_KINDS, limit: int = 10) -> List[Tuple[str, str, int]]:
+        """Top (kind, text, frequency) suggestions across ``kinds``, most frequent first"""
+        found = [
+            (kind, text, count)
+            for kind in kinds
+            for text, count in self.indexes[kind].complete(prefix, limit)
+        ]
+        found.sort(key=lambda s: -s[2])
+        return found[:limit]
+
+    def stats(self) -> dict:
+        return {**{kind: len(index) for kind, index in self.indexes.items()}, "built": self.built}
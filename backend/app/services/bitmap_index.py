@@ -0,0 +1,472 @@
+import asyncio
+import logging
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, Hashable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from beanie import PydanticObjectId
+from pydantic import BaseModel, Field
+
+from app.models.candidate import Candidate
+
+logger = logging.getLogger(__name__)
+
+# Roaring layout: ordinals split into 2^16 chunks; a chunk holding at most
+# ARRAY_MAX_SIZE members is a sorted uint16 array, a fuller one 1024 words.
+CHUNK_BITS = 16
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+ARRAY_MAX_SIZE = 4096
+WORDS_PER_CHUNK = (1 << CHUNK_BITS) // 64
+
+
+def _to_words(container: np.ndarray) -> np.ndarray:
+    if container.dtype == np.uint64:
+        return container
+    words = np.zeros(WORDS_PER_CHUNK, dtype=np.uint64)
+    low = container.astype(np.uint64)
+    np.bitwise_or.at(words, low >> np.uint64(6), np.uint64(1) << (low & np.uint64(63)))
+    return words
+
+
+def _from_words(words: np.ndarray) -> Optional[np.ndarray]:
+    """Smallest container for a chunk's words; None when it is empty"""
+    cardinality = int(np.bitwise_count(words).sum())
+    if cardinality == 0:
+        return None
+    if cardinality > ARRAY_MAX_SIZE:
+        return words
+    return np.flatnonzero(np.unpackbits(words.view(np.uint8), bitorder="little")).astype(np.uint16)
+
+
+def _bits(words: np.ndarray, low: np.ndarray) -> np.ndarray:
+    """Whether each sparse member is set in a dense chunk"""
+    low = low.astype(np.uint64)
+    return ((words[low >> np.uint64(6)] >> (low & np.uint64(63))) & np.uint64(1)).astype(bool)
+
+
+def _member(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Whether each member of sparse ``a`` is in sparse ``b`` (binary search, no re-sort)"""
+    pos = np.searchsorted(b, a)
+    pos[pos == len(b)] = 0
+    return b[pos] == a
+
+
+def _and(a: np.ndarray, b: np.ndarray) -> Optional[np.ndarray]:
+    # Containers are shared between bitmaps and never modified by set operations
+    if a.dtype == np.uint16 and b.dtype == np.uint16:
+        small, large = (a, b) if len(a) <= len(b) else (b, a)
+        result = small[_member(small, large)]
+    elif a.dtype == np.uint16:
+        result = a[_bits(b, a)]
+    elif b.dtype == np.uint16:
+        result = b[_bits(a, b)]
+    else:
+        return _from_words(a & b)
+    return result if len(result) else None
+
+
+def _or(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    if a.dtype == np.uint16 and b.dtype == np.uint16:
+        result = np.union1d(a, b)
+        return result if len(result) <= ARRAY_MAX_SIZE else _to_words(result)
+    return _to_words(a) | _to_words(b)
+
+
+def _andnot(a: np.ndarray, b: np.ndarray) -> Optional[np.ndarray]:
+    if a.dtype == np.uint16:
+        result = a[~(_member(a, b) if b.dtype == np.uint16 else _bits(b, a))]
+        return result if len(result) else None
+    return _from_words(a & ~_to_words(b))
+
+
+class Bitmap:
+    """
+    Compressed set of non-negative integers (roaring-style).
+
+    Sparse chunks cost two bytes per member and dense chunks a flat 8 KiB,
+    so a rare skill and one every candidate has both stay small. Set
+    operations work chunk by chunk on 64-bit words.
+    """
+
+    __slots__ = ("containers",)
+
+    def __init__(self, containers: Optional[Dict[int, np.ndarray]] = None):
+        self.containers: Dict[int, np.ndarray] = containers or {}
+
+    @classmethod
+    def from_sorted(cls, values: np.ndarray) -> "Bitmap":
+        """Build from ascending, unique ordinals"""
+        values = np.asarray(values, dtype=np.int64)
+        bitmap = cls()
+        if not len(values):
+            return bitmap
+        high = values >> CHUNK_BITS
+        bounds = np.flatnonzero(np.diff(high)) + 1
+        for chunk in np.split(values, bounds):
+            low = (chunk & CHUNK_MASK).astype(np.uint16)
+            bitmap.containers[int(chunk[0] >> CHUNK_BITS)] = low if len(low) <= ARRAY_MAX_SIZE else _to_words(low)
+        return bitmap
+
+    def __len__(self) -> int:
+        return sum(
+            int(np.bitwise_count(c).sum()) if c.dtype == np.uint64 else len(c)
+            for c in self.containers.values()
+        )
+
+    def __contains__(self, value: int) -> bool:
+        container = self.containers.get(value >> CHUNK_BITS)
+        if container is None:
+            return False
+        low = value & CHUNK_MASK
+        if container.dtype == np.uint64:
+            return bool((int(container[low >> 6]) >> (low & 63)) & 1)
+        i = int(np.searchsorted(container, low))
+        return i < len(container) and container[i] == low
+
+    def add(self, value: int):
+        key, low = value >> CHUNK_BITS, value & CHUNK_MASK
+        container = self.containers.get(key)
+        if container is None:
+            self.containers[key] = np.array([low], dtype=np.uint16)
+        elif container.dtype == np.uint64:
+            container[low >> 6] |= np.uint64(1 << (low & 63))
+        else:
+            i = int(np.searchsorted(container, low))
+            if i < len(container) and container[i] == low:
+                return
+            container = np.insert(container, i, low)
+            self.containers[key] = container if len(container) <= ARRAY_MAX_SIZE else _to_words(container)
+
+    def discard(self, value: int):
+        key, low = value >> CHUNK_BITS, value & CHUNK_MASK
+        container = self.containers.get(key)
+        if container is None:
+            return
+        if container.dtype == np.uint64:
+            container[low >> 6] &= ~np.uint64(1 << (low & 63))
+            container = _from_words(container)
+        else:
+            i = int(np.searchsorted(container, low))
+            if i == len(container) or container[i] != low:
+                return
+            container = np.delete(container, i)
+        if container is None or not len(container):
+            del self.containers[key]
+        else:
+            self.containers[key] = container
+
+    def __and__(self, other: "Bitmap") -> "Bitmap":
+        result = {}
+        for key in self.containers.keys() & other.containers.keys():
+            container = _and(self.containers[key], other.containers[key])
+            if container is not None:
+                result[key] = container
+        return Bitmap(result)
+
+    def __or__(self, other: "Bitmap") -> "Bitmap":
+        result = dict(self.containers)
+        for key, b in other.containers.items():
+            a = result.get(key)
+            result[key] = b if a is None else _or(a, b)
+        return Bitmap(result)
+
+    def __sub__(self, other: "Bitmap") -> "Bitmap":
+        result = {}
+        for key, a in self.containers.items():
+            b = other.containers.get(key)
+            container = a if b is None else _andnot(a, b)
+            if container is not None:
+                result[key] = container
+        return Bitmap(result)
+
+    def to_array(self) -> np.ndarray:
+        """Members in ascending order"""
+        parts = []
+        for key in sorted(self.containers):
+            container = self.containers[key]
+            if container.dtype == np.uint64:
+                container = np.flatnonzero(np.unpackbits(container.view(np.uint8), bitorder="little"))
+            parts.append((key << CHUNK_BITS) + container.astype(np.int64))
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def nbytes(self) -> int:
+        return sum(c.nbytes for c in self.containers.values())
+
+
+def union(bitmaps: Sequence[Bitmap]) -> Bitmap:
+    if len(bitmaps) == 1:
+        return bitmaps[0]
+    result = Bitmap()
+    for bitmap in bitmaps:
+        result = result | bitmap
+    return result
+
+
+def intersection(bitmaps: Sequence[Bitmap]) -> Bitmap:
+    # Smallest first, so every later step intersects with a small set
+    ordered = sorted(bitmaps, key=len)
+    result = ordered[0]
+    for bitmap in ordered[1:]:
+        if not result.containers:
+            break
+        result = result & bitmap
+    return result
+
+
+def normalize_location(location: Optional[str]) -> List[str]:
+    """Filter keys of a free-text location: the whole string and each comma-separated part"""
+    if not location:
+        return []
+    whole = " ".join(location.casefold().split())
+    parts = [" ".join(p.split()) for p in whole.split(",")]
+    return list(dict.fromkeys([whole, *[p for p in parts if p]]))
+
+
+class CandidateFilterFields(BaseModel):
+    """Projection of the candidate fields the filter index reads"""
+    id: PydanticObjectId = Field(alias="_id")
+    skill_ids: Optional[List[int]] = None
+    location: Optional[str] = None
+    job_id: Optional[str] = None
+    uploaded_by: Optional[str] = None
+
+
+FACET_KINDS = ("skill", "location", "job", "uploader")
+# Faceted results kept per filter combination; all are dropped when candidates change
+FACET_CACHE_SIZE = 256
+# Results (or complements) up to this size are faceted from their members' keys
+FACET_SCAN_MAX = 20000
+
+
+def _filter_keys(candidate) -> List[Tuple[str, Hashable]]:
+    keys: List[Tuple[str, Hashable]] = [("skill", s) for s in dict.fromkeys(candidate.skill_ids or [])]
+    keys.extend(("location", loc) for loc in normalize_location(candidate.location))
+    if candidate.job_id:
+        keys.append(("job", candidate.job_id))
+    uploaded_by = getattr(candidate, "uploaded_by", None)
+    if uploaded_by:
+        keys.append(("uploader", uploaded_by))
+    return keys
+
+
+class CandidateFilterIndex:
+    """
+    Bitmaps from skill ID, location, upload job and uploader to candidate
+    ordinals.
+
+    Every candidate gets an ordinal in insertion order; a boolean filter is
+    a few bitmap ANDs, ORs and AND-NOTs, paging walks the resulting
+    ordinals, and a facet count is the size of a result ANDed with each
+    key's bitmap. Inserts and deletes update the bitmaps in place and bump
+    ``version``, and changes made during a rebuild are replayed onto the
+    rebuilt index.
+    """
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.bitmaps: Dict[Tuple[str, Hashable], Bitmap] = {}
+        self.live = Bitmap()
+        self.built_at: Optional[float] = None
+        self.version = 0
+        self._ordinals: Dict[str, int] = {}
+        # Whole location strings, as opposed to their comma-separated parts
+        self._locations: Set[str] = set()
+        self._flat: Optional[tuple] = None
+        self._keys: Dict[int, List[Tuple[str, Hashable]]] = {}
+        self._pending: Optional[list] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def built(self) -> bool:
+        return self.built_at is not None
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    def bitmap(self, kind: str, value: Hashable) -> Bitmap:
+        return self.bitmaps.get((kind, value)) or Bitmap()
+
+    @classmethod
+    def from_documents(cls, candidates: Sequence) -> "CandidateFilterIndex":
+        """Bulk-build from documents with ``id``, ``skill_ids``, ``location``, ``job_id`` and ``uploaded_by``"""
+        index = cls()
+        members: Dict[Tuple[str, Hashable], List[int]] = {}
+        for ordinal, c in enumerate(candidates):
+            candidate_id = str(c.id)
+            keys = _filter_keys(c)
+            index.ids.append(candidate_id)
+            index._ordinals[candidate_id] = ordinal
+            index._keys[ordinal] = keys
+            index._locations.update(normalize_location(c.location)[:1])
+            for key in keys:
+                members.setdefault(key, []).append(ordinal)
+        index.bitmaps = {key: Bitmap.from_sorted(np.array(ordinals)) for key, ordinals in members.items()}
+        index.live = Bitmap.from_sorted(np.arange(len(index.ids)))
+        index.built_at = time.monotonic()
+        return index
+
+    async def rebuild(self):
+        """Reload every candidate from MongoDB and swap the bitmaps in"""
+        async with self._lock:
+            start = time.perf_counter()
+            pending = self._pending = []
+            try:
+                rows = await Candidate.find_all().sort("+_id").project(CandidateFilterFields).to_list()
+                fresh = CandidateFilterIndex.from_documents(rows)
+                self.ids, self.bitmaps, self.live = fresh.ids, fresh.bitmaps, fresh.live
+                self._ordinals, self._keys, self._locations = fresh._ordinals, fresh._keys, fresh._locations
+            finally:
+                self._pending = None
+            for op, arg in pending:
+                op(arg)
+            self.version += 1
+            self.built_at = time.monotonic()
+            logger.info(
+                f"Built candidate filter index: {len(self)} candidates, {len(self.bitmaps)} keys, "
+                f"{self.nbytes() / 2**20:.1f} MiB in {time.perf_counter() - start:.2f}s"
+            )
+
+    def add(self, candidates: Sequence[Candidate]):
+        """Index newly inserted candidates; already indexed ones are skipped"""
+        if self._pending is not None:
+            self._pending.append((self.add, candidates))
+        self.version += 1
+        for c in candidates:
+            candidate_id = str(c.id)
+            if candidate_id in self._ordinals:
+                continue
+            ordinal = len(self.ids)
+            keys = _filter_keys(c)
+            self.ids.append(candidate_id)
+            self._ordinals[candidate_id] = ordinal
+            self._keys[ordinal] = keys
+            self._locations.update(normalize_location(c.location)[:1])
+            self.live.add(ordinal)
+            for key in keys:
+                self.bitmaps.setdefault(key, Bitmap()).add(ordinal)
+
+    def remove(self, candidate_id: str):
+        if self._pending is not None:
+            self._pending.append((self.remove, candidate_id))
+        ordinal = self._ordinals.pop(candidate_id, None)
+        if ordinal is None:
+            return
+        self.version += 1
+        self.live.discard(ordinal)
+        for key in self._keys.pop(ordinal, []):
+            bitmap = self.bitmaps.get(key)
+            if bitmap is not None:
+                bitmap.discard(ordinal)
+                if not bitmap.containers:
+                    del self.bitmaps[key]
+
+    def evaluate(
+        self,
+        all_of: Sequence[Tuple[str, Hashable]] = (),
+        any_of: Sequence[Sequence[Tuple[str, Hashable]]] = (),
+        none_of: Sequence[Tuple[str, Hashable]] = ()
+    ) -> Bitmap:
+        """
+        Candidates having every key in ``all_of``, at least one key of each
+        group in ``any_of``, and no key in ``none_of``.
+        """
+        required = [self.bitmap(*key) for key in all_of]
+        required.extend(union([self.bitmap(*key) for key in group]) for group in any_of if group)
+        result = intersection(required) if required else self.live
+        excluded = [self.bitmap(*key) for key in none_of]
+        if excluded:
+            result = result - union(excluded)
+        return result
+
+    def page(self, result: Bitmap, offset: int, limit: int) -> List[str]:
+        """Candidate IDs of one page, newest first"""
+        ordinals = result.to_array()[::-1][offset:offset + limit]
+        return [self.ids[o] for o in ordinals.tolist()]
+
+    def _flat_postings(self) -> Tuple[List[Tuple[str, Hashable]], np.ndarray, np.ndarray]:
+        """Every key's members concatenated, with the offset where each key starts; rebuilt once per version"""
+        if self._flat is None or self._flat[0] != self.version:
+            keys = list(self.bitmaps)
+            members = [self.bitmaps[key].to_array() for key in keys]
+            flat = np.concatenate(members) if members else np.empty(0, dtype=np.int64)
+            starts = np.cumsum([0] + [len(m) for m in members[:-1]]).astype(np.int64)
+            self._flat = (self.version, keys, flat, starts)
+        return self._flat[1:]
+
+    def facets(self, result: Bitmap, kinds: Sequence[str], limit: int) -> Dict[str, List[Tuple[Hashable, int]]]:
+        """
+        Most frequent values of each facet kind among ``result``, as (value,
+        count) pairs. Locations count whole strings only, not their parts.
+
+        A small result is counted from its members' keys. A large one is
+        marked in a byte array that is gathered over the concatenated
+        bitmaps and summed per key with one reduceat.
+        """
+        wanted = set(kinds)
+        members = result.to_array()
+        if len(members) <= FACET_SCAN_MAX:
+            tally = Counter(key for o in members.tolist() for key in self._keys.get(o, ()) if key[0] in wanted)
+        else:
+            keys, flat, starts = self._flat_postings()
+            mask = np.zeros(len(self.ids), dtype=np.uint8)
+            mask[members] = 1
+            # Bitmaps are never empty, so every key's segment is non-empty
+            totals = np.add.reduceat(mask[flat], starts, dtype=np.int64) if keys else np.zeros(0, dtype=np.int64)
+            tally = {keys[i]: int(totals[i]) for i in np.flatnonzero(totals).tolist() if keys[i][0] in wanted}
+        counts: Dict[str, List[Tuple[Hashable, int]]] = {kind: [] for kind in kinds}
+        for (kind, value), count in tally.items():
+            if kind != "location" or value in self._locations:
+                counts[kind].append((value, count))
+        return {
+            kind: sorted(pairs, key=lambda pair: (-pair[1], str(pair[0])))[:limit]
+            for kind, pairs in counts.items()
+        }
+
+    def nbytes(self) -> int:
+        return self.live.nbytes() + sum(b.nbytes() for b in self.bitmaps.values())
+
+    def stats(self) -> dict:
+        return {
+            "candidates": len(self),
+            "keys": len(self.bitmaps),
+            "bytes": self.nbytes(),
+            "built": self.built
+        }
+
+
+class FacetCache:
+    """
+    Faceted results for recent filter combinations, valid for one index
+    version; the first lookup after candidates change empties it.
+    """
+
+    def __init__(self, max_entries: int = FACET_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.version: Optional[int] = None
+        self._entries: "OrderedDict[Hashable, object]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, version: int):
+        if version != self.version:
+            self._entries.clear()
+            self.version = version
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: Hashable, version: int, entry):
+        if version != self.version:
+            return
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "version": self.version}
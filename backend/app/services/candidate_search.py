@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from beanie import PydanticObjectId
+from pydantic import BaseModel, Field
+
+from app.models.candidate import Candidate, Experience, Skill
+from app.services.skill_vocabulary import canonical_key, normalize_skill
+from app.services.text_index import FieldValue, TextIndex
+
+logger = logging.getLogger(__name__)
+
+# Weight of a term occurrence per field; a name or skill hit outranks a mention in a description
+CANDIDATE_FIELDS: Dict[str, float] = {
+    "full_name": 3.0,
+    "skills": 2.5,
+    "email": 2.0,
+    "positions": 1.5,
+    "companies": 1.0,
+    "summary": 1.0,
+    "experience": 1.0,
+}
+
+
+class CandidateSearchFields(BaseModel):
+    """Projection of the candidate fields the search index reads"""
+    id: PydanticObjectId = Field(alias="_id")
+    full_name: Optional[str] = None
+    email: Optional[str] = None
+    summary: Optional[str] = None
+    skills: List[Skill] = []
+    experience: List[Experience] = []
+
+
+def _with_canonical(skills: List[str]) -> List[str]:
+    """Skill names plus the canonical key of any alias among them, so "golang" is found by "go" and vice versa"""
+    keys = [canonical_key(normalize_skill(name)) for name in skills]
+    return skills + [key for name, key in zip(skills, keys) if key and key != normalize_skill(name)]
+
+
+def expand_query(query: str) -> str:
+    """Add the canonical key when the whole query is a known skill alias ("golang" -> "go")"""
+    key = canonical_key(normalize_skill(query))
+    return query if key == normalize_skill(query) else f"{query} {key}"
+
+
+def candidate_fields(candidate) -> Dict[str, FieldValue]:
+    """Searchable text of a candidate document or projection, by field"""
+    experience = candidate.experience or []
+    return {
+        "full_name": candidate.full_name,
+        "email": candidate.email,
+        "summary": candidate.summary,
+        "skills": _with_canonical([s.name for s in candidate.skills or []]),
+        "positions": [e.position for e in experience],
+        "companies": [e.company for e in experience],
+        "experience": [
+            text for e in experience
+            for text in (e.description, *(e.achievements or []))
+        ],
+    }
+
+
+class CandidateSearchIndex:
+    """
+    BM25 full-text index over candidate names, emails, skills, summaries and
+    work experience.
+
+    Built from MongoDB at startup; inserts and deletes are applied as they
+    happen, and changes made during a rebuild are replayed onto the rebuilt
+    index.
+    """
+
+    def __init__(self):
+        self.index = TextIndex(CANDIDATE_FIELDS)
+        self.built_at: Optional[float] = None
+        self._pending: Optional[list] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def built(self) -> bool:
+        return self.built_at is not None
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    async def rebuild(self):
+        """Reload every candidate from MongoDB and swap the index in"""
+        async with self._lock:
+            start = time.perf_counter()
+            pending = self._pending = []
+            try:
+                rows = await Candidate.find_all().sort("+_id").project(CandidateSearchFields).to_list()
+                # Tokenizing is CPU-bound; keep the event loop responsive while it runs
+                self.index = await asyncio.get_running_loop().run_in_executor(
+                    None, lambda: TextIndex.build(((str(c.id), candidate_fields(c)) for c in rows), CANDIDATE_FIELDS)
+                )
+            finally:
+                self._pending = None
+            for op, arg in pending:
+                op(arg)
+            self.built_at = time.monotonic()
+            logger.info(
+                f"Built candidate search index: {len(self)} candidates, "
+                f"{self.index.stats()['terms']} terms in {time.perf_counter() - start:.2f}s"
+            )
+
+    def add(self, candidates: Sequence[Candidate]):
+        """Index newly inserted or updated candidates"""
+        if self._pending is not None:
+            self._pending.append((self.add, candidates))
+        for c in candidates:
+            self.index.add(str(c.id), candidate_fields(c))
+
+    def remove(self, candidate_id: str):
+        if self._pending is not None:
+            self._pending.append((self.remove, candidate_id))
+        self.index.remove(candidate_id)
+
+    def search(self, query: str, offset: int, limit: int) -> Tuple[List[Tuple[str, float]], int]:
+        """One page of (candidate ID, score), best first, and the number of matches"""
+        return self.index.search(expand_query(query), limit, offset)
+
+    def terms(self, query: str) -> List[str]:
+        return self.index.query_terms(expand_query(query))
+
+    def stats(self) -> dict:
+        return {**self.index.stats(), "built": self.built}
@@ -0,0 +1,458 @@
+import asyncio
+import heapq
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+from beanie import PydanticObjectId
+from pydantic import BaseModel, Field
+
+from app.config import settings
+from app.models.candidate import Candidate, Skill, Experience
+from app.models.job import Job
+from app.services.matching import tokenize
+from app.services.ann_index import IVFIndex
+
+logger = logging.getLogger(__name__)
+
+# Document IDs are 24-character ObjectId hex strings
+ID_DTYPE = "S24"
+INITIAL_CAPACITY = 1024
+
+
+class Embedder(Protocol):
+    """Turns texts into L2-normalized float32 vectors of a fixed dimension"""
+
+    # Identifies the vector space; a store built by another embedder is rebuilt
+    name: str
+    dim: int
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """One row per text, shape (len(texts), dim)"""
+        ...
+
+
+class HashedNgramEmbedder:
+    """
+    Offline embedder: word tokens plus character n-grams, feature-hashed.
+
+    Each feature adds +1 or -1 (chosen by the hash) to one dimension, so
+    collisions cancel out on average. Character n-grams make "postgres" and
+    "postgresql" land close together. Needs no model download or network.
+    """
+
+    def __init__(self, dim: int = 256, ngram_sizes: Tuple[int, ...] = (3, 4)):
+        self.dim = dim
+        self.ngram_sizes = ngram_sizes
+        self.name = f"hashed-ngram-{dim}-{'-'.join(map(str, ngram_sizes))}"
+
+    def _features(self, text: str) -> Iterable[Tuple[str, float]]:
+        for token in tokenize(text):
+            yield "w:" + token, 1.0
+            padded = f"<{token}>"
+            for n in self.ngram_sizes:
+                for i in range(len(padded) - n + 1):
+                    yield padded[i:i + n], 0.5
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            columns, weights = [], []
+            for feature, weight in self._features(text):
+                h = zlib.crc32(feature.encode("utf-8"))
+                columns.append(h % self.dim)
+                weights.append(weight if h & 0x80000000 else -weight)
+            if columns:
+                np.add.at(vectors[row], columns, weights)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+class CandidateText(BaseModel):
+    """Projection of the candidate fields that are embedded"""
+    id: PydanticObjectId = Field(alias="_id")
+    summary: Optional[str] = None
+    skills: List[Skill] = []
+    experience: List[Experience] = []
+
+
+class JobText(BaseModel):
+    """Projection of the job fields that are embedded"""
+    id: PydanticObjectId = Field(alias="_id")
+    title: str = ""
+    description: str = ""
+    requirements: Optional[str] = None
+
+
+def candidate_text(candidate) -> str:
+    parts = [skill.name for skill in candidate.skills]
+    parts += [job.position for job in candidate.experience]
+    if candidate.summary:
+        parts.append(candidate.summary)
+    return "\n".join(parts)
+
+
+def job_text(job) -> str:
+    return "\n".join(part for part in (job.title, job.requirements, job.description) if part)
+
+
+class EmbeddingStore:
+    """
+    Fixed-width vectors in a memory-mapped file, one row per document.
+
+    ``<path>.vectors`` holds the float32 rows and ``<path>.ids`` the document
+    ID of each row (empty for free rows), so an insert or delete writes one
+    row in place and nothing is ever rewritten wholesale. ``<path>.json``
+    records the embedder and capacity. Opening maps both files without
+    reading them; the ID-to-row dict is built on first use.
+
+    A file written by a different embedder is discarded, since its vectors
+    are not comparable.
+    """
+
+    def __init__(self, path: str, embedder_name: str, dim: int):
+        self.path = path
+        self.embedder_name = embedder_name
+        self.dim = dim
+        self._lock = threading.RLock()
+        self._vectors: Optional[np.memmap] = None
+        self._ids: Optional[np.memmap] = None
+        self._rows: Optional[Dict[str, int]] = None
+        self._free: List[int] = []
+
+    @property
+    def capacity(self) -> int:
+        self._open()
+        return len(self._ids)
+
+    def _open(self):
+        if self._vectors is not None:
+            return
+        with self._lock:
+            if self._vectors is not None:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            meta = None
+            if os.path.exists(self.path + ".json"):
+                with open(self.path + ".json") as f:
+                    meta = json.load(f)
+            if meta and (meta.get("embedder") != self.embedder_name or meta.get("dim") != self.dim):
+                logger.warning(f"Embedding store {self.path} was built with {meta.get('embedder')}, rebuilding")
+                meta = None
+            if meta is None:
+                self._create(INITIAL_CAPACITY)
+            else:
+                self._map(meta["capacity"])
+
+    def _create(self, capacity: int):
+        for suffix in (".vectors", ".ids"):
+            with open(self.path + suffix, "wb"):
+                pass
+        self._resize(capacity)
+
+    def _resize(self, capacity: int):
+        """Grow both files to ``capacity`` rows (new rows read as zeros) and remap"""
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._ids.flush()
+            self._vectors = self._ids = None
+        with open(self.path + ".vectors", "r+b") as f:
+            f.truncate(capacity * self.dim * 4)
+        with open(self.path + ".ids", "r+b") as f:
+            f.truncate(capacity * np.dtype(ID_DTYPE).itemsize)
+        self._write_meta(capacity)
+        self._map(capacity)
+
+    def _map(self, capacity: int):
+        self._vectors = np.memmap(self.path + ".vectors", dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+        self._ids = np.memmap(self.path + ".ids", dtype=ID_DTYPE, mode="r+", shape=(capacity,))
+        self._rows = None
+
+    def _write_meta(self, capacity: int):
+        tmp = self.path + ".json.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"embedder": self.embedder_name, "dim": self.dim, "capacity": capacity}, f)
+        os.replace(tmp, self.path + ".json")
+
+    def _index(self) -> Dict[str, int]:
+        self._open()
+        if self._rows is None:
+            used = np.flatnonzero(self._ids != b"")
+            self._rows = dict(zip((i.decode("ascii") for i in self._ids[used]), used.tolist()))
+            # Min-heap, so the lowest free row is reused first and files stay dense
+            self._free = np.flatnonzero(self._ids == b"").tolist()
+        return self._rows
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._index())
+
+    def __contains__(self, doc_id: str) -> bool:
+        with self._lock:
+            return doc_id in self._index()
+
+    def ids(self) -> List[str]:
+        with self._lock:
+            return list(self._index())
+
+    def get(self, doc_id: str) -> Optional[np.ndarray]:
+        with self._lock:
+            row = self._index().get(doc_id)
+            return None if row is None else np.array(self._vectors[row])
+
+    def upsert(self, doc_ids: Sequence[str], vectors: np.ndarray):
+        """Write one vector per ID, reusing the existing row for known IDs"""
+        with self._lock:
+            rows = self._index()
+            needed = sum(1 for doc_id in set(doc_ids) if doc_id not in rows)
+            if needed > len(self._free):
+                capacity = len(self._ids)
+                new_capacity = max(capacity * 2, capacity + needed - len(self._free))
+                self._resize(new_capacity)
+                rows = self._index()
+            for doc_id, vector in zip(doc_ids, vectors):
+                row = rows.get(doc_id)
+                if row is None:
+                    row = heapq.heappop(self._free)
+                    rows[doc_id] = row
+                    self._ids[row] = doc_id.encode("ascii")
+                self._vectors[row] = vector
+            self._vectors.flush()
+            self._ids.flush()
+
+    def delete(self, doc_ids: Iterable[str]) -> int:
+        """Free the rows of the given IDs; returns how many were present"""
+        with self._lock:
+            rows = self._index()
+            removed = 0
+            for doc_id in doc_ids:
+                row = rows.pop(doc_id, None)
+                if row is None:
+                    continue
+                self._ids[row] = b""
+                self._vectors[row] = 0.0
+                heapq.heappush(self._free, row)
+                removed += 1
+            if removed:
+                self._vectors.flush()
+                self._ids.flush()
+            return removed
+
+    def snapshot(self) -> Tuple[List[str], np.ndarray]:
+        """IDs and a copy of their vectors, in row order"""
+        with self._lock:
+            self._index()
+            used = np.flatnonzero(self._ids != b"")
+            return [i.decode("ascii") for i in self._ids[used]], self._vectors[used]
+
+
+class EmbeddingService:
+    """
+    Candidate and job vectors kept in sync with MongoDB, with an IVF index
+    over each store for top-k similarity queries.
+
+    Writes go through ``index_*``/``remove_*`` as documents change and update
+    the store and its index together; these only log on failure, since both
+    are derived data and ``sync()`` repairs them, including anything written
+    while the process was down. Embedding runs in a worker thread so it
+    never blocks the event loop. An index is retrained in the background once
+    its collection has doubled since the last training.
+    """
+
+    def __init__(self, directory: Optional[str] = None, embedder: Optional[Embedder] = None):
+        self.directory = directory or settings.EMBEDDING_STORE_DIR
+        self.embedder = embedder or HashedNgramEmbedder(settings.EMBEDDING_DIM)
+        self.candidates = EmbeddingStore(os.path.join(self.directory, "candidates"), self.embedder.name, self.embedder.dim)
+        self.jobs = EmbeddingStore(os.path.join(self.directory, "jobs"), self.embedder.name, self.embedder.dim)
+        # Exact (single-list) until sync() loads or trains them
+        self.indexes: Dict[str, IVFIndex] = {
+            "candidates": IVFIndex(self.embedder.dim, settings.ANN_NPROBE),
+            "jobs": IVFIndex(self.embedder.dim, settings.ANN_NPROBE)
+        }
+        self._stores = {"candidates": self.candidates, "jobs": self.jobs}
+        self._retraining: Dict[str, asyncio.Task] = {}
+        self._loaded = False
+
+    def _index_path(self, kind: str) -> str:
+        return os.path.join(self.directory, f"{kind}.ivf.npz")
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def _upsert(self, kind: str, doc_ids: List[str], texts: List[str]):
+        def work():
+            vectors = self.embedder.embed(texts)
+            self._stores[kind].upsert(doc_ids, vectors)
+            self.indexes[kind].add(doc_ids, vectors)
+        await self._run(work)
+        self._maybe_retrain(kind)
+
+    async def _delete(self, kind: str, doc_id: str):
+        def work():
+            self._stores[kind].delete([doc_id])
+            self.indexes[kind].remove([doc_id])
+        try:
+            await self._run(work)
+        except Exception as e:
+            logger.warning(f"Could not remove {doc_id} from the {kind} vectors, sync() will retry: {e}")
+
+    async def index_candidates(self, candidates: Sequence[Candidate]):
+        candidates = [c for c in candidates if c.id is not None]
+        if not candidates:
+            return
+        try:
+            await self._upsert("candidates", [str(c.id) for c in candidates], [candidate_text(c) for c in candidates])
+        except Exception as e:
+            logger.warning(f"Could not embed {len(candidates)} candidates, sync() will retry: {e}")
+
+    async def remove_candidate(self, candidate_id: str):
+        await self._delete("candidates", candidate_id)
+
+    async def index_job(self, job: Job):
+        try:
+            await self._upsert("jobs", [str(job.id)], [job_text(job)])
+        except Exception as e:
+            logger.warning(f"Could not embed job {job.id}, sync() will retry: {e}")
+
+    async def remove_job(self, job_id: str):
+        await self._delete("jobs", job_id)
+
+    async def sync(self, batch_size: int = 500):
+        """Embed documents missing from the stores, drop rows of deleted ones, then load the indexes"""
+        try:
+            await self._sync(batch_size)
+            for kind in self._stores:
+                await self._run(self._load_index, kind)
+            self._loaded = True
+            for kind in self._stores:
+                self._maybe_retrain(kind)
+        except Exception as e:
+            logger.error(f"Embedding store sync failed: {e}")
+
+    async def _sync(self, batch_size: int):
+        start = time.perf_counter()
+        added = removed = 0
+        for kind, document, projection, to_text in (
+            ("candidates", Candidate, CandidateText, candidate_text),
+            ("jobs", Job, JobText, job_text),
+        ):
+            store = self._stores[kind]
+            stored = set(store.ids())
+            seen = set()
+            batch: List[Tuple[str, str]] = []
+            async for doc in document.find().project(projection):
+                doc_id = str(doc.id)
+                seen.add(doc_id)
+                if doc_id not in stored:
+                    batch.append((doc_id, to_text(doc)))
+                if len(batch) >= batch_size:
+                    await self._upsert(kind, [i for i, _ in batch], [t for _, t in batch])
+                    added += len(batch)
+                    batch = []
+            if batch:
+                await self._upsert(kind, [i for i, _ in batch], [t for _, t in batch])
+                added += len(batch)
+            removed += store.delete(stored - seen)
+        logger.info(f"Embedding stores synced: {added} added, {removed} removed in {time.perf_counter() - start:.2f}s")
+
+    def _load_index(self, kind: str):
+        """Load the saved index, or build one, and reconcile it with the store"""
+        store, path = self._stores[kind], self._index_path(kind)
+        index = None
+        if os.path.exists(path):
+            try:
+                index = IVFIndex.load(path, settings.ANN_NPROBE)
+                if index.dim != self.embedder.dim:
+                    index = None
+            except Exception as e:
+                logger.warning(f"Could not load {path}, rebuilding: {e}")
+        if index is None:
+            ids, vectors = store.snapshot()
+            index = self._build(ids, vectors)
+        else:
+            self._reconcile(index, store)
+        self.indexes[kind] = index
+        logger.info(f"Loaded {kind} index: {index.stats()}")
+
+    def _build(self, ids: List[str], vectors: np.ndarray) -> IVFIndex:
+        if len(ids) < settings.ANN_MIN_TRAIN_SIZE:
+            index = IVFIndex(self.embedder.dim, settings.ANN_NPROBE)
+            index.add(ids, vectors)
+            return index
+        return IVFIndex.build(ids, vectors, nprobe=settings.ANN_NPROBE)
+
+    def _reconcile(self, index: IVFIndex, store: EmbeddingStore):
+        """Bring ``index`` up to date with the store it was built from"""
+        stored = set(store.ids())
+        indexed = set(index.ids())
+        index.remove(list(indexed - stored))
+        missing = list(stored - indexed)
+        for start in range(0, len(missing), 1000):
+            batch = missing[start:start + 1000]
+            index.add(batch, np.stack([store.get(doc_id) for doc_id in batch]))
+
+    def _maybe_retrain(self, kind: str):
+        if not self._loaded:
+            return
+        index = self.indexes[kind]
+        size = len(self._stores[kind])
+        if size < settings.ANN_MIN_TRAIN_SIZE or size <= 2 * index.trained_size:
+            return
+        task = self._retraining.get(kind)
+        if task is None or task.done():
+            self._retraining[kind] = asyncio.create_task(self._retrain(kind))
+
+    async def _retrain(self, kind: str):
+        def work():
+            store = self._stores[kind]
+            ids, vectors = store.snapshot()
+            index = self._build(ids, vectors)
+            # Catch up on writes that landed while training
+            self._reconcile(index, store)
+            self.indexes[kind] = index
+            index.save(self._index_path(kind))
+            return index
+        try:
+            start = time.perf_counter()
+            index = await self._run(work)
+            logger.info(f"Retrained {kind} index in {time.perf_counter() - start:.2f}s: {index.stats()}")
+        except Exception as e:
+            logger.error(f"Retraining the {kind} index failed: {e}")
+
+    def save_indexes(self):
+        """Persist both indexes so the next start skips training"""
+        if not self._loaded:
+            # Never overwrite a saved index with the placeholder used before sync()
+            return
+        for kind, index in self.indexes.items():
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                index.save(self._index_path(kind))
+            except Exception as e:
+                logger.warning(f"Could not save the {kind} index: {e}")
+
+    async def vector_for(self, kind: str, doc_id: str, text: Optional[str] = None) -> Optional[np.ndarray]:
+        """Stored vector of a document, embedding ``text`` instead if it is not stored yet"""
+        vector = self._stores[kind].get(doc_id)
+        if vector is None and text is not None:
+            vector = (await self._run(self.embedder.embed, [text]))[0]
+        return vector
+
+    def search(self, kind: str, vector: np.ndarray, k: int, nprobe: Optional[int] = None, exclude: Sequence[str] = ()) -> Tuple[List[Tuple[str, float]], int]:
+        """Top ``k`` (id, score) pairs among ``kind`` and the number of vectors scored"""
+        return self.indexes[kind].search(vector, k, nprobe, exclude)
+
+    def stats(self) -> dict:
+        return {
+            "embedder": self.embedder.name,
+            "dim": self.embedder.dim,
+            "candidates": len(self.candidates),
+            "jobs": len(self.jobs),
+            "indexes": {kind: index.stats() for kind, index in self.indexes.items()}
+        }
@@ -0,0 +1,95 @@
+import hashlib
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from app.config import settings
+from app.models.candidate import ResumeExtraction
+from app.models.extraction_cache import ExtractionCacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionCache:
+    """
+    Persistent, size-bounded cache of LLM extractions keyed by resume bytes.
+
+    The key combines the sha256 of the PDF with the model name and prompt
+    version, so changing either one naturally invalidates old entries.
+    Least-recently-used entries are evicted once ``max_entries`` is exceeded.
+    """
+
+    def __init__(self, model: str, prompt_version: str, max_entries: Optional[int] = None):
+        self.model = model
+        self.prompt_version = prompt_version
+        self.max_entries = max_entries or settings.EXTRACTION_CACHE_MAX_ENTRIES
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def make_key(self, content_hash: str) -> str:
+        """Derive the cache key for a content hash"""
+        raw = f"{content_hash}:{self.model}:{self.prompt_version}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def get_many(self, content_hashes: List[str]) -> Dict[str, ResumeExtraction]:
+        """Look up several resumes in one round-trip, returning hits by content hash"""
+        if not content_hashes:
+            return {}
+        keys = {self.make_key(h): h for h in set(content_hashes)}
+        entries = await ExtractionCacheEntry.find({"key": {"$in": list(keys)}}).to_list()
+
+        found = {keys[entry.key]: entry.extraction for entry in entries}
+        self.hits += sum(1 for h in content_hashes if h in found)
+        self.misses += sum(1 for h in content_hashes if h not in found)
+
+        if entries:
+            await ExtractionCacheEntry.find({"key": {"$in": [e.key for e in entries]}}).update_many({
+                "$set": {"last_accessed_at": datetime.utcnow()},
+                "$inc": {"hits": 1}
+            })
+        return found
+
+    async def put(self, content_hash: str, extraction: ResumeExtraction, num_pages: int = 0):
+        """Store an extraction and evict the oldest entries if over capacity"""
+        key = self.make_key(content_hash)
+        try:
+            entry = ExtractionCacheEntry(
+                key=key,
+                content_hash=content_hash,
+                model=self.model,
+                prompt_version=self.prompt_version,
+                extraction=extraction,
+                num_pages=num_pages
+            )
+            await ExtractionCacheEntry.find_one({"key": key}).upsert(
+                {"$set": {"last_accessed_at": datetime.utcnow()}},
+                on_insert=entry
+            )
+            await self._evict()
+        except Exception as e:
+            # The cache is an optimization; never fail an upload because of it
+            logger.warning(f"Failed to cache extraction {content_hash[:12]}: {e}")
+
+    async def _evict(self):
+        """Drop least-recently-used entries beyond max_entries"""
+        overflow = await ExtractionCacheEntry.count() - self.max_entries
+        if overflow <= 0:
+            return
+        oldest = await ExtractionCacheEntry.find().sort("+last_accessed_at").limit(overflow).to_list()
+        await ExtractionCacheEntry.find({"_id": {"$in": [e.id for e in oldest]}}).delete()
+        self.evictions += len(oldest)
+        logger.info(f"Evicted {len(oldest)} extraction cache entries")
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this process"""
+        lookups = self.hits + self.misses
+        return {
+            "model": self.model,
+            "prompt_version": self.prompt_version,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,227 @@
+import logging
+import re
+from typing import Dict, List, Optional
+
+from app.models.candidate import ResumeExtraction, Skill, Experience, Education
+from app.services.resume_chunker import SECTION_HEADER_RE, MAX_HEADER_LENGTH
+
+logger = logging.getLogger(__name__)
+
+EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+PHONE_RE = re.compile(r"(?:\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}")
+LOCATION_RE = re.compile(r"\b(?:location|city|address|based in)\b\s*:?\s*", re.IGNORECASE)
+LOCATION_LABEL_RE = re.compile(r"^(?:location|city|address)\s*:\s*", re.IGNORECASE)
+MONTH = (
+    r"(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|June?|July?|Aug(?:ust)?|"
+    r"Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)"
+)
+# Only a real month name may precede the year, so "Google 2019" keeps its company
+DATE = rf"(?:\b{MONTH}\.?\s+)?\b\d{{4}}\b"
+DATE_RANGE_RE = re.compile(
+    rf"\(?\s*({DATE})\s*(?:-|–|—|to)\s*({DATE}|present|current|now)\s*\)?",
+    re.IGNORECASE
+)
+YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+GPA_RE = re.compile(r"\bGPA\s*:?\s*(\d(?:\.\d+)?)", re.IGNORECASE)
+DEGREE_RE = re.compile(
+    r"\b(Ph\.?\s?D\.?|Doctorate|M\.?B\.?A\.?|Master(?:'s)?(?: of \w+)?|M\.?\s?Sc\.?|M\.?S\.?|M\.?A\.?|"
+    r"Bachelor(?:'s)?(?: of \w+)?|B\.?\s?Sc\.?|B\.?S\.?|B\.?A\.?|B\.?Tech\.?|B\.?E\.?|Associate(?:'s)?|Diploma)"
+    r"(?=[\s,]|$)"
+)
+# Stops at digits so a trailing date range stays out of the name
+INSTITUTION_RE = re.compile(r"[^,|;\d]*\b(?:University|College|Institute|School|Academy|Polytechnic)\b[^,|;(\d]*")
+FIELD_RE = re.compile(r"^\s*(?:in|of)?\s*([A-Za-z][A-Za-z &]+?)\s*(?:,|$)")
+EMPLOYER_SPLIT_RE = re.compile(r"\s+(?:at|@)\s+|\s+[-–—|]\s+|,\s+")
+LIST_SPLIT_RE = re.compile(r"\s*[,;|•·]\s*")
+BULLET_RE = re.compile(r"^[\s•·*\-–—]+")
+
+# Section header keyword -> the part of ResumeExtraction it feeds
+SECTION_KINDS = {
+    "summary": "summary", "profile": "summary", "objective": "summary", "about me": "summary",
+    "experience": "experience", "employment": "experience", "work history": "experience",
+    "education": "education", "academic background": "education", "academics": "education",
+    "qualifications": "education",
+    "skills": "skills", "competencies": "skills", "technologies": "skills", "tools": "skills",
+    "languages": "languages",
+    "certifications": "certifications", "certificates": "certifications",
+}
+
+NAME_LINES = 5
+SUMMARY_LINES = 4
+MAX_SKILL_LENGTH = 40
+
+
+def _clean(line: str) -> str:
+    return BULLET_RE.sub("", line).strip()
+
+
+class _ParseState:
+    """Mutable state carried across lines by parse_resume_text"""
+
+    def __init__(self):
+        self.section = "contact"
+        self.name: Optional[str] = None
+        self.email: Optional[str] = None
+        self.phone: Optional[str] = None
+        self.location: Optional[str] = None
+        self.summary: List[str] = []
+        self.skills: Dict[str, Skill] = {}
+        self.languages: Dict[str, str] = {}
+        self.certifications: List[str] = []
+        self.experience: List[Experience] = []
+        self.education: List[Education] = []
+        # Undated experience lines since the last dated entry, and those before the first one
+        self.job_lines: List[str] = []
+        self.pending_experience: List[str] = []
+
+
+def _add_items(target: Dict, line: str, make):
+    for item in LIST_SPLIT_RE.split(line):
+        item = item.strip(" .")
+        key = item.casefold()
+        if item and len(item) <= MAX_SKILL_LENGTH and key not in target:
+            target[key] = make(item)
+
+
+def _close_job(state: _ParseState):
+    """Attach the undated lines collected so far to the job they follow"""
+    if state.experience:
+        if state.job_lines:
+            state.experience[-1].description = " ".join(state.job_lines)
+    else:
+        state.pending_experience.extend(state.job_lines)
+    state.job_lines = []
+
+
+def _experience_line(state: _ParseState, line: str):
+    match = DATE_RANGE_RE.search(line)
+    if match is None:
+        state.job_lines.append(line)
+        return
+
+    heading = (line[:match.start()] + line[match.end():]).strip(" ,|-–—()")
+    if not heading and state.job_lines:
+        # Title on the line before a bare date range
+        heading = state.job_lines.pop()
+    _close_job(state)
+    parts = EMPLOYER_SPLIT_RE.split(heading, maxsplit=1)
+    end = match.group(2)
+    state.experience.append(Experience(
+        company=parts[1].strip() if len(parts) > 1 else "",
+        position=parts[0].strip(),
+        start_date=match.group(1),
+        end_date="Present" if end.lower() in ("present", "current", "now") else end
+    ))
+
+
+def _education_line(state: _ParseState, line: str):
+    degree = DEGREE_RE.search(line)
+    institution = INSTITUTION_RE.search(line)
+    if not degree and not institution:
+        if state.education and not state.education[-1].field_of_study:
+            state.education[-1].field_of_study = line
+        return
+
+    current = state.education[-1] if state.education else None
+    # A degree and its school are often on consecutive lines: fill the gap instead of starting over
+    continues = current is not None and (
+        (degree and not institution and not current.degree) or
+        (institution and not degree and not current.institution)
+    )
+    if not continues:
+        current = Education(institution="", degree="", field_of_study="")
+        state.education.append(current)
+
+    if degree:
+        current.degree = degree.group(1)
+        field = FIELD_RE.match(line[degree.end():].lstrip(". ,"))
+        if field and not INSTITUTION_RE.fullmatch(field.group(1)):
+            current.field_of_study = field.group(1).strip()
+    if institution:
+        current.institution = institution.group(0).strip(" -–—")
+    years = YEAR_RE.findall(line)
+    if years:
+        current.end_date = years[-1]
+        if len(years) > 1:
+            current.start_date = years[0]
+    gpa = GPA_RE.search(line)
+    if gpa:
+        current.gpa = float(gpa.group(1))
+
+
+def parse_resume_text(text: str) -> ResumeExtraction:
+    """
+    Rule-based resume parser used when the LLM is unavailable.
+
+    Makes one pass over the lines. Section headers switch the parser state,
+    and each line is handled by the current section only, using precompiled
+    patterns. Work time is linear in the length of the text and every entry
+    is emitted exactly once.
+    """
+    state = _ParseState()
+    for index, raw in enumerate(text.split("\n")):
+        line = raw.strip()
+        if not line:
+            continue
+
+        header = SECTION_HEADER_RE.match(line) if len(line) <= MAX_HEADER_LENGTH else None
+        if header:
+            state.section = SECTION_KINDS.get(header.group(1).lower(), "other")
+            continue
+
+        # Contact details can appear anywhere; each pattern stops running once it has matched
+        contact = False
+        if state.email is None:
+            email = EMAIL_RE.search(line)
+            if email:
+                state.email = email.group(0)
+                contact = True
+        if state.phone is None:
+            phone = PHONE_RE.search(line)
+            if phone:
+                state.phone = phone.group(0)
+                contact = True
+        if state.location is None:
+            # Anywhere in the header block, only as a "Location: ..." label further down
+            location = LOCATION_RE.search(line) if state.section == "contact" else LOCATION_LABEL_RE.match(line)
+            if location:
+                state.location = line[location.end():].strip() or line
+                contact = True
+        if contact:
+            continue
+
+        section = state.section
+        if section == "contact":
+            if state.name is None and index < NAME_LINES and len(line.split()) <= 4:
+                state.name = line
+        elif section == "summary":
+            if len(state.summary) < SUMMARY_LINES:
+                state.summary.append(line)
+        elif section == "skills":
+            _add_items(state.skills, _clean(line), lambda item: Skill(name=item))
+        elif section == "languages":
+            _add_items(state.languages, _clean(line), lambda item: item)
+        elif section == "certifications":
+            state.certifications.append(_clean(line))
+        elif section == "experience":
+            _experience_line(state, _clean(line))
+        elif section == "education":
+            _education_line(state, _clean(line))
+
+    _close_job(state)
+    experience = state.experience or [
+        Experience(company="", position="", start_date="", description=line)
+        for line in state.pending_experience
+    ]
+    return ResumeExtraction(
+        full_name=state.name or "Unknown",
+        email=state.email,
+        phone=state.phone,
+        location=state.location,
+        summary=" ".join(state.summary) or None,
+        skills=list(state.skills.values()),
+        experience=experience,
+        education=state.education,
+        certifications=state.certifications or None,
+        languages=list(state.languages.values()) or None
+    )
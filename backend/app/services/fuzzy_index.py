@@ -0,0 +1,278 @@
+import asyncio
+import logging
+import re
+import time
+import unicodedata
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from beanie import PydanticObjectId
+from pydantic import BaseModel, Field
+
+from app.models.candidate import Candidate, Skill
+
+logger = logging.getLogger(__name__)
+
+FUZZY_FIELDS = ("name", "email", "skill")
+# Minimum trigram similarity (Jaccard) for a fuzzy match
+DEFAULT_THRESHOLD = 0.3
+# Entries of new values are merged into the posting arrays past this many
+MAX_DELTA_ENTRIES = 5000
+
+# Broken hyphenation from PDF line wrapping: "Mar-\ngaret", "Mar- garet"
+HYPHEN_BREAK_RE = re.compile(r"(\w)[-­‐]\s+(\w)")
+# Zero-width characters and soft hyphens that text extraction leaves inside words
+INVISIBLE_RE = re.compile(r"[­​‌‍⁠﻿]")
+NON_WORD_RE = re.compile(r"[\W_]+")
+# Letters that carry no combining mark to strip, so NFKD leaves them alone
+FOLD_LETTERS = str.maketrans({"ı": "i", "ł": "l", "ø": "o", "đ": "d", "æ": "ae", "œ": "oe", "ŀ": "l"})
+
+
+def normalize_noisy(text: Optional[str]) -> str:
+    """
+    Canonical form of text extracted from PDFs: NFKC folds ligatures and
+    full-width forms ("ﬁ" -> "fi"), hyphenated line breaks are rejoined,
+    invisible characters and accents dropped, and punctuation becomes spaces.
+    """
+    if not text:
+        return ""
+    text = INVISIBLE_RE.sub("", unicodedata.normalize("NFKC", text))
+    text = HYPHEN_BREAK_RE.sub(r"\1\2", text)
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(ch for ch in decomposed if not unicodedata.combining(ch)).translate(FOLD_LETTERS)
+    return " ".join(NON_WORD_RE.sub(" ", text).split())
+
+
+def trigrams(normalized: str) -> Set[str]:
+    """Trigrams of each word padded with two leading and one trailing space, as pg_trgm does"""
+    grams = set()
+    for word in normalized.split(" "):
+        if word:
+            padded = f"  {word} "
+            grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """
+    Trigram postings over distinct normalized values, ranked by Jaccard
+    similarity of trigram sets.
+
+    A query only touches the postings of its own trigrams: counting how
+    often each value ID occurs across them gives the overlap with every
+    value sharing at least one trigram, without visiting the others.
+    Values added after the bulk build sit in per-trigram lists until they
+    are merged into the sorted posting arrays.
+    """
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._value_ids: Dict[str, int] = {}
+        self._sizes = np.zeros(0, dtype=np.int32)
+        self._postings: Dict[str, np.ndarray] = {}
+        self._delta: Dict[str, List[int]] = {}
+        self._delta_values = 0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def _grow(self, size: int):
+        if size > len(self._sizes):
+            self._sizes = np.concatenate([self._sizes, np.zeros(max(size - len(self._sizes), len(self._sizes), 1024), dtype=np.int32)])
+
+    @classmethod
+    def build(cls, values: Sequence[str]) -> "TrigramIndex":
+        """Bulk-build from distinct normalized values"""
+        index = cls()
+        lists: Dict[str, List[int]] = {}
+        sizes = []
+        for value_id, value in enumerate(values):
+            index.values.append(value)
+            index._value_ids[value] = value_id
+            grams = trigrams(value)
+            sizes.append(len(grams))
+            for gram in grams:
+                lists.setdefault(gram, []).append(value_id)
+        index._grow(len(values))
+        index._sizes[:len(values)] = sizes
+        index._postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in lists.items()}
+        return index
+
+    def add(self, value: str) -> int:
+        """ID of a normalized value, indexing it first if it is new"""
+        value_id = self._value_ids.get(value)
+        if value_id is not None:
+            return value_id
+        value_id = len(self.values)
+        self.values.append(value)
+        self._value_ids[value] = value_id
+        grams = trigrams(value)
+        self._grow(value_id + 1)
+        self._sizes[value_id] = len(grams)
+        for gram in grams:
+            self._delta.setdefault(gram, []).append(value_id)
+        self._delta_values += 1
+        if self._delta_values >= MAX_DELTA_ENTRIES:
+            self._merge()
+        return value_id
+
+    def _merge(self):
+        for gram, ids in self._delta.items():
+            existing = self._postings.get(gram)
+            added = np.array(ids, dtype=np.int32)
+            self._postings[gram] = added if existing is None else np.concatenate([existing, added])
+        self._delta, self._delta_values = {}, 0
+
+    def value_id(self, value: str) -> Optional[int]:
+        return self._value_ids.get(value)
+
+    def search(self, query: str, threshold: float = DEFAULT_THRESHOLD) -> Tuple[np.ndarray, np.ndarray]:
+        """Value IDs with similarity >= ``threshold`` to a normalized query, and their similarities, best first"""
+        grams = trigrams(query)
+        if not grams:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+        arrays = [self._postings[g] for g in grams if g in self._postings]
+        arrays.extend(np.array(self._delta[g], dtype=np.int32) for g in grams if g in self._delta)
+        if not arrays:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+        ids, overlap = np.unique(np.concatenate(arrays), return_counts=True)
+        similarity = overlap / (len(grams) + self._sizes[ids] - overlap)
+        keep = similarity >= threshold
+        ids, similarity = ids[keep], similarity[keep].astype(np.float32)
+        order = np.argsort(-similarity, kind="stable")
+        return ids[order], similarity[order]
+
+
+class CandidateFuzzyFields(BaseModel):
+    """Projection of the candidate fields the fuzzy index reads"""
+    id: PydanticObjectId = Field(alias="_id")
+    full_name: Optional[str] = None
+    email: Optional[str] = None
+    skills: List[Skill] = []
+
+
+def candidate_values(candidate) -> List[Tuple[str, str]]:
+    """(field, normalized value) pairs of a candidate that fuzzy lookup covers"""
+    pairs = [("name", normalize_noisy(candidate.full_name)), ("email", normalize_noisy(candidate.email))]
+    pairs.extend(("skill", normalize_noisy(s.name)) for s in candidate.skills or [])
+    return [(field, value) for field, value in dict.fromkeys(pairs) if value]
+
+
+class CandidateFuzzyIndex:
+    """
+    Typo-tolerant lookup of candidates by name, email or skill.
+
+    Each field has a trigram index over its distinct normalized values;
+    a value maps to the candidates carrying it. Kept current on insert and
+    delete, with changes made during a rebuild replayed afterwards.
+    """
+
+    def __init__(self):
+        self.indexes: Dict[str, TrigramIndex] = {field: TrigramIndex() for field in FUZZY_FIELDS}
+        self.built_at: Optional[float] = None
+        self._holders: Dict[Tuple[str, int], Set[str]] = {}
+        self._values: Dict[str, List[Tuple[str, str]]] = {}
+        self._pending: Optional[list] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def built(self) -> bool:
+        return self.built_at is not None
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _hold(self, candidate_id: str, values: List[Tuple[str, str]]):
+        self._values[candidate_id] = values
+        for field, value in values:
+            value_id = self.indexes[field].add(value)
+            self._holders.setdefault((field, value_id), set()).add(candidate_id)
+
+    async def rebuild(self):
+        """Reload every candidate from MongoDB and swap the trigram indexes in"""
+        async with self._lock:
+            start = time.perf_counter()
+            pending = self._pending = []
+            try:
+                rows = await Candidate.find_all().project(CandidateFuzzyFields).to_list()
+
+                def build():
+                    values = {str(c.id): candidate_values(c) for c in rows}
+                    distinct: Dict[str, Dict[str, None]] = {field: {} for field in FUZZY_FIELDS}
+                    for pairs in values.values():
+                        for field, value in pairs:
+                            distinct[field][value] = None
+                    fresh = CandidateFuzzyIndex()
+                    fresh.indexes = {field: TrigramIndex.build(list(distinct[field])) for field in FUZZY_FIELDS}
+                    for candidate_id, pairs in values.items():
+                        fresh._hold(candidate_id, pairs)
+                    return fresh
+
+                fresh = await asyncio.get_running_loop().run_in_executor(None, build)
+                self.indexes, self._holders, self._values = fresh.indexes, fresh._holders, fresh._values
+            finally:
+                self._pending = None
+            for op, arg in pending:
+                op(arg)
+            self.built_at = time.monotonic()
+            logger.info(
+                f"Built candidate fuzzy index: {len(self)} candidates, "
+                + ", ".join(f"{len(index)} {field}s" for field, index in self.indexes.items())
+                + f" in {time.perf_counter() - start:.2f}s"
+            )
+
+    def add(self, candidates: Sequence[Candidate]):
+        if self._pending is not None:
+            self._pending.append((self.add, candidates))
+        for c in candidates:
+            self._forget(str(c.id))
+            self._hold(str(c.id), candidate_values(c))
+
+    def remove(self, candidate_id: str):
+        if self._pending is not None:
+            self._pending.append((self.remove, candidate_id))
+        self._forget(candidate_id)
+
+    def _forget(self, candidate_id: str):
+        """Drop a candidate's values without recording the change for replay"""
+        for field, value in self._values.pop(candidate_id, []):
+            value_id = self.indexes[field].value_id(value)
+            holders = self._holders.get((field, value_id))
+            if holders is not None:
+                holders.discard(candidate_id)
+
+    def search(
+        self,
+        query: str,
+        fields: Sequence[str] = FUZZY_FIELDS,
+        limit: int = 20,
+        threshold: float = DEFAULT_THRESHOLD
+    ) -> List[Tuple[str, str, str, float]]:
+        """
+        Best (candidate ID, field, matched value, similarity) per candidate,
+        most similar first.
+        """
+        normalized = normalize_noisy(query)
+        best: Dict[str, Tuple[str, str, float]] = {}
+        for field in fields:
+            index = self.indexes[field]
+            ids, similarity = index.search(normalized, threshold)
+            # Values arrive best first, so a candidate's first hit is its best in this field
+            found: Dict[str, Tuple[str, str, float]] = {}
+            for value_id, score in zip(ids.tolist(), similarity.tolist()):
+                for candidate_id in self._holders.get((field, value_id), ()):
+                    found.setdefault(candidate_id, (field, index.values[value_id], score))
+                if len(found) >= limit:
+                    break
+            for candidate_id, hit in found.items():
+                if candidate_id not in best or hit[2] > best[candidate_id][2]:
+                    best[candidate_id] = hit
+        ranked = sorted(best.items(), key=lambda item: (-item[1][2], item[0]))[:limit]
+        return [(candidate_id, field, value, score) for candidate_id, (field, value, score) in ranked]
+
+    def stats(self) -> dict:
+        return {
+            "candidates": len(self),
+            **{f"{field}_values": len(index) for field, index in self.indexes.items()},
+            "built": self.built
+        }
@@ -0,0 +1,385 @@
+import asyncio
+import os
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from app.config import settings
+from app.models.candidate import Candidate, ResumeExtraction, BatchExtractionResult
+from app.schemas.ingestion import SpooledUpload
+from app.services.resume_extractor import ResumeExtractor
+from app.services.pdf_engine import PdfExtractionEngine
+from app.services.extraction_cache import ExtractionCache
+from app.services.skill_vocabulary import SkillVocabulary
+from app.services.metrics import span, files_total
+
+logger = logging.getLogger(__name__)
+
+
+class FileOutcome:
+    """Per-file state while a batch moves through the pipeline"""
+
+    def __init__(self, index: int, upload: SpooledUpload):
+        self.index = index
+        self.filename = upload.filename
+        self.path = upload.path
+        self.normalized_filename = upload.filename.strip().lower()
+        self.content_hash = upload.content_hash
+        self.keep_file = False  # Set once a candidate references the stored PDF
+        self.state = "queued"
+        self.result: Optional[ResumeExtraction] = None
+        self.error: Optional[str] = None
+
+    def fail(self, error: str):
+        self.error = error
+        self.state = "failed"
+
+    def succeed(self, result: ResumeExtraction):
+        self.result = result
+        self.state = "succeeded"
+
+
+ProgressCallback = Callable[[List[FileOutcome]], Awaitable[None]]
+InsertedCallback = Callable[[List[Candidate]], Awaitable[None]]
+
+
+class BatchRun:
+    """Outcomes of one batch plus the caller's progress callback"""
+
+    def __init__(self, outcomes: List[FileOutcome], on_progress: Optional[ProgressCallback] = None):
+        self.outcomes = outcomes
+        self.on_progress = on_progress
+
+    async def report(self):
+        """Forward progress to the caller, never letting it break the batch"""
+        if self.on_progress is None:
+            return
+        try:
+            await self.on_progress(self.outcomes)
+        except Exception as e:
+            logger.warning(f"Progress callback failed: {e}")
+
+
+class IngestionPipeline:
+    """
+    Staged, bounded-parallelism resume ingestion.
+
+    Stages:
+    1. PDF parsing runs on a PdfExtractionEngine (page-parallel worker
+       processes with time and memory limits), off the event loop.
+    2. LLM extraction runs on the Mistral async API, at most
+       ``llm_concurrency`` calls in flight across all batches.
+    3. Candidate documents are written with ``insert_many`` in batches of
+       ``insert_batch_size``.
+
+    Files are deduplicated by content hash. When an ExtractionCache is given,
+    resumes seen before skip both PDF parsing and the LLM call. With a
+    SkillVocabulary, each batch gets its canonical ``skill_ids`` just before
+    the write. ``on_inserted`` is awaited with each batch of newly written
+    candidates.
+
+    Per-file results are reported in upload order as a BatchExtractionResult,
+    exactly like the sequential implementation.
+    """
+
+    def __init__(
+        self,
+        extractor: ResumeExtractor,
+        cache: Optional[ExtractionCache] = None,
+        pdf_workers: Optional[int] = None,
+        llm_concurrency: Optional[int] = None,
+        insert_batch_size: Optional[int] = None,
+        vocabulary: Optional[SkillVocabulary] = None,
+        on_inserted: Optional[InsertedCallback] = None
+    ):
+        self.extractor = extractor
+        self.cache = cache
+        self.pdf_engine = PdfExtractionEngine(workers=pdf_workers)
+        self.llm_concurrency = llm_concurrency or settings.LLM_CONCURRENCY
+        self.insert_batch_size = insert_batch_size or settings.INSERT_BATCH_SIZE
+        self.vocabulary = vocabulary
+        self.on_inserted = on_inserted
+        self._llm_semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def llm_semaphore(self) -> asyncio.Semaphore:
+        """Semaphore bounding concurrent LLM calls, created on first use"""
+        if self._llm_semaphore is None:
+            self._llm_semaphore = asyncio.Semaphore(self.llm_concurrency)
+        return self._llm_semaphore
+
+    def shutdown(self):
+        """Stop the PDF worker processes"""
+        self.pdf_engine.shutdown()
+
+    async def run(
+        self,
+        files: List[SpooledUpload],
+        uploaded_by: str,
+        job_id: Optional[str] = None,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> BatchExtractionResult:
+        """
+        Run a batch of spooled files through every stage.
+
+        Files are already in their content-addressed storage location and are
+        parsed in place. ``on_progress`` is awaited with all outcomes whenever
+        a file changes state. Stored files that no candidate references are
+        deleted by the time this returns.
+        """
+        logger.info(f"Starting batch upload of {len(files)} files")
+
+        outcomes = [FileOutcome(i, upload) for i, upload in enumerate(files)]
+        try:
+            await self._run_stages(BatchRun(outcomes, on_progress), uploaded_by, job_id)
+        finally:
+            await self._remove_unreferenced_files(outcomes)
+            for outcome in outcomes:
+                files_total.inc(state=outcome.state)
+
+        result = self.build_result(outcomes)
+        logger.info(f"Batch upload completed: {result.succeeded}/{result.total_files} succeeded, {result.failed} failed")
+        if result.failed_files:
+            logger.error(f"Failed files: {result.failed_files}")
+        return result
+
+    async def _run_stages(self, batch: BatchRun, uploaded_by: str, job_id: Optional[str]):
+        """Deduplicate, extract and persist every file in the batch"""
+        # Validate file types up front
+        pending = []
+        for outcome in batch.outcomes:
+            if not outcome.filename.lower().endswith('.pdf') or not outcome.path:
+                logger.warning(f"File {outcome.filename} is not a PDF")
+                outcome.fail(f"File {outcome.filename} is not a PDF")
+                continue
+            pending.append(outcome)
+
+        # Check which files were already processed with a single query
+        with span("mongo_lookup"):
+            existing = await self._find_existing([o.content_hash for o in pending])
+
+        to_process = []
+        first_seen: Dict[str, FileOutcome] = {}
+        duplicates = []
+        for outcome in pending:
+            existing_candidate = existing.get(outcome.content_hash)
+            if existing_candidate:
+                logger.debug(f"File already processed: {outcome.filename}")
+                outcome.keep_file = existing_candidate.resume_url == outcome.path
+                outcome.succeed(self._candidate_to_extraction(existing_candidate))
+            elif outcome.content_hash in first_seen:
+                # Same file twice in one batch: reuse the first copy's result
+                duplicates.append((outcome, first_seen[outcome.content_hash]))
+            else:
+                first_seen[outcome.content_hash] = outcome
+                to_process.append(outcome)
+        await batch.report()
+
+        # Resumes extracted before under another name skip parsing and the LLM
+        cached = {}
+        if self.cache is not None:
+            with span("cache_lookup"):
+                cached = await self.cache.get_many([o.content_hash for o in to_process])
+
+        insert_queue: asyncio.Queue = asyncio.Queue()
+        inserter = asyncio.create_task(self._insert_worker(insert_queue, batch))
+
+        await asyncio.gather(*(
+            self._process_file(outcome, batch, cached.get(outcome.content_hash), uploaded_by, job_id, insert_queue)
+            for outcome in to_process
+        ))
+
+        await insert_queue.put(None)
+        await inserter
+
+        for outcome, original in duplicates:
+            outcome.result = original.result
+            outcome.error = original.error
+            outcome.state = original.state
+        await batch.report()
+
+    async def _process_file(
+        self,
+        outcome: FileOutcome,
+        batch: BatchRun,
+        cached: Optional[ResumeExtraction],
+        uploaded_by: str,
+        job_id: Optional[str],
+        insert_queue: asyncio.Queue
+    ):
+        """Parse, extract and queue one file for insertion"""
+        try:
+            logger.debug(f"Processing file: {outcome.filename}")
+            outcome.state = "processing"
+            await batch.report()
+
+            if cached is not None:
+                logger.debug(f"Extraction cache hit for {outcome.filename}")
+                resume_data = cached
+            else:
+                resume_data = await self._extract(outcome, outcome.path)
+
+            logger.debug(
+                f"Extraction completed for {outcome.filename}: {resume_data.full_name}, "
+                f"{len(resume_data.skills)} skills, {len(resume_data.experience)} jobs, "
+                f"{len(resume_data.education)} degrees"
+            )
+
+            outcome.result = resume_data
+            candidate = self._build_candidate(outcome, resume_data, outcome.path, uploaded_by, job_id)
+
+            # Stage 3: hand off to the batched inserter
+            await insert_queue.put((outcome, candidate))
+
+        except Exception as e:
+            logger.error(f"Failed to process {outcome.filename}: {e}")
+            outcome.fail(str(e))
+            await batch.report()
+
+    async def _extract(self, outcome: FileOutcome, pdf_path: str) -> ResumeExtraction:
+        """Run the PDF and LLM stages for one file, caching LLM results"""
+        # Stage 1: PDF parsing in worker processes
+        with span("pdf_parse"):
+            extracted_text, num_pages = await self.pdf_engine.extract(pdf_path)
+
+        # Stage 2: bounded-concurrency LLM extraction; the wait shows whether LLM_CONCURRENCY is the bottleneck
+        with span("llm_wait"):
+            await self.llm_semaphore.acquire()
+        try:
+            resume_data, source = await self.extractor.extract_with_source_async(extracted_text, num_pages)
+        finally:
+            self.llm_semaphore.release()
+
+        # Only cache real LLM output; fallback results reflect an outage, not the resume
+        if self.cache is not None and source == "llm":
+            await self.cache.put(outcome.content_hash, resume_data, num_pages)
+
+        return resume_data
+
+    async def _insert_worker(self, insert_queue: asyncio.Queue, batch: BatchRun):
+        """Drain the insert queue, writing candidates in batches"""
+        buffer = []
+        while True:
+            item = await insert_queue.get()
+            if item is None:
+                break
+            buffer.append(item)
+            if len(buffer) >= self.insert_batch_size:
+                await self._flush(buffer)
+                await batch.report()
+                buffer = []
+        if buffer:
+            await self._flush(buffer)
+            await batch.report()
+
+    async def _flush(self, buffer: list):
+        """Insert a batch of candidates, failing every file in it on error"""
+        candidates = [candidate for _, candidate in buffer]
+        if self.vocabulary is not None:
+            try:
+                await self.vocabulary.assign(candidates)
+            except Exception as e:
+                # Left as None; the startup backfill resolves them later
+                logger.warning(f"Could not resolve skill IDs for {len(candidates)} candidates: {e}")
+        try:
+            with span("mongo_insert"):
+                await self._insert_candidates(candidates)
+            logger.debug(f"Saved {len(buffer)} candidates to database")
+            for outcome, _ in buffer:
+                outcome.state = "succeeded"
+                outcome.keep_file = True
+        except Exception as e:
+            logger.error(f"Failed to insert {len(buffer)} candidates: {e}")
+            for outcome, _ in buffer:
+                outcome.fail(str(e))
+            return
+        if self.on_inserted is not None:
+            try:
+                await self.on_inserted(candidates)
+            except Exception as e:
+                # The candidates are stored; the indexes fed by this hook are repaired by the next rebuild or sync
+                logger.warning(f"Post-insert hook failed for {len(candidates)} candidates: {e}")
+
+    async def _remove_unreferenced_files(self, outcomes: List[FileOutcome]):
+        """Delete stored PDFs that ended up without a candidate"""
+        kept = {o.path for o in outcomes if o.keep_file}
+        orphans = {o.path for o in outcomes if o.path} - kept
+        if not orphans:
+            return
+        try:
+            # Another batch may have stored a candidate for the same content meanwhile
+            referenced = await Candidate.find({"resume_url": {"$in": list(orphans)}}).to_list()
+        except Exception as e:
+            logger.warning(f"Could not check stored resumes, keeping them: {e}")
+            return
+        for path in orphans - {c.resume_url for c in referenced}:
+            if os.path.exists(path):
+                os.unlink(path)
+
+    async def _find_existing(self, content_hashes: List[str]) -> Dict[str, Candidate]:
+        """Look up already-processed files by content hash"""
+        if not content_hashes:
+            return {}
+        candidates = await Candidate.find({"content_hash": {"$in": content_hashes}}).to_list()
+        existing = {}
+        for candidate in candidates:
+            existing.setdefault(candidate.content_hash, candidate)
+        return existing
+
+    async def _insert_candidates(self, candidates: List[Candidate]):
+        """Insert candidates in one round-trip and assign their IDs"""
+        result = await Candidate.insert_many(candidates)
+        for candidate, inserted_id in zip(candidates, result.inserted_ids):
+            candidate.id = inserted_id
+
+    def _build_candidate(
+        self,
+        outcome: FileOutcome,
+        resume_data: ResumeExtraction,
+        file_path: str,
+        uploaded_by: str,
+        job_id: Optional[str]
+    ) -> Candidate:
+        """Create the candidate document for an extracted resume"""
+        return Candidate(
+            filename=outcome.filename,
+            full_name=resume_data.full_name,
+            email=resume_data.email,
+            phone=resume_data.phone,
+            location=resume_data.location,
+            summary=resume_data.summary,
+            skills=resume_data.skills,
+            experience=resume_data.experience,
+            education=resume_data.education,
+            certifications=resume_data.certifications,
+            languages=resume_data.languages,
+            resume_url=file_path,
+            content_hash=outcome.content_hash,
+            job_id=job_id,  # Job-specific upload
+            uploaded_by=uploaded_by
+        )
+
+    def _candidate_to_extraction(self, candidate: Candidate) -> ResumeExtraction:
+        """Rebuild the extraction result for an already-stored candidate"""
+        return ResumeExtraction(
+            full_name=candidate.full_name,
+            email=candidate.email,
+            phone=candidate.phone,
+            location=candidate.location,
+            summary=candidate.summary,
+            skills=candidate.skills,
+            experience=candidate.experience,
+            education=candidate.education
+        )
+
+    def build_result(self, outcomes: List[FileOutcome]) -> BatchExtractionResult:
+        """Assemble the batch summary so far, in upload order"""
+        results = [o.result for o in outcomes if o.state == "succeeded"]
+        failed_files = [o.filename for o in outcomes if o.state == "failed"]
+
+        return BatchExtractionResult(
+            total_files=len(outcomes),
+            succeeded=len(results),
+            failed=len(failed_files),
+            failed_files=failed_files,
+            results=results
+        )
@@ -0,0 +1,153 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Awaitable, Callable, List, Optional
+
+from app.config import settings
+from app.schemas.ingestion import IngestionTask, IngestionBatchStatus
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # Redis backend is optional
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+TaskHandler = Callable[[IngestionTask], Awaitable[None]]
+
+
+class IngestionQueue(ABC):
+    """
+    Work queue for upload batches plus a store for their progress.
+
+    Backends implement the four storage primitives; the worker loop is shared.
+    """
+
+    def __init__(self):
+        self._workers: List[asyncio.Task] = []
+
+    @abstractmethod
+    async def enqueue(self, task: IngestionTask):
+        """Add a batch to the queue"""
+
+    @abstractmethod
+    async def dequeue(self) -> IngestionTask:
+        """Wait for and take the next batch"""
+
+    @abstractmethod
+    async def save_status(self, status: IngestionBatchStatus):
+        """Store a batch's progress"""
+
+    @abstractmethod
+    async def get_status(self, batch_id: str) -> Optional[IngestionBatchStatus]:
+        """A batch's last stored progress, or None if unknown or expired"""
+
+    def start(self, handler: TaskHandler, workers: int = 1):
+        """Start worker tasks that feed queued batches to ``handler``"""
+        for _ in range(workers):
+            self._workers.append(asyncio.create_task(self._worker_loop(handler)))
+        logger.info(f"Started {workers} ingestion worker(s) on {type(self).__name__}")
+
+    async def stop(self):
+        """Cancel the worker tasks"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def _worker_loop(self, handler: TaskHandler):
+        while True:
+            task = await self.dequeue()
+            try:
+                await handler(task)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Ingestion batch {task.batch_id} failed: {e}")
+                status = await self.get_status(task.batch_id)
+                if status:
+                    status.status = "failed"
+                    await self.save_status(status)
+
+
+class InMemoryIngestionQueue(IngestionQueue):
+    """Single-process backend; batch statuses are kept for the most recent batches only"""
+
+    def __init__(self, max_batches: int = 1000):
+        super().__init__()
+        self.max_batches = max_batches
+        self._queue: Optional[asyncio.Queue] = None
+        self._statuses: "OrderedDict[str, IngestionBatchStatus]" = OrderedDict()
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        return self._queue
+
+    async def enqueue(self, task: IngestionTask):
+        await self.queue.put(task)
+
+    async def dequeue(self) -> IngestionTask:
+        return await self.queue.get()
+
+    async def save_status(self, status: IngestionBatchStatus):
+        self._statuses[status.batch_id] = status
+        self._statuses.move_to_end(status.batch_id)
+        while len(self._statuses) > self.max_batches:
+            self._statuses.popitem(last=False)
+
+    async def get_status(self, batch_id: str) -> Optional[IngestionBatchStatus]:
+        return self._statuses.get(batch_id)
+
+
+class RedisIngestionQueue(IngestionQueue):
+    """
+    Redis-backed queue so batches survive restarts and can be shared between workers.
+
+    Tasks reference stored PDFs by path, so workers on other hosts must share
+    the resume upload directory.
+    """
+
+    QUEUE_KEY = "ingestion:queue"
+    STATUS_KEY = "ingestion:batch:{}"
+
+    def __init__(self, url: str, status_ttl_seconds: int = 7 * 24 * 3600):
+        super().__init__()
+        if aioredis is None:
+            raise RuntimeError("The redis package is required for the redis ingestion queue backend")
+        self.redis = aioredis.from_url(url)
+        self.status_ttl_seconds = status_ttl_seconds
+
+    async def enqueue(self, task: IngestionTask):
+        await self.redis.lpush(self.QUEUE_KEY, task.model_dump_json())
+
+    async def dequeue(self) -> IngestionTask:
+        _, raw = await self.redis.brpop(self.QUEUE_KEY)
+        return IngestionTask.model_validate_json(raw)
+
+    async def save_status(self, status: IngestionBatchStatus):
+        await self.redis.set(
+            self.STATUS_KEY.format(status.batch_id),
+            status.model_dump_json(),
+            ex=self.status_ttl_seconds
+        )
+
+    async def get_status(self, batch_id: str) -> Optional[IngestionBatchStatus]:
+        raw = await self.redis.get(self.STATUS_KEY.format(batch_id))
+        return IngestionBatchStatus.model_validate_json(raw) if raw else None
+
+    async def stop(self):
+        await super().stop()
+        await self.redis.close()
+
+
+def create_ingestion_queue() -> IngestionQueue:
+    """Build the queue backend selected by INGESTION_QUEUE_BACKEND"""
+    backend = settings.INGESTION_QUEUE_BACKEND.lower()
+    if backend == "redis":
+        return RedisIngestionQueue(settings.REDIS_URL)
+    if backend == "memory":
+        return InMemoryIngestionQueue()
+    raise ValueError(f"Unknown ingestion queue backend: {settings.INGESTION_QUEUE_BACKEND}")
@@ -0,0 +1,379 @@
+import asyncio
+import json
+import logging
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel, ValidationError
+
+from app.config import settings
+from app.services.llm_client import MistralClientManager
+from app.services.llm_json_recovery import find_json_object, strip_code_fences
+from app.services.skill_vocabulary import find_skills
+
+logger = logging.getLogger(__name__)
+
+EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+BULLET_RE = re.compile(r"^[\s•·*\-–—]+")
+LABEL_RE = re.compile(
+    r"^\s*(job title|title|position|role|company|employer|organi[sz]ation|location|job type|"
+    r"employment type|type|salary|compensation|pay|deadline|apply by|closing date)\s*:\s*(.+)$",
+    re.IGNORECASE
+)
+HEADER_RE = re.compile(
+    r"^\s*(?:[#*]+\s*)?(about (?:the )?(?:role|job|position|company|us)|who we are|the role|job description|overview|"
+    r"requirements|qualifications|what you(?:'ll| will)? (?:need|bring)|must[- ]haves?|nice[- ]to[- ]haves?|"
+    r"skills(?: (?:&|and) experience)?|who you are|about you|"
+    r"responsibilities|what you(?:'ll| will) do|your role|duties|key responsibilities|day[- ]to[- ]day|"
+    r"benefits|perks|what we offer|why join us|compensation(?: (?:&|and) benefits)?|"
+    r"how to apply|application process)\s*:?\s*(?:[#*]+)?\s*$",
+    re.IGNORECASE
+)
+# Header keyword -> the JobParseResponse field its section feeds
+SECTION_KINDS = (
+    ("requirement", "requirements"), ("qualification", "requirements"), ("need", "requirements"),
+    ("bring", "requirements"), ("must", "requirements"), ("nice", "requirements"), ("skill", "requirements"),
+    ("who you are", "requirements"), ("about you", "requirements"),
+    ("responsibilit", "responsibilities"), ("you'll do", "responsibilities"), ("you will do", "responsibilities"),
+    ("your role", "responsibilities"), ("dut", "responsibilities"), ("day", "responsibilities"),
+    ("benefit", "benefits"), ("perk", "benefits"), ("offer", "benefits"), ("why join", "benefits"),
+    ("compensation", "benefits"),
+    ("company", "company"), ("about us", "company"), ("who we are", "company"),
+    ("apply", "apply"),
+)
+MAX_HEADER_LENGTH = 50
+MAX_TITLE_LENGTH = 80
+
+CURRENCIES = {"$": "USD", "€": "EUR", "£": "GBP", "₹": "INR", "usd": "USD", "eur": "EUR", "gbp": "GBP",
+              "cad": "CAD", "aud": "AUD", "chf": "CHF", "inr": "INR"}
+CURRENCY = r"(?:[$€£₹]|\b(?:USD|EUR|GBP|CAD|AUD|CHF|INR)\b)"
+AMOUNT = r"(\d{1,3}(?:[,.\s]\d{3})+|\d+(?:\.\d+)?)\s*([kK]\b)?"
+PERIOD = (r"\s*(?:/\s*|\b(?:per|an|a|each)\s+)(hour|hr|day|week|month|mo|year|yr|annum)\b"
+          r"|\s*\b(hourly|daily|weekly|monthly|yearly|annually|p\.?a\.?)\b")
+SALARY_RANGE_RE = re.compile(
+    rf"({CURRENCY})?\s*{AMOUNT}\s*({CURRENCY})?\s*(?:-|–|—|to)\s*({CURRENCY})?\s*{AMOUNT}\s*({CURRENCY})?(?:{PERIOD})?",
+    re.IGNORECASE
+)
+SALARY_SINGLE_RE = re.compile(
+    rf"(?:up to|from|starting at|at least|minimum|max(?:imum)?)?\s*({CURRENCY})\s*{AMOUNT}\s*({CURRENCY})?(?:{PERIOD})?",
+    re.IGNORECASE
+)
+SALARY_CONTEXT_RE = re.compile(r"\b(salary|compensation|pay|base|ote|rate|wage)\b", re.IGNORECASE)
+# How far before a bare range a salary word may sit, and what ends the clause it has to share
+SALARY_CONTEXT_CHARS = 30
+CLAUSE_BREAK_RE = re.compile(r"[;|]|\.\s|,\s*(?=\D)")
+# Ranges of something other than money: "3-5 years", "25-30 days", "10-15%", "grade 7-8"
+NOT_MONEY_AFTER_RE = re.compile(
+    r"^\s*\+?\s*(?:%|percent\b|years?\b|yrs?\b|months?\b|weeks?\b|days?\b|hours?\b|hrs?\b|"
+    r"people\b|employees\b|grade\b|level\b)",
+    re.IGNORECASE
+)
+NOT_MONEY_BEFORE_RE = re.compile(r"\b(?:grade|level|band|step|tier|ages?)\s*:?\s*$", re.IGNORECASE)
+PHONE_SHAPE_RE = re.compile(r"\d{3}-\d{4}")
+PERIODS = {"hour": "hour", "hr": "hour", "hourly": "hour", "day": "day", "daily": "day", "week": "week",
+           "weekly": "week", "month": "month", "mo": "month", "monthly": "month", "year": "year", "yr": "year",
+           "annum": "year", "yearly": "year", "annually": "year", "pa": "year", "p.a": "year", "p.a.": "year"}
+
+EMPLOYMENT_TYPES = (
+    ("internship", re.compile(r"\b(intern(?:ship)?|trainee|apprentice(?:ship)?)\b", re.IGNORECASE)),
+    ("contract", re.compile(r"\b(contract(?:or)?|freelance|fixed[- ]term|temporary|temp)\b", re.IGNORECASE)),
+    ("part-time", re.compile(r"\bpart[- ]?time\b", re.IGNORECASE)),
+    ("full-time", re.compile(r"\b(full[- ]?time|permanent)\b", re.IGNORECASE)),
+)
+WORK_MODE_RE = re.compile(r"\b(fully remote|remote|hybrid|on[- ]?site)\b", re.IGNORECASE)
+BASED_IN_RE = re.compile(r"\b(?:based in|located in|office in)\s+([A-Z][\w .'-]+(?:,\s*[A-Z][\w .'-]+)?)")
+TITLE_AT_RE = re.compile(r"^(.{3,80}?)\s+(?:at|@)\s+(.{2,60})$")
+COMPANY_ABOUT_RE = re.compile(r"^\s*about\s+(?!the\b|us\b|you\b)(.{2,60}?)\s*:?\s*$", re.IGNORECASE)
+DEADLINE_RE = re.compile(
+    r"\b(?:deadline|apply by|closing date|applications close|closes)\s*:?\s*(?:on\s+)?"
+    r"(\d{4}-\d{2}-\d{2}|\d{1,2}[/.]\d{1,2}[/.]\d{4}|[A-Za-z]{3,9}\.? \d{1,2},? \d{4}|\d{1,2} [A-Za-z]{3,9}\.? \d{4})",
+    re.IGNORECASE
+)
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d.%m.%Y", "%B %d %Y", "%b %d %Y", "%d %B %Y", "%d %b %Y")
+
+# Fields the LLM may fill when the rules leave them empty, and what counts as empty
+LLM_FIELDS = ("title", "company", "location", "requirements", "responsibilities", "benefits")
+CORE_FIELDS = ("title", "company", "location", "salary_min", "requirements", "responsibilities")
+
+
+class ParsedJob(BaseModel):
+    """Structured fields of one job description; empty fields were not found"""
+    title: str = ""
+    company: str = ""
+    location: str = ""
+    type: str = "full-time"
+    salary_min: Optional[int] = None
+    salary_max: Optional[int] = None
+    salary_currency: Optional[str] = None
+    salary_period: Optional[str] = None
+    description: str = ""
+    requirements: str = ""
+    responsibilities: str = ""
+    benefits: str = ""
+    contact_email: str = ""
+    application_deadline: Optional[datetime] = None
+    skills: List[str] = []
+    confidence_score: float = 0.0
+    parsed_fields: List[str] = []
+    llm_fields: List[str] = []
+
+
+class LLMJobFields(BaseModel):
+    """What the LLM is asked for; everything optional so partial answers still merge"""
+    title: Optional[str] = None
+    company: Optional[str] = None
+    location: Optional[str] = None
+    requirements: Optional[str] = None
+    responsibilities: Optional[str] = None
+    benefits: Optional[str] = None
+
+
+def _amount(number: str, thousands: Optional[str]) -> Optional[int]:
+    digits = re.sub(r"[,\s]", "", number)
+    # "60.000" is a thousands separator, "62.5" is a decimal
+    if re.fullmatch(r"\d{1,3}(?:\.\d{3})+", digits):
+        digits = digits.replace(".", "")
+    try:
+        value = float(digits)
+    except ValueError:
+        return None
+    return int(round(value * 1000 if thousands else value))
+
+
+def parse_salary(text: str) -> Optional[Tuple[Optional[int], int, Optional[str], Optional[str]]]:
+    """
+    (min, max, currency, period) of the first salary in ``text``; min is
+    None for an "up to" cap.
+
+    A range only counts as pay when it has a currency, a "k" suffix, a pay
+    period, or a salary word just before it in the same clause. Ranges of
+    years, days, percentages or grades and phone-number shapes never do.
+    """
+    for line in text.splitlines():
+        for match in SALARY_RANGE_RE.finditer(line):
+            cur1, low, low_k, cur2, cur3, high, high_k, cur4, period1, period2 = match.groups()
+            currency = cur1 or cur2 or cur3 or cur4
+            if not _looks_like_pay(line, match, bool(currency or low_k or high_k or period1 or period2)):
+                continue
+            # "80-100k" means 80k-100k
+            low_value = _amount(low, low_k or (high_k if not low_k and len(low) <= 3 else None))
+            high_value = _amount(high, high_k)
+            if not low_value or not high_value or low_value > high_value:
+                continue
+            return low_value, high_value, _currency(currency), _period(period1 or period2)
+        for match in SALARY_SINGLE_RE.finditer(line):
+            currency, amount, thousands, currency2, period1, period2 = match.groups()
+            value = _amount(amount, thousands)
+            if not value:
+                continue
+            is_cap = match.group(0).strip().lower().startswith(("up to", "max"))
+            return (None if is_cap else value), value, _currency(currency or currency2), _period(period1 or period2)
+    return None
+
+
+def _looks_like_pay(line: str, match: re.Match, marked: bool) -> bool:
+    """Whether a number range is money: ``marked`` ranges carry a currency, "k" or period"""
+    before, after = line[:match.start()], line[match.end():]
+    if NOT_MONEY_AFTER_RE.match(after) or NOT_MONEY_BEFORE_RE.search(before):
+        return False
+    if marked:
+        return True
+    if PHONE_SHAPE_RE.fullmatch(match.group(0).strip()):
+        return False
+    clause = CLAUSE_BREAK_RE.split(before[-SALARY_CONTEXT_CHARS:])[-1]
+    return SALARY_CONTEXT_RE.search(clause) is not None
+
+
+def _currency(token: Optional[str]) -> Optional[str]:
+    return CURRENCIES.get(token.lower()) if token else None
+
+
+def _period(token: Optional[str]) -> Optional[str]:
+    return PERIODS.get(token.lower().rstrip(".")) if token else None
+
+
+def _section_kind(header: str) -> Optional[str]:
+    header = header.lower()
+    for keyword, kind in SECTION_KINDS:
+        if keyword in header:
+            return kind
+    return None
+
+
+def _parse_date(text: str) -> Optional[datetime]:
+    # "Mar. 31, 2025" -> "Mar 31 2025"
+    text = " ".join(re.sub(r"(?<=[A-Za-z])\.", "", text.replace(",", " ")).split())
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def parse_job_text(text: str) -> ParsedJob:
+    """Rule-based extraction: labelled fields, sections, salary, type, skills"""
+    job = ParsedJob(description=text)
+    sections: Dict[str, List[str]] = {}
+    section = "intro"
+    labels: Dict[str, str] = {}
+    intro: List[str] = []
+
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        if len(line) <= MAX_HEADER_LENGTH and HEADER_RE.match(line):
+            section = _section_kind(line) or "other"
+            continue
+        label = LABEL_RE.match(line)
+        if label:
+            labels.setdefault(label.group(1).lower(), label.group(2).strip())
+            continue
+        company = COMPANY_ABOUT_RE.match(line) if section == "intro" else None
+        if company and len(line) <= MAX_HEADER_LENGTH:
+            labels.setdefault("company", company.group(1))
+            section = "company"
+            continue
+        if section == "intro":
+            intro.append(line)
+        else:
+            sections.setdefault(section, []).append(BULLET_RE.sub("- ", raw.rstrip()) if BULLET_RE.match(raw) else line)
+
+    job.title = labels.get("job title") or labels.get("title") or labels.get("position") or labels.get("role") or ""
+    job.company = labels.get("company") or labels.get("employer") or labels.get("organisation") or labels.get("organization") or ""
+    if intro and not job.title:
+        first = intro[0].lstrip("# ").strip()
+        at = TITLE_AT_RE.match(first)
+        if at:
+            job.title = at.group(1).strip(" -|")
+            job.company = job.company or at.group(2).strip(" .")
+        elif len(first) <= MAX_TITLE_LENGTH and not first.endswith("."):
+            job.title = first
+
+    location = labels.get("location")
+    if not location:
+        based = BASED_IN_RE.search(text)
+        mode = WORK_MODE_RE.search(text)
+        parts = [based.group(1).strip(" .") if based else None, mode.group(1).title() if mode else None]
+        location = " / ".join(p for p in parts if p)
+    job.location = location or ""
+
+    type_text = labels.get("job type") or labels.get("employment type") or labels.get("type") or text
+    for name, pattern in EMPLOYMENT_TYPES:
+        if pattern.search(type_text):
+            job.type = name
+            break
+
+    salary = parse_salary(labels.get("salary") or labels.get("compensation") or labels.get("pay") or "") or parse_salary(text)
+    if salary:
+        job.salary_min, job.salary_max, job.salary_currency, job.salary_period = salary
+
+    email = EMAIL_RE.search(text)
+    if email:
+        job.contact_email = email.group(0)
+
+    deadline = labels.get("deadline") or labels.get("apply by") or labels.get("closing date")
+    if deadline:
+        job.application_deadline = _parse_date(deadline)
+    if job.application_deadline is None:
+        match = DEADLINE_RE.search(text)
+        if match:
+            job.application_deadline = _parse_date(match.group(1))
+
+    job.requirements = "\n".join(sections.get("requirements", []))
+    job.responsibilities = "\n".join(sections.get("responsibilities", []))
+    job.benefits = "\n".join(sections.get("benefits", []))
+    job.skills = find_skills(job.requirements or text)
+
+    job.parsed_fields = [
+        field for field in ("title", "company", "location", "type", "salary_min", "salary_max", "requirements",
+                            "responsibilities", "benefits", "contact_email", "application_deadline", "skills")
+        if getattr(job, field) not in ("", None, [])
+    ]
+    job.confidence_score = _confidence(job)
+    return job
+
+
+def _confidence(job: ParsedJob) -> float:
+    return round(sum(1 for field in CORE_FIELDS if getattr(job, field) not in ("", None)) / len(CORE_FIELDS), 2)
+
+
+class JobParser:
+    """
+    Job description parser: precompiled rules first, the LLM only for the
+    fields they leave empty.
+
+    A batch is parsed by the rules in one pass; descriptions that still miss
+    fields go to the LLM concurrently, at most LLM_CONCURRENCY at a time,
+    asking for the missing fields only. Without an API key, or while the
+    circuit breaker is open, the rule-based result is returned as is.
+    """
+
+    def __init__(self, client_manager: Optional[MistralClientManager] = None, concurrency: Optional[int] = None):
+        self.client_manager = client_manager
+        self.concurrency = concurrency or settings.LLM_CONCURRENCY
+
+    async def parse_many(self, texts: Sequence[str], use_llm: bool = True) -> List[ParsedJob]:
+        # About a millisecond per posting; a 500-posting import stays off the event loop
+        loop = asyncio.get_running_loop()
+        jobs = await loop.run_in_executor(None, lambda: [parse_job_text(text) for text in texts])
+        if not use_llm or self.client_manager is None:
+            return jobs
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def complete(job: ParsedJob):
+            missing = [field for field in LLM_FIELDS if not getattr(job, field)]
+            if not missing:
+                return
+            async with semaphore:
+                await self._fill_with_llm(job, missing)
+
+        await asyncio.gather(*(complete(job) for job in jobs))
+        return jobs
+
+    async def parse(self, text: str, use_llm: bool = True) -> ParsedJob:
+        return (await self.parse_many([text], use_llm))[0]
+
+    async def _fill_with_llm(self, job: ParsedJob, missing: List[str]):
+        client = self.client_manager.acquire()
+        if client is None:
+            return
+        prompt = (
+            "Extract the following fields from the job description below and return a JSON object with "
+            f"exactly these keys: {', '.join(missing)}. Use null for anything the text does not state. "
+            "requirements, responsibilities and benefits are newline-separated lists copied from the text.\n\n"
+            f"Job description:\n{job.description}"
+        )
+        try:
+            response = await client.chat.complete_async(
+                model=settings.MISTRAL_MODEL,
+                messages=[
+                    {"role": "system", "content": "You extract structured fields from job postings and reply with JSON only."},
+                    {"role": "user", "content": prompt}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0
+            )
+            self.client_manager.record_success()
+            content, _ = strip_code_fences(response.choices[0].message.content)
+            fields = LLMJobFields.model_validate(json.loads(find_json_object(content)[0]))
+        except (ValueError, ValidationError) as e:
+            logger.warning(f"Unusable LLM answer for job fields: {e}")
+            return
+        except Exception as e:
+            self.client_manager.record_error(e)
+            logger.warning(f"LLM job field extraction failed: {e}")
+            return
+
+        for field in missing:
+            value = getattr(fields, field)
+            if isinstance(value, str) and value.strip():
+                setattr(job, field, value.strip())
+                job.llm_fields.append(field)
+                job.parsed_fields.append(field)
+        if "requirements" in job.llm_fields:
+            job.skills = find_skills(job.requirements)
+        job.confidence_score = _confidence(job)
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from beanie import PydanticObjectId
+from pydantic import BaseModel, Field
+
+from app.models.job import Job
+from app.services.text_index import FieldValue, TextIndex, analyze_stemmed
+
+logger = logging.getLogger(__name__)
+
+# Title hits outrank company hits, which outrank description and requirement hits
+JOB_FIELDS: Dict[str, float] = {
+    "title": 4.0,
+    "company": 2.0,
+    "description": 1.0,
+    "requirements": 1.0,
+}
+
+
+class JobSearchFields(BaseModel):
+    """Projection of the job fields the search index reads"""
+    id: PydanticObjectId = Field(alias="_id")
+    title: str
+    company: str
+    description: str = ""
+    requirements: Optional[str] = None
+    status: str = "draft"
+    is_active: bool = True
+
+
+def job_fields(job) -> Dict[str, FieldValue]:
+    """Searchable text of a job document or projection, by field"""
+    return {field: getattr(job, field, None) for field in JOB_FIELDS}
+
+
+class JobSearchIndex:
+    """
+    BM25 index over job postings with stemmed terms, so "developers" finds
+    "Developer" and "managing" finds "Engineering Manager".
+
+    Also keeps each job's status and active flag, so the list filters apply
+    before paging without a database round trip. Kept current by the job
+    endpoints; changes made during a rebuild are replayed onto the rebuilt
+    index.
+    """
+
+    def __init__(self):
+        self.index = TextIndex(JOB_FIELDS, analyze_stemmed)
+        self.built_at: Optional[float] = None
+        self._states: Dict[str, Tuple[str, bool]] = {}
+        self._pending: Optional[list] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def built(self) -> bool:
+        return self.built_at is not None
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    async def rebuild(self):
+        """Reload every job from MongoDB and swap the index in"""
+        async with self._lock:
+            start = time.perf_counter()
+            pending = self._pending = []
+            try:
+                rows = await Job.find_all().sort("+_id").project(JobSearchFields).to_list()
+                self.index = await asyncio.get_running_loop().run_in_executor(
+                    None, lambda: TextIndex.build(((str(j.id), job_fields(j)) for j in rows), JOB_FIELDS, analyze_stemmed)
+                )
+                self._states = {str(j.id): (j.status, j.is_active) for j in rows}
+            finally:
+                self._pending = None
+            for op, arg in pending:
+                op(arg)
+            self.built_at = time.monotonic()
+            logger.info(f"Built job search index: {len(self)} jobs in {time.perf_counter() - start:.2f}s")
+
+    async def sync(self):
+        """Startup build; a failure leaves searches to rebuild on first use"""
+        try:
+            await self.rebuild()
+        except Exception as e:
+            logger.warning(f"Job search index build failed: {e}")
+
+    def add(self, jobs: Sequence[Job]):
+        """Index new or edited jobs, replacing earlier versions"""
+        if self._pending is not None:
+            self._pending.append((self.add, jobs))
+        for job in jobs:
+            job_id = str(job.id)
+            self.index.add(job_id, job_fields(job))
+            self._states[job_id] = (job.status, job.is_active)
+
+    def set_state(self, job_id: str, status: str, is_active: bool):
+        """Record a status change that does not touch the indexed text"""
+        if self._pending is not None:
+            self._pending.append((lambda args: self.set_state(*args), (job_id, status, is_active)))
+        if job_id in self._states:
+            self._states[job_id] = (status, is_active)
+
+    def remove(self, job_id: str):
+        if self._pending is not None:
+            self._pending.append((self.remove, job_id))
+        self.index.remove(job_id)
+        self._states.pop(job_id, None)
+
+    def search(
+        self,
+        query: str,
+        offset: int,
+        limit: int,
+        status: Optional[str] = None,
+        is_active: Optional[bool] = None
+    ) -> Tuple[List[Tuple[str, float]], int]:
+        """One page of (job ID, score), most relevant first, and the number of matching jobs"""
+        def where(job_id: str) -> bool:
+            job_status, job_active = self._states.get(job_id, (None, None))
+            return (status is None or job_status == status) and (is_active is None or job_active == is_active)
+
+        filtered = status is not None or is_active is not None
+        return self.index.search(query, limit, offset, where if filtered else None)
+
+    def stats(self) -> dict:
+        return {**self.index.stats(), "built": self.built}
@@ -0,0 +1,211 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Optional
+
+import httpx
+from mistralai import Mistral
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses that mean the service is unusable rather than the request being bad
+OUTAGE_STATUS_CODES = {401, 403, 408, 429}
+
+
+def is_outage_error(error: Exception) -> bool:
+    """True if ``error`` means the LLM endpoint is down, as opposed to a bad response"""
+    if isinstance(error, (httpx.TransportError, asyncio.TimeoutError)):
+        return True
+    if type(error).__name__ == "NoResponseError":
+        return True
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "raw_response", None), "status_code", None)
+    return status is not None and (status >= 500 or status in OUTAGE_STATUS_CODES)
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    callers skip the LLM entirely. Once ``reset_timeout`` has passed a single
+    trial request is let through (half-open); its outcome closes the circuit
+    or opens it for another ``reset_timeout``.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_started_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow_request(self) -> bool:
+        """Whether a call may go to the LLM now; claims the trial slot when half-open"""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.OPEN:
+            return False
+        # Only one trial at a time; a trial that never reported back expires
+        now = time.monotonic()
+        if self.trial_started_at is None or now - self.trial_started_at >= self.reset_timeout:
+            self.trial_started_at = now
+            return True
+        return False
+
+    def record_success(self):
+        if self.opened_at is not None:
+            logger.info("LLM circuit closed")
+        self.failures = 0
+        self.opened_at = None
+        self.trial_started_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        self.trial_started_at = None
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.trip()
+
+    def trip(self):
+        """Open the circuit now"""
+        if self.state == self.CLOSED:
+            logger.warning(f"LLM circuit opened after {self.failures} failure(s)")
+        self.opened_at = time.monotonic()
+        self.trial_started_at = None
+
+
+class MistralClientManager:
+    """
+    Owns the process-wide Mistral client.
+
+    The client is created on first use and shares one pooled ``httpx.AsyncClient``
+    across all requests. A background probe keeps the circuit breaker up to date,
+    so while the API is unreachable extractions go straight to the fallback
+    parser instead of each one timing out first.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        server_url: Optional[str] = None,
+        max_connections: Optional[int] = None,
+        timeout: Optional[float] = None,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        self.api_key = api_key or settings.MISTRAL_API_KEY or os.getenv("MISTRAL_API_KEY")
+        self.server_url = server_url or settings.MISTRAL_SERVER_URL or None
+        self.max_connections = max_connections or settings.MISTRAL_MAX_CONNECTIONS
+        self.timeout = timeout or settings.MISTRAL_TIMEOUT_SECONDS
+        self.breaker = breaker or CircuitBreaker(
+            settings.LLM_BREAKER_FAILURE_THRESHOLD,
+            settings.LLM_BREAKER_RESET_SECONDS
+        )
+        self._client: Optional[Mistral] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        self._probe_task: Optional[asyncio.Task] = None
+
+        if not self.api_key:
+            logger.error("No Mistral API key found!")
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key)
+
+    @property
+    def client(self) -> Optional[Mistral]:
+        """The shared client, created on first access; None without an API key"""
+        if self._client is None and self.configured:
+            self._http = httpx.AsyncClient(
+                follow_redirects=True,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                )
+            )
+            self._client = Mistral(
+                api_key=self.api_key,
+                server_url=self.server_url,
+                async_client=self._http,
+                timeout_ms=int(self.timeout * 1000)
+            )
+            logger.info(f"Mistral client created ({self.server_url or 'default endpoint'})")
+        return self._client
+
+    def acquire(self) -> Optional[Mistral]:
+        """Return the client if a call may be made now, or None to use the fallback parser"""
+        if not self.configured or not self.breaker.allow_request():
+            return None
+        return self.client
+
+    def record_success(self):
+        self.breaker.record_success()
+
+    def record_error(self, error: Exception):
+        """Count ``error`` against the breaker if it indicates an outage"""
+        if is_outage_error(error):
+            self.breaker.record_failure()
+        else:
+            # The API answered; the problem was the response itself
+            self.breaker.record_success()
+
+    async def probe(self) -> bool:
+        """Check the API with a cheap models listing and update the breaker"""
+        if not self.configured:
+            return False
+        try:
+            await asyncio.wait_for(self.client.models.list_async(), timeout=self.timeout)
+        except Exception as e:
+            logger.warning(f"Mistral health probe failed: {e}")
+            self.record_error(e)
+            return False
+        self.breaker.record_success()
+        return True
+
+    def start_health_probe(self, interval: Optional[float] = None):
+        """Probe the API every ``interval`` seconds in the background"""
+        interval = interval or settings.LLM_HEALTH_PROBE_INTERVAL_SECONDS
+        if not self.configured or interval <= 0 or self._probe_task is not None:
+            return
+        self._probe_task = asyncio.create_task(self._probe_loop(interval))
+
+    async def _probe_loop(self, interval: float):
+        while True:
+            await self.probe()
+            await asyncio.sleep(interval)
+
+    async def aclose(self):
+        """Stop the probe and release pooled connections"""
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            await asyncio.gather(self._probe_task, return_exceptions=True)
+            self._probe_task = None
+        if self._http is not None:
+            await self._http.aclose()
+        self._client = None
+        self._http = None
+
+    def stats(self) -> dict:
+        return {
+            "configured": self.configured,
+            "client_created": self._client is not None,
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures
+        }
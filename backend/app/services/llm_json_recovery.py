@@ -0,0 +1,300 @@
+import json
+import logging
+import re
+from typing import Any, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from app.models.candidate import ResumeExtraction
+
+logger = logging.getLogger(__name__)
+
+CODE_FENCE_RE = re.compile(r"```(?:json|JSON)?\s*(.*?)(?:```|$)", re.DOTALL)
+NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+
+# How many cut points to try, from the end, when closing a truncated response
+MAX_TRUNCATION_ATTEMPTS = 50
+
+RECOVERY_STEPS = ("clean", "code_fence", "trailing_text", "truncated", "coerced")
+
+
+class JsonRecoveryError(Exception):
+    """The LLM response could not be turned into a ResumeExtraction"""
+
+
+def strip_code_fences(text: str) -> Tuple[str, bool]:
+    """Return the body of the first Markdown code fence, if there is one"""
+    match = CODE_FENCE_RE.search(text)
+    if not match:
+        return text, False
+    return match.group(1), True
+
+
+def find_json_object(text: str) -> Tuple[str, bool]:
+    """
+    Locate the outermost JSON object in ``text``.
+
+    Returns the object text and whether it is complete. Text before the first
+    "{" and after its matching "}" is dropped; an object that never closes is
+    returned up to the end of the input.
+    """
+    start = text.find("{")
+    if start < 0:
+        raise JsonRecoveryError("No JSON object in response")
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1], True
+    return text[start:], False
+
+
+def close_truncated_json(fragment: str) -> Any:
+    """
+    Parse a JSON document that was cut off mid-stream.
+
+    Records every position where the document could be cut cleanly (before a
+    comma, after an opening or closing bracket) together with the brackets open
+    there, then tries the longest prefixes first with the missing brackets
+    appended.
+    """
+    stack: List[str] = []
+    cuts: List[Tuple[int, str]] = []
+    in_string = False
+    escaped = False
+    for i, ch in enumerate(fragment):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+            cuts.append((i + 1, "".join(reversed(stack))))
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+            cuts.append((i + 1, "".join(reversed(stack))))
+        elif ch == ",":
+            cuts.append((i, "".join(reversed(stack))))
+
+    # If the text stops right after a complete value, closing the brackets is enough;
+    # a value cut off mid-string is dropped rather than kept half-written
+    candidates = [] if in_string else [(len(fragment), "".join(reversed(stack)))]
+    candidates += reversed(cuts[-MAX_TRUNCATION_ATTEMPTS:])
+    for pos, closing in candidates:
+        try:
+            return json.loads(fragment[:pos].rstrip().rstrip(",") + closing)
+        except json.JSONDecodeError:
+            continue
+    raise JsonRecoveryError("Truncated JSON could not be closed")
+
+
+def _to_str(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value.strip() or None
+    if isinstance(value, list):
+        return ", ".join(s for s in (_to_str(v) for v in value) if s) or None
+    if isinstance(value, dict):
+        return _to_str(value.get("name") or value.get("value"))
+    return str(value)
+
+
+def _to_float(value: Any) -> Optional[float]:
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = NUMBER_RE.search(str(value))
+    return float(match.group(0)) if match else None
+
+
+def _to_list(value: Any) -> list:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    if isinstance(value, str):
+        return [v for v in (part.strip() for part in value.split(",")) if v]
+    return [value]
+
+
+def _to_str_list(value: Any) -> Optional[List[str]]:
+    items = [s for s in (_to_str(v) for v in _to_list(value)) if s]
+    return items or None
+
+
+def coerce_extraction(data: Any) -> dict:
+    """
+    Bend a parsed-but-invalid response into the ResumeExtraction shape.
+
+    Strings become lists where a list is expected, numbers embedded in text
+    ("5+ years", "3.8/4.0") become floats, bare skill names become Skill
+    objects, and entries missing every identifying field are dropped.
+    """
+    if isinstance(data, list) and len(data) == 1:
+        data = data[0]
+    if not isinstance(data, dict):
+        raise JsonRecoveryError(f"Expected a JSON object, got {type(data).__name__}")
+
+    skills = []
+    for item in _to_list(data.get("skills")):
+        if isinstance(item, dict):
+            name = _to_str(item.get("name"))
+            if name:
+                skills.append({
+                    "name": name,
+                    "proficiency": _to_str(item.get("proficiency")),
+                    "years_experience": _to_float(item.get("years_experience"))
+                })
+        elif _to_str(item):
+            skills.append({"name": _to_str(item)})
+
+    experience = []
+    for item in _to_list(data.get("experience")):
+        if not isinstance(item, dict):
+            continue
+        company, position = _to_str(item.get("company")), _to_str(item.get("position"))
+        if not company and not position:
+            continue
+        experience.append({
+            "company": company or "",
+            "position": position or "",
+            "start_date": _to_str(item.get("start_date")) or "",
+            "end_date": _to_str(item.get("end_date")),
+            "description": _to_str(item.get("description")),
+            "achievements": _to_str_list(item.get("achievements"))
+        })
+
+    education = []
+    for item in _to_list(data.get("education")):
+        if not isinstance(item, dict):
+            continue
+        institution, degree = _to_str(item.get("institution")), _to_str(item.get("degree"))
+        if not institution and not degree:
+            continue
+        education.append({
+            "institution": institution or "",
+            "degree": degree or "",
+            "field_of_study": _to_str(item.get("field_of_study")) or "",
+            "start_date": _to_str(item.get("start_date")),
+            "end_date": _to_str(item.get("end_date")),
+            "gpa": _to_float(item.get("gpa"))
+        })
+
+    return {
+        "full_name": _to_str(data.get("full_name")) or "Unknown",
+        "email": _to_str(data.get("email")),
+        "phone": _to_str(data.get("phone")),
+        "location": _to_str(data.get("location")),
+        "summary": _to_str(data.get("summary")),
+        "skills": skills,
+        "experience": experience,
+        "education": education,
+        "certifications": _to_str_list(data.get("certifications")),
+        "languages": _to_str_list(data.get("languages"))
+    }
+
+
+class JsonRecovery:
+    """
+    Salvages malformed LLM responses so they do not cost a second API call.
+
+    Steps are applied in order of cost: parse as-is, strip code fences, cut
+    away prose around the object, close a truncated object, coerce field
+    types. Each step that was needed is counted, so ``stats()`` shows how
+    often recovery saved a round-trip.
+    """
+
+    def __init__(self):
+        self.counts = {step: 0 for step in RECOVERY_STEPS}
+        self.salvaged = 0
+        self.failures = 0
+
+    def recover(self, content: Any) -> ResumeExtraction:
+        """Turn raw message content into a ResumeExtraction or raise JsonRecoveryError"""
+        try:
+            extraction, steps = self._recover(content)
+        except JsonRecoveryError:
+            self.failures += 1
+            raise
+        for step in steps or ["clean"]:
+            self.counts[step] += 1
+        if steps:
+            self.salvaged += 1
+            logger.debug(f"Recovered LLM response via {', '.join(steps)}")
+        return extraction
+
+    def _recover(self, content: Any) -> Tuple[ResumeExtraction, List[str]]:
+        if isinstance(content, ResumeExtraction):
+            return content, []
+        if isinstance(content, list):
+            # Content chunks; keep the text parts
+            content = "".join(getattr(chunk, "text", "") or "" for chunk in content)
+        if not isinstance(content, str) or not content.strip():
+            raise JsonRecoveryError("Empty response")
+
+        steps: List[str] = []
+        text = content.strip()
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            text, fenced = strip_code_fences(text)
+            if fenced:
+                steps.append("code_fence")
+            data = None
+            try:
+                data = json.loads(text)
+            except json.JSONDecodeError:
+                obj, complete = find_json_object(text)
+                if complete:
+                    if obj.strip() != text.strip():
+                        steps.append("trailing_text")
+                    try:
+                        data = json.loads(obj)
+                    except json.JSONDecodeError as e:
+                        raise JsonRecoveryError(f"Invalid JSON: {e}")
+                else:
+                    if obj.strip() != text.strip():
+                        steps.append("trailing_text")
+                    steps.append("truncated")
+                    data = close_truncated_json(obj)
+
+        try:
+            return ResumeExtraction.model_validate(data), steps
+        except ValidationError:
+            steps.append("coerced")
+            try:
+                return ResumeExtraction.model_validate(coerce_extraction(data)), steps
+            except ValidationError as e:
+                raise JsonRecoveryError(f"Response does not fit ResumeExtraction: {e}")
+
+    def stats(self) -> dict:
+        """Per-step counters for this process"""
+        return {
+            **self.counts,
+            "failed": self.failures,
+            "round_trips_saved": self.salvaged
+        }
@@ -0,0 +1,255 @@
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from beanie import PydanticObjectId
+from beanie.operators import In
+from pydantic import BaseModel, Field
+from pymongo import ReplaceOne
+from scipy import sparse
+
+from app.config import settings
+from app.models.candidate import Candidate, Skill
+from app.models.job import Job
+from app.models.job_matches import JobMatches, MatchEntry
+from app.services.matching import CandidateMatrix, MatchingService, matched_skills
+
+logger = logging.getLogger(__name__)
+
+# Jobs per block; candidate rows per block follow from MATCH_PRECOMPUTE_BLOCK_CELLS
+JOB_BLOCK = 256
+# Candidate IDs per $in lookup when loading names for the stored matches
+LOOKUP_BATCH = 5000
+
+
+class JobQuery(BaseModel):
+    """Projection of the job fields that are scored"""
+    id: PydanticObjectId = Field(alias="_id")
+    title: str = ""
+    description: str = ""
+    requirements: Optional[str] = None
+
+
+class CandidateSummary(BaseModel):
+    """Projection of the candidate fields stored with a match"""
+    id: PydanticObjectId = Field(alias="_id")
+    full_name: str = ""
+    email: Optional[str] = None
+    skills: List[Skill] = []
+
+
+def _merge_top_k(best_scores: np.ndarray, best_rows: np.ndarray, jobs: np.ndarray, rows: np.ndarray, scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Merge (job, row, score) triples into the per-job top-k arrays, keeping them sorted"""
+    n_jobs, k = best_scores.shape
+    all_jobs = np.concatenate([np.repeat(np.arange(n_jobs), k), jobs])
+    all_scores = np.concatenate([best_scores.ravel(), scores])
+    all_rows = np.concatenate([best_rows.ravel(), rows])
+    order = np.lexsort((-all_scores, all_jobs))
+    all_jobs = all_jobs[order]
+    rank = np.arange(len(order)) - np.searchsorted(all_jobs, all_jobs)
+    keep = order[rank < k]
+    return all_scores[keep].reshape(n_jobs, k), all_rows[keep].reshape(n_jobs, k)
+
+
+def _job_block_top_k(row_blocks: Sequence[Tuple[int, sparse.csr_matrix]], queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Top ``k`` candidate rows for each job column of ``queries`` (one job block).
+
+    Scores one candidate block at a time as a dense (rows x jobs) array, so
+    memory stays at one block no matter how many candidates there are. The
+    first block seeds each job's top-k with a partial sort; after that only
+    scores above a job's current k-th best are merged in, which is a small
+    fraction of each later block.
+    """
+    jobs = queries.shape[1]
+    best_scores = best_rows = None
+    for offset, block in row_blocks:
+        scores = block @ queries
+        if best_scores is None:
+            kk = min(k, scores.shape[0])
+            part = np.argpartition(-scores, kk - 1, axis=0)[:kk]
+            best_scores = np.full((jobs, k), -np.inf, dtype=np.float32)
+            best_rows = np.full((jobs, k), -1, dtype=np.int64)
+            best_scores[:, :kk] = np.take_along_axis(scores, part, axis=0).T
+            best_rows[:, :kk] = part.T + offset
+            order = np.argsort(-best_scores, axis=1, kind="stable")
+            best_scores = np.take_along_axis(best_scores, order, axis=1)
+            best_rows = np.take_along_axis(best_rows, order, axis=1)
+            continue
+        rows, cols = np.nonzero(scores > best_scores[:, -1])
+        if len(rows):
+            best_scores, best_rows = _merge_top_k(best_scores, best_rows, cols, rows + offset, scores[rows, cols])
+    return best_rows, best_scores
+
+
+def blocked_top_k(
+    matrix: CandidateMatrix,
+    queries: sparse.csr_matrix,
+    k: int,
+    block_cells: Optional[int] = None,
+    workers: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Top ``k`` candidate rows and scores for every query row, best first.
+
+    Only feature columns that some job uses can contribute to a score, so
+    the candidate matrix is first cut down to those columns and the jobs
+    become a small dense matrix. The job x candidate score matrix is never
+    materialized: jobs are split into blocks of JOB_BLOCK, candidates into
+    blocks sized so one dense score block holds at most ``block_cells``
+    floats, and job blocks run in parallel on a thread pool (numpy and the
+    sparse-dense products release the GIL). Entries without a positive
+    score have row -1.
+    """
+    jobs, candidates = queries.shape[0], matrix.size
+    k = min(k, candidates)
+    if jobs == 0 or k == 0:
+        return np.empty((jobs, 0), dtype=np.int64), np.empty((jobs, 0), dtype=np.float32)
+
+    columns = np.unique(queries.indices)
+    restricted = matrix.matrix[:, columns].tocsr()
+    block_cells = block_cells or settings.MATCH_PRECOMPUTE_BLOCK_CELLS
+    job_block = min(jobs, JOB_BLOCK)
+    candidate_block = max(k, block_cells // job_block)
+    row_blocks = [
+        (start, restricted[start:start + candidate_block])
+        for start in range(0, candidates, candidate_block)
+    ]
+    job_starts = list(range(0, jobs, job_block))
+    workers = workers or settings.MATCH_PRECOMPUTE_WORKERS or os.cpu_count() or 1
+
+    def run_block(start: int):
+        dense = queries[start:start + job_block][:, columns].toarray().T
+        return _job_block_top_k(row_blocks, dense, k)
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(job_starts))) as pool:
+        parts = list(pool.map(run_block, job_starts))
+
+    rows = np.concatenate([p[0] for p in parts])
+    scores = np.concatenate([p[1] for p in parts])
+    rows[scores <= 0] = -1
+    return rows, scores
+
+
+class MatchPrecomputer:
+    """
+    Scores every published job against every candidate in the background and
+    stores the top ``top_k`` per job in the job_matches collection, together
+    with the scoring version and timestamp. Match pages then read one
+    document instead of scoring on demand.
+    """
+
+    def __init__(
+        self,
+        matching: MatchingService,
+        top_k: Optional[int] = None,
+        block_cells: Optional[int] = None,
+        workers: Optional[int] = None
+    ):
+        self.matching = matching
+        self.top_k = top_k or settings.MATCH_PRECOMPUTE_TOP_K
+        self.block_cells = block_cells
+        self.workers = workers
+        self.last_run: Optional[dict] = None
+        self._task: Optional[asyncio.Task] = None
+        # Held by full runs and incremental updates alike
+        self.lock = asyncio.Lock()
+
+    async def run(self) -> dict:
+        """Recompute and store matches for all published jobs"""
+        async with self.lock:
+            start = time.perf_counter()
+            matrix = await self.matching.get_matrix()
+            jobs = await Job.find(Job.status == "published", Job.is_active == True).project(JobQuery).to_list()
+
+            loop = asyncio.get_running_loop()
+            queries = matrix.query_matrix([(j.title, j.requirements, j.description) for j in jobs])
+            rows, scores = await loop.run_in_executor(
+                None, blocked_top_k, matrix, queries, self.top_k, self.block_cells, self.workers
+            )
+            scored = time.perf_counter() - start
+
+            written = await self.store(jobs, matrix, rows, scores)
+            # Matches of jobs that were unpublished or deleted are no longer served
+            removed = await JobMatches.find(
+                {"job_id": {"$nin": [str(j.id) for j in jobs]}}
+            ).delete()
+
+            self.last_run = {
+                "jobs": len(jobs),
+                "candidates": matrix.count,
+                "written": written,
+                "removed": getattr(removed, "deleted_count", 0),
+                "scoring_seconds": round(scored, 3),
+                "total_seconds": round(time.perf_counter() - start, 3),
+                "finished_at": datetime.utcnow().isoformat()
+            }
+            logger.info(f"Precomputed matches: {self.last_run}")
+            return self.last_run
+
+    async def store(self, jobs: List[JobQuery], matrix: CandidateMatrix, rows: np.ndarray, scores: np.ndarray) -> int:
+        """Replace the stored lists of ``jobs`` with their ``blocked_top_k`` results"""
+        if not jobs:
+            return 0
+        wanted = sorted({matrix.ids[r] for r in rows[rows >= 0].tolist()})
+        summaries: Dict[str, CandidateSummary] = {}
+        for i in range(0, len(wanted), LOOKUP_BATCH):
+            ids = [PydanticObjectId(cid) for cid in wanted[i:i + LOOKUP_BATCH]]
+            async for c in Candidate.find(In(Candidate.id, ids)).project(CandidateSummary):
+                summaries[str(c.id)] = c
+
+        now = datetime.utcnow()
+        version = self.matching.scoring_version
+        operations = []
+        for job, job_rows, job_scores in zip(jobs, rows.tolist(), scores.tolist()):
+            entries = []
+            for row, score in zip(job_rows, job_scores):
+                candidate = summaries.get(matrix.ids[row]) if row >= 0 else None
+                if candidate is None:
+                    continue
+                entries.append(MatchEntry(
+                    candidate_id=str(candidate.id),
+                    full_name=candidate.full_name,
+                    email=candidate.email,
+                    score=round(score, 4),
+                    matched_skills=matched_skills(candidate.skills, job.title, job.requirements, job.description)
+                ))
+            operations.append(ReplaceOne(
+                {"job_id": str(job.id)},
+                {
+                    "job_id": str(job.id),
+                    "matches": [entry.model_dump() for entry in entries],
+                    "scoring_version": version,
+                    "candidates_scored": matrix.count,
+                    "computed_at": now
+                },
+                upsert=True
+            ))
+        await JobMatches.get_pymongo_collection().bulk_write(operations, ordered=False)
+        return len(operations)
+
+    def start(self, interval: Optional[float] = None):
+        """Recompute every ``interval`` seconds in the background"""
+        interval = settings.MATCH_PRECOMPUTE_INTERVAL_SECONDS if interval is None else interval
+        if interval <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._loop(interval))
+
+    async def _loop(self, interval: float):
+        while True:
+            try:
+                await self.run()
+            except Exception as e:
+                logger.error(f"Match precomputation failed: {e}")
+            await asyncio.sleep(interval)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
@@ -0,0 +1,212 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from beanie import PydanticObjectId
+from beanie.operators import In
+from pymongo import UpdateOne
+from scipy import sparse
+
+from app.config import settings
+from app.models.candidate import Candidate
+from app.models.job import Job
+from app.models.job_matches import JobMatches, MatchEntry
+from app.services.matching import CandidateMatrix, matched_skills
+from app.services.match_precompute import JobQuery, MatchPrecomputer, blocked_top_k
+
+logger = logging.getLogger(__name__)
+
+
+class MatchUpdater:
+    """
+    Keeps the stored job matches fresh between full precompute runs.
+
+    Change handlers only record what changed; a flush a few seconds later
+    does work proportional to the change:
+
+    - an edited or newly published job rescores its one row against all
+      candidates and replaces its stored list,
+    - new candidates are appended to the candidate matrix, scored against
+      the published jobs (one small sparse product) and merged into each
+      stored top-k list with a single ``$push``/``$sort``/``$slice``,
+    - deleted candidates are zeroed in the matrix and pulled from every
+      stored list; lists refill to full length on the next full run,
+    - deleted or unpublished jobs lose their stored list.
+
+    Flushes hold the precomputer's lock, so they never interleave with a
+    full recompute.
+    """
+
+    def __init__(self, precomputer: MatchPrecomputer, debounce: Optional[float] = None):
+        self.precomputer = precomputer
+        self.matching = precomputer.matching
+        self.debounce = settings.MATCH_REFRESH_DEBOUNCE_SECONDS if debounce is None else debounce
+        self.last_flush: Optional[dict] = None
+        self._changed_jobs: Set[str] = set()
+        self._removed_jobs: Set[str] = set()
+        self._added_candidates: Dict[str, Candidate] = {}
+        self._removed_candidates: Set[str] = set()
+        # Published jobs and their query rows, reused across candidate flushes
+        self._jobs: Optional[Tuple[CandidateMatrix, List[JobQuery], sparse.csr_matrix]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def job_changed(self, job_id: str):
+        """A job was created, edited or changed status"""
+        self._removed_jobs.discard(job_id)
+        self._changed_jobs.add(job_id)
+        self._jobs = None
+        self._schedule()
+
+    def job_removed(self, job_id: str):
+        self._changed_jobs.discard(job_id)
+        self._removed_jobs.add(job_id)
+        self._jobs = None
+        self._schedule()
+
+    async def candidates_added(self, candidates: List[Candidate]):
+        """Ingestion callback; candidates must already be inserted"""
+        for candidate in candidates:
+            self._added_candidates[str(candidate.id)] = candidate
+        self._schedule()
+
+    def candidate_removed(self, candidate_id: str):
+        self._added_candidates.pop(candidate_id, None)
+        self._removed_candidates.add(candidate_id)
+        self._schedule()
+
+    def _pending(self) -> bool:
+        return bool(self._changed_jobs or self._removed_jobs or self._added_candidates or self._removed_candidates)
+
+    def _schedule(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        try:
+            # Changes arriving during a flush are picked up by the next round
+            while self._pending():
+                await asyncio.sleep(self.debounce)
+                try:
+                    await self.flush()
+                except Exception as e:
+                    logger.error(f"Incremental match update failed: {e}")
+        finally:
+            self._task = None
+
+    async def flush(self) -> dict:
+        """Apply every recorded change now"""
+        changed_jobs, self._changed_jobs = self._changed_jobs, set()
+        removed_jobs, self._removed_jobs = self._removed_jobs, set()
+        added, self._added_candidates = self._added_candidates, {}
+        removed, self._removed_candidates = self._removed_candidates, set()
+
+        async with self.precomputer.lock:
+            start = time.perf_counter()
+            matrix = self.matching.cached
+            if matrix is None:
+                # Nothing to patch; a fresh build already contains every change
+                matrix = await self.matching.get_matrix()
+            else:
+                matrix.remove(removed)
+                matrix.append([(cid, c.skills, c.experience) for cid, c in added.items()])
+
+            collection = JobMatches.get_pymongo_collection()
+            if removed:
+                await collection.update_many(
+                    {"matches.candidate_id": {"$in": list(removed)}},
+                    {"$pull": {"matches": {"candidate_id": {"$in": list(removed)}}}}
+                )
+
+            rescored = await self._rescore_jobs(matrix, changed_jobs, removed_jobs)
+            merged = await self._merge_candidates(matrix, list(added.values()), changed_jobs) if added else 0
+
+            self.last_flush = {
+                "jobs_rescored": rescored,
+                "jobs_removed": len(removed_jobs),
+                "candidates_added": len(added),
+                "candidates_removed": len(removed),
+                "lists_updated": merged,
+                "seconds": round(time.perf_counter() - start, 3)
+            }
+            logger.info(f"Incremental match update: {self.last_flush}")
+            return self.last_flush
+
+    async def _rescore_jobs(self, matrix: CandidateMatrix, changed: Set[str], removed: Set[str]) -> int:
+        """Replace the stored lists of changed published jobs; drop the rest"""
+        jobs: List[JobQuery] = []
+        if changed:
+            jobs = await Job.find(
+                In(Job.id, [PydanticObjectId(job_id) for job_id in changed]),
+                Job.status == "published",
+                Job.is_active == True
+            ).project(JobQuery).to_list()
+        gone = removed | (changed - {str(job.id) for job in jobs})
+        if gone:
+            await JobMatches.find(In(JobMatches.job_id, list(gone))).delete()
+        if not jobs:
+            return 0
+
+        loop = asyncio.get_running_loop()
+        queries = matrix.query_matrix([(j.title, j.requirements, j.description) for j in jobs])
+        rows, scores = await loop.run_in_executor(
+            None, blocked_top_k, matrix, queries, self.precomputer.top_k, self.precomputer.block_cells, 1
+        )
+        return await self.precomputer.store(jobs, matrix, rows, scores)
+
+    async def _published_jobs(self, matrix: CandidateMatrix) -> Tuple[List[JobQuery], sparse.csr_matrix]:
+        # Query rows depend on the matrix IDF, so a rebuilt matrix invalidates them too
+        if self._jobs is None or self._jobs[0] is not matrix:
+            jobs = await Job.find(Job.status == "published", Job.is_active == True).project(JobQuery).to_list()
+            queries = matrix.query_matrix([(j.title, j.requirements, j.description) for j in jobs])
+            self._jobs = (matrix, jobs, queries)
+        return self._jobs[1], self._jobs[2]
+
+    async def _merge_candidates(self, matrix: CandidateMatrix, candidates: List[Candidate], skip_jobs: Set[str]) -> int:
+        """Score new candidates against every published job and merge them into the stored lists"""
+        jobs, queries = await self._published_jobs(matrix)
+        if not jobs:
+            return 0
+        vectors = matrix.candidate_rows([(c.skills, c.experience) for c in candidates])
+        scores = (queries @ vectors.T).toarray()
+
+        version = self.matching.scoring_version
+        now = datetime.utcnow()
+        new_ids = [str(c.id) for c in candidates]
+        operations = []
+        for j in np.flatnonzero((scores > 0).any(axis=1)).tolist():
+            job = jobs[j]
+            if str(job.id) in skip_jobs:
+                # Rescored in full against a matrix that already holds these candidates
+                continue
+            entries = [
+                MatchEntry(
+                    candidate_id=str(candidate.id),
+                    full_name=candidate.full_name,
+                    email=candidate.email,
+                    score=round(float(score), 4),
+                    matched_skills=matched_skills(candidate.skills, job.title, job.requirements, job.description)
+                ).model_dump()
+                for candidate, score in zip(candidates, scores[j].tolist())
+                if score > 0
+            ]
+            operations.append(UpdateOne(
+                # Lists that already hold one of them were refreshed by a full run since
+                {"job_id": str(job.id), "scoring_version": version, "matches.candidate_id": {"$nin": new_ids}},
+                {
+                    "$push": {"matches": {"$each": entries, "$sort": {"score": -1}, "$slice": self.precomputer.top_k}},
+                    "$set": {"candidates_scored": matrix.count, "computed_at": now}
+                }
+            ))
+        if not operations:
+            return 0
+        result = await JobMatches.get_pymongo_collection().bulk_write(operations, ordered=False)
+        return result.modified_count
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
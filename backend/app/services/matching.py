@@ -0,0 +1,306 @@
+import asyncio
+import logging
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from beanie import PydanticObjectId
+from pydantic import BaseModel, Field
+from scipy import sparse
+
+from app.config import settings
+from app.models.candidate import Candidate, Skill, Experience
+from app.services.skill_vocabulary import TOKEN_RE, canonical_key
+
+logger = logging.getLogger(__name__)
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or our the to we will with you your "
+    "experience years year work working team strong ability skills knowledge".split()
+)
+# Longest skill phrase a job text is scanned for ("google cloud platform")
+MAX_PHRASE_WORDS = 3
+
+# Bump whenever features or weights change; stored scores from another version are ignored
+SCORING_VERSION = "2"
+
+# Feature weights; skills carry the match, experience adds context
+SKILL_PHRASE_WEIGHT = 2.0
+SKILL_TOKEN_WEIGHT = 1.0
+POSITION_WEIGHT = 0.5
+DESCRIPTION_WEIGHT = 0.2
+TITLE_WEIGHT = 2.0
+REQUIREMENTS_WEIGHT = 1.5
+JOB_DESCRIPTION_WEIGHT = 1.0
+
+
+class CandidateFeatures(BaseModel):
+    """Projection of the candidate fields the featurizer reads"""
+    id: PydanticObjectId = Field(alias="_id")
+    skills: List[Skill] = []
+    experience: List[Experience] = []
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase word tokens; keeps "c++", "c#" and "node.js" whole"""
+    if not text:
+        return []
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+def skill_key(name: str) -> str:
+    """Canonical skill phrase shared by candidate skills and job text n-grams ("python3" -> "python")"""
+    return canonical_key(" ".join(tokenize(name)))
+
+
+class FeatureHasher:
+    """
+    Maps string features into a fixed number of columns.
+
+    crc32 is stable across processes, unlike ``hash()``, so vectors built by
+    different workers or from a saved index line up.
+    """
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self._cache: Dict[str, int] = {}
+
+    def column(self, feature: str) -> int:
+        column = self._cache.get(feature)
+        if column is None:
+            column = zlib.crc32(feature.encode("utf-8")) % self.dim
+            if len(self._cache) < 1_000_000:
+                self._cache[feature] = column
+        return column
+
+    def add(self, features: Dict[int, float], names: Iterable[str], weight: float):
+        for name in names:
+            column = self.column(name)
+            features[column] = features.get(column, 0.0) + weight
+
+
+def candidate_features(hasher: FeatureHasher, skills: Sequence[Skill], experience: Sequence[Experience]) -> Dict[int, float]:
+    """Raw (unweighted by IDF) hashed features of one candidate"""
+    features: Dict[int, float] = {}
+    for skill in skills:
+        key = skill_key(skill.name)
+        if not key:
+            continue
+        # Stated years nudge the weight up, capped so one skill cannot dominate
+        boost = 1.0 + min(skill.years_experience or 0.0, 10.0) / 10.0
+        hasher.add(features, ("s:" + key,), SKILL_PHRASE_WEIGHT * boost)
+        hasher.add(features, ("t:" + t for t in tokenize(skill.name)), SKILL_TOKEN_WEIGHT)
+    for job in experience:
+        hasher.add(features, ("t:" + t for t in tokenize(job.position)), POSITION_WEIGHT)
+        hasher.add(features, ("t:" + t for t in tokenize(job.description)), DESCRIPTION_WEIGHT)
+    return features
+
+
+def _phrases(tokens: List[str]) -> Iterable[str]:
+    for n in range(1, MAX_PHRASE_WORDS + 1):
+        for i in range(len(tokens) - n + 1):
+            yield "s:" + canonical_key(" ".join(tokens[i:i + n]))
+
+
+def job_features(hasher: FeatureHasher, title: str, requirements: Optional[str], description: Optional[str]) -> Dict[int, float]:
+    """Query features of a job: word tokens plus every 1-3 word phrase, to hit skill names"""
+    features: Dict[int, float] = {}
+    for text, weight in ((title, TITLE_WEIGHT), (requirements, REQUIREMENTS_WEIGHT), (description, JOB_DESCRIPTION_WEIGHT)):
+        # Stopwords are already gone, so "experience with docker" still yields the phrase "docker"
+        tokens = tokenize(text)
+        hasher.add(features, ("t:" + t for t in tokens), weight)
+        hasher.add(features, _phrases(tokens), weight)
+    return features
+
+
+def matched_skills(skills: Sequence[Skill], title: str, requirements: Optional[str], description: Optional[str]) -> List[str]:
+    """Candidate skills that appear as a phrase in the job text"""
+    phrases = set()
+    for text in (title, requirements, description):
+        phrases.update(_phrases(tokenize(text)))
+    return [skill.name for skill in skills if "s:" + skill_key(skill.name) in phrases]
+
+
+def _feature_rows(feature_dicts: Iterable[Dict[int, float]], dim: int) -> sparse.csr_matrix:
+    """Stack hashed feature dicts into CSR rows"""
+    indptr = [0]
+    indices: List[int] = []
+    data: List[float] = []
+    for features in feature_dicts:
+        indices.extend(features.keys())
+        data.extend(features.values())
+        indptr.append(len(indices))
+    return sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(indptr) - 1, dim)
+    )
+
+
+def _weight_rows(rows: sparse.csr_matrix, idf: np.ndarray) -> sparse.csr_matrix:
+    """Apply IDF weights and L2-normalize every row, in place"""
+    rows.data *= idf[rows.indices]
+    norms = np.sqrt(np.asarray(rows.multiply(rows).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    rows.data /= np.repeat(norms, np.diff(rows.indptr)).astype(np.float32)
+    return rows
+
+
+class CandidateMatrix:
+    """
+    All candidates as rows of one L2-normalized, IDF-weighted sparse matrix.
+
+    Scoring a job is a single CSR matrix-vector product over every row,
+    followed by a partial sort for the top k. Candidates can be appended and
+    removed in place; they are weighted with the IDF of the last full build
+    until the next one.
+    """
+
+    def __init__(self, ids: List[str], matrix: sparse.csr_matrix, idf: np.ndarray, hasher: FeatureHasher):
+        self.ids = ids
+        self.matrix = matrix
+        self.idf = idf
+        self.hasher = hasher
+        self.built_at = time.monotonic()
+        self._rows: Dict[str, int] = {candidate_id: row for row, candidate_id in enumerate(ids)}
+
+    @property
+    def size(self) -> int:
+        """Number of rows, including removed candidates"""
+        return len(self.ids)
+
+    @property
+    def count(self) -> int:
+        """Number of live candidates"""
+        return len(self._rows)
+
+    def __contains__(self, candidate_id: str) -> bool:
+        return candidate_id in self._rows
+
+    @classmethod
+    def build(cls, rows: Iterable[Tuple[str, Sequence[Skill], Sequence[Experience]]], dim: int) -> "CandidateMatrix":
+        hasher = FeatureHasher(dim)
+        ids: List[str] = []
+
+        def features():
+            for candidate_id, skills, experience in rows:
+                ids.append(candidate_id)
+                yield candidate_features(hasher, skills, experience)
+
+        matrix = _feature_rows(features(), dim)
+        # Rare features (a niche skill) count for more than ones every candidate has
+        df = np.bincount(matrix.indices, minlength=dim)
+        idf = (np.log((1.0 + len(ids)) / (1.0 + df)) + 1.0).astype(np.float32)
+        return cls(ids, _weight_rows(matrix, idf), idf, hasher)
+
+    def candidate_rows(self, rows: Sequence[Tuple[Sequence[Skill], Sequence[Experience]]]) -> sparse.csr_matrix:
+        """Weighted vectors of candidates that are not (yet) in the matrix"""
+        dim = self.matrix.shape[1]
+        return _weight_rows(_feature_rows((candidate_features(self.hasher, s, e) for s, e in rows), dim), self.idf)
+
+    def append(self, rows: Sequence[Tuple[str, Sequence[Skill], Sequence[Experience]]]) -> int:
+        """Add candidates that are not in the matrix yet; returns how many were added"""
+        rows = [row for row in rows if row[0] not in self._rows]
+        if not rows:
+            return 0
+        added = self.candidate_rows([(skills, experience) for _, skills, experience in rows])
+        # Readers holding the old matrix keep a consistent view; ids only grows
+        self.matrix = sparse.vstack([self.matrix, added], format="csr", dtype=np.float32)
+        for candidate_id, _, _ in rows:
+            self._rows[candidate_id] = len(self.ids)
+            self.ids.append(candidate_id)
+        return len(rows)
+
+    def remove(self, candidate_ids: Iterable[str]) -> int:
+        """Zero the rows of removed candidates so they never score; returns how many were present"""
+        removed = 0
+        for candidate_id in candidate_ids:
+            row = self._rows.pop(candidate_id, None)
+            if row is None:
+                continue
+            self.matrix.data[self.matrix.indptr[row]:self.matrix.indptr[row + 1]] = 0.0
+            removed += 1
+        return removed
+
+    def query_vector(self, title: str, requirements: Optional[str], description: Optional[str]) -> np.ndarray:
+        features = job_features(self.hasher, title, requirements, description)
+        query = np.zeros(self.matrix.shape[1], dtype=np.float32)
+        if features:
+            columns = np.fromiter(features.keys(), dtype=np.int64, count=len(features))
+            query[columns] = np.fromiter(features.values(), dtype=np.float32, count=len(features)) * self.idf[columns]
+            norm = np.linalg.norm(query[columns])
+            if norm:
+                query[columns] /= norm
+        return query
+
+    def query_matrix(self, jobs: Sequence[Tuple[str, Optional[str], Optional[str]]]) -> sparse.csr_matrix:
+        """Query vectors of many (title, requirements, description) jobs as sparse rows"""
+        dim = self.matrix.shape[1]
+        return _weight_rows(_feature_rows((job_features(self.hasher, *job) for job in jobs), dim), self.idf)
+
+    def top_k_rows(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Row numbers and scores of the best ``k`` rows with a positive score, best first"""
+        if not self.ids or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        scores = self.matrix @ query
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        top = top[scores[top] > 0]
+        return top, scores[top]
+
+    def top_k(self, query: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        """Best ``k`` candidates with a positive cosine score, best first"""
+        rows, scores = self.top_k_rows(query, k)
+        return [(self.ids[row], float(score)) for row, score in zip(rows.tolist(), scores.tolist())]
+
+
+class MatchingService:
+    """
+    Keeps a CandidateMatrix of the whole collection and scores jobs against it.
+
+    The matrix is rebuilt when it is older than MATCHING_INDEX_TTL_SECONDS,
+    when the candidate count no longer matches, or after ``invalidate()``.
+    In between, ``cached`` lets change handlers patch it in place.
+    """
+
+    def __init__(self, dim: Optional[int] = None, ttl: Optional[float] = None):
+        self.dim = dim or settings.MATCHING_FEATURE_DIM
+        self.ttl = settings.MATCHING_INDEX_TTL_SECONDS if ttl is None else ttl
+        self._matrix: Optional[CandidateMatrix] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def scoring_version(self) -> str:
+        return f"sparse-v{SCORING_VERSION}-{self.dim}"
+
+    @property
+    def cached(self) -> Optional[CandidateMatrix]:
+        """The current matrix without triggering a rebuild"""
+        return self._matrix
+
+    def invalidate(self):
+        self._matrix = None
+
+    async def get_matrix(self) -> CandidateMatrix:
+        async with self._lock:
+            matrix = self._matrix
+            if matrix is not None and time.monotonic() - matrix.built_at < self.ttl:
+                if await Candidate.count() == matrix.count:
+                    return matrix
+            start = time.perf_counter()
+            rows = [
+                (str(c.id), c.skills, c.experience)
+                async for c in Candidate.find().project(CandidateFeatures)
+            ]
+            loop = asyncio.get_running_loop()
+            matrix = await loop.run_in_executor(None, CandidateMatrix.build, rows, self.dim)
+            self._matrix = matrix
+            logger.info(f"Built candidate matrix: {matrix.count} candidates, {matrix.matrix.nnz} features in {time.perf_counter() - start:.2f}s")
+            return matrix
+
+    async def match(self, title: str, requirements: Optional[str], description: Optional[str], k: int) -> Tuple[List[Tuple[str, float]], int]:
+        """Top ``k`` (candidate id, score) pairs and the number of candidates scored"""
+        matrix = await self.get_matrix()
+        query = matrix.query_vector(title, requirements, description)
+        return matrix.top_k(query, k), matrix.count
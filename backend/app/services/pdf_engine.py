@@ -0,0 +1,186 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import PyPDF2
+
+from app.config import settings
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; memory limits are skipped there
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+class PdfExtractionError(Exception):
+    """A PDF could not be parsed within its time or memory budget"""
+
+
+def _current_address_space() -> Optional[int]:
+    """Virtual memory size of this process in bytes, if the platform reports it"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _init_worker(memory_limit_mb: int):
+    """Cap the worker's address space so a pathological PDF raises MemoryError"""
+    if not memory_limit_mb or resource is None:
+        return
+    baseline = _current_address_space()
+    if baseline is None:
+        return
+    limit = baseline + memory_limit_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _raise_timeout(signum, frame):
+    raise TimeoutError()
+
+
+def extract_page_range(file_path: str, start: int, stop: int, time_limit: float) -> Tuple[List[str], int]:
+    """
+    Extract the text of pages [start, stop) from a PDF.
+
+    Runs inside a pool worker. Returns the page texts and the document's total
+    page count. A SIGALRM interrupts parsing once ``time_limit`` seconds pass.
+    """
+    use_alarm = hasattr(signal, "setitimer") and time_limit > 0
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, time_limit)
+    try:
+        pdf_reader = PyPDF2.PdfReader(file_path)
+        num_pages = len(pdf_reader.pages)
+        page_texts = [
+            pdf_reader.pages[page_num].extract_text() or ""
+            for page_num in range(start, min(stop, num_pages))
+        ]
+        return page_texts, num_pages
+    except TimeoutError:
+        raise PdfExtractionError(f"PDF parsing exceeded its {time_limit:.3g}s budget")
+    except MemoryError:
+        raise PdfExtractionError("PDF parsing exceeded the worker memory limit")
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+class PdfExtractionEngine:
+    """
+    Page-parallel PDF text extraction on a pool of worker processes.
+
+    The first ``pages_per_task`` pages are parsed together with the page count;
+    any remaining pages are split into chunks parsed in parallel. Each document
+    gets ``timeout`` seconds of parsing and each worker at most
+    ``memory_limit_mb`` of extra address space. No more tasks are submitted
+    than there are workers, so a task's clock starts when a worker takes it
+    and time spent waiting behind other documents is never charged. A worker
+    that fails to stop in time is killed and the pool is rebuilt, so one bad
+    file cannot wedge it.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        pages_per_task: Optional[int] = None,
+        timeout: Optional[float] = None,
+        memory_limit_mb: Optional[int] = None
+    ):
+        self.workers = workers if workers is not None else (settings.PDF_WORKERS or None)
+        self.pages_per_task = pages_per_task or settings.PDF_PAGES_PER_TASK
+        self.timeout = timeout or settings.PDF_TIMEOUT_SECONDS
+        self.memory_limit_mb = memory_limit_mb if memory_limit_mb is not None else settings.PDF_MEMORY_LIMIT_MB
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        """Worker pool, created on first use"""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.memory_limit_mb,)
+            )
+        return self._pool
+
+    @property
+    def slots(self) -> asyncio.Semaphore:
+        """One slot per worker process; a task is only submitted once it holds one"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.pool._max_workers)
+        return self._slots
+
+    async def warm_up(self):
+        """Start the worker processes ahead of the first document"""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(self.pool, abs, 0)
+            for _ in range(self.pool._max_workers)
+        ))
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def extract(self, file_path: str) -> Tuple[str, int]:
+        """Extract the text and page count of a PDF"""
+        first_pages, num_pages, elapsed = await self._run_chunk(file_path, 0, self.pages_per_task, self.timeout)
+        chunks = [first_pages]
+
+        if num_pages > self.pages_per_task:
+            # The remaining chunks run side by side, each on what the first one left of the budget
+            budget = self.timeout - elapsed
+            chunks += [
+                texts for texts, _, _ in await asyncio.gather(*(
+                    self._run_chunk(file_path, start, start + self.pages_per_task, budget)
+                    for start in range(self.pages_per_task, num_pages, self.pages_per_task)
+                ))
+            ]
+
+        extracted_text = "\n".join(text for chunk in chunks for text in chunk).strip()
+        logger.debug(f"Extracted {len(extracted_text)} characters from {num_pages} page(s)")
+        return extracted_text, num_pages
+
+    async def _run_chunk(self, file_path: str, start: int, stop: int, budget: float) -> Tuple[List[str], int, float]:
+        """Parse one page range within ``budget`` seconds of worker time; returns texts, page count and time used"""
+        if budget <= 0:
+            raise PdfExtractionError(f"PDF parsing exceeded {self.timeout:.3g}s")
+
+        loop = asyncio.get_running_loop()
+        async with self.slots:
+            pool = self.pool
+            started = loop.time()
+            future = loop.run_in_executor(pool, extract_page_range, file_path, start, stop, budget)
+            try:
+                # The worker's own alarm should fire first; the grace period covers a stuck worker
+                page_texts, num_pages = await asyncio.wait_for(future, budget + 1.0)
+            except asyncio.TimeoutError:
+                logger.error(f"PDF worker did not stop after {self.timeout:.1f}s, recycling pool: {file_path}")
+                self._recycle(pool)
+                raise PdfExtractionError(f"PDF parsing exceeded {self.timeout:.3g}s")
+            return page_texts, num_pages, loop.time() - started
+
+    def _recycle(self, pool: ProcessPoolExecutor):
+        """
+        Kill a wedged pool's workers and start fresh on next use. The pool
+        cannot survive losing one worker, but with submissions capped at
+        the worker count only running tasks are lost, never queued ones.
+        """
+        if self._pool is pool:
+            self._pool = None
+        for process in list((pool._processes or {}).values()):
+            process.kill()
+        pool.shutdown(wait=False, cancel_futures=True)
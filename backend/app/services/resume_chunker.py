@@ -0,0 +1,192 @@
+import logging
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.models.candidate import ResumeExtraction, Skill, Experience, Education
+
+logger = logging.getLogger(__name__)
+
+# Rough characters-per-token ratio for English text with Mistral's tokenizer
+CHARS_PER_TOKEN = 4
+
+# Lines that open a new resume section, e.g. "WORK EXPERIENCE", "Education:", "Technical Skills"
+SECTION_HEADER_RE = re.compile(
+    r"^\s*(?:[A-Za-z&/]+\s+){0,3}?"
+    r"(summary|profile|objective|about me|experience|employment|work history|education|"
+    r"academic background|academics|qualifications|skills|competencies|technologies|tools|"
+    r"projects|publications|certifications|certificates|awards|honors|"
+    r"languages|research|teaching|interests|references|volunteering|activities)"
+    r"\s*:?\s*$",
+    re.IGNORECASE
+)
+MAX_HEADER_LENGTH = 40
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate; good enough for sizing prompts"""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+@dataclass
+class Section:
+    """A run of resume lines under one header"""
+    name: str
+    text: str
+
+
+def split_sections(text: str) -> List[Section]:
+    """
+    Split resume text at section headers.
+
+    Lines before the first header (name, contact details) become a "contact" section.
+    """
+    sections: List[Section] = []
+    name = "contact"
+    lines: List[str] = []
+    for line in text.splitlines():
+        match = SECTION_HEADER_RE.match(line) if len(line) <= MAX_HEADER_LENGTH else None
+        if match:
+            if any(l.strip() for l in lines):
+                sections.append(Section(name, "\n".join(lines).strip()))
+            name = match.group(1).lower()
+            lines = [line]
+        else:
+            lines.append(line)
+    if any(l.strip() for l in lines):
+        sections.append(Section(name, "\n".join(lines).strip()))
+    return sections
+
+
+def _split_oversized(text: str, token_budget: int) -> List[str]:
+    """Split one section that is larger than the budget at line boundaries"""
+    max_chars = token_budget * CHARS_PER_TOKEN
+    pieces: List[str] = []
+    current: List[str] = []
+    size = 0
+    for line in text.splitlines():
+        # A single huge line (no newlines from the PDF) is cut hard
+        while len(line) > max_chars:
+            if current:
+                pieces.append("\n".join(current))
+                current, size = [], 0
+            pieces.append(line[:max_chars])
+            line = line[max_chars:]
+        if size + len(line) + 1 > max_chars and current:
+            pieces.append("\n".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        pieces.append("\n".join(current))
+    return pieces
+
+
+def chunk_resume(text: str, token_budget: int) -> List[str]:
+    """
+    Pack resume sections into chunks of at most ``token_budget`` tokens.
+
+    Sections are kept whole whenever they fit, so a job or degree is never
+    split from its heading. The first chunk always starts with the contact
+    section, which is where the merge takes the candidate's name and email from.
+    """
+    if estimate_tokens(text) <= token_budget:
+        return [text]
+
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for section in split_sections(text):
+        section_tokens = estimate_tokens(section.text)
+        parts = [section.text] if section_tokens <= token_budget else _split_oversized(section.text, token_budget)
+        for part in parts:
+            part_tokens = estimate_tokens(part)
+            if current and size + part_tokens > token_budget:
+                chunks.append("\n\n".join(current))
+                current, size = [], 0
+            current.append(part)
+            size += part_tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def _norm(value: Optional[str]) -> str:
+    return " ".join((value or "").split()).casefold()
+
+
+def _unique(values: Iterable[str]) -> List[str]:
+    seen = set()
+    result = []
+    for value in values:
+        key = _norm(value)
+        if key and key not in seen:
+            seen.add(key)
+            result.append(value)
+    return result
+
+
+def merge_extractions(parts: List[ResumeExtraction]) -> ResumeExtraction:
+    """
+    Merge per-chunk extractions into one, in chunk order.
+
+    Scalar fields take the first non-empty value. Skills, jobs and degrees are
+    deduplicated on normalized keys; a later duplicate only fills in fields the
+    first occurrence left empty, so the result does not depend on timing.
+    """
+    def first(field: str) -> Optional[str]:
+        for part in parts:
+            value = getattr(part, field)
+            if value and _norm(value) != "unknown":
+                return value
+        return None
+
+    skills: Dict[str, Skill] = {}
+    experience: Dict[Tuple[str, str, str], Experience] = {}
+    education: Dict[Tuple[str, str], Education] = {}
+    for part in parts:
+        for skill in part.skills:
+            key = _norm(skill.name)
+            if not key:
+                continue
+            if key not in skills:
+                skills[key] = skill.model_copy()
+            else:
+                kept = skills[key]
+                kept.proficiency = kept.proficiency or skill.proficiency
+                kept.years_experience = kept.years_experience or skill.years_experience
+        for job in part.experience:
+            key = (_norm(job.company), _norm(job.position), _norm(job.start_date))
+            if key not in experience:
+                experience[key] = job.model_copy()
+            else:
+                kept = experience[key]
+                kept.end_date = kept.end_date or job.end_date
+                kept.description = kept.description or job.description
+                if job.achievements:
+                    kept.achievements = _unique((kept.achievements or []) + job.achievements)
+        for degree in part.education:
+            key = (_norm(degree.institution), _norm(degree.degree))
+            if key not in education:
+                education[key] = degree.model_copy()
+            else:
+                kept = education[key]
+                kept.field_of_study = kept.field_of_study or degree.field_of_study
+                kept.start_date = kept.start_date or degree.start_date
+                kept.end_date = kept.end_date or degree.end_date
+                kept.gpa = kept.gpa or degree.gpa
+
+    certifications = _unique(c for part in parts for c in (part.certifications or []))
+    languages = _unique(l for part in parts for l in (part.languages or []))
+    return ResumeExtraction(
+        full_name=first("full_name") or "Unknown",
+        email=first("email"),
+        phone=first("phone"),
+        location=first("location"),
+        summary=first("summary"),
+        skills=list(skills.values()),
+        experience=list(experience.values()),
+        education=list(education.values()),
+        certifications=certifications or None,
+        languages=languages or None
+    )
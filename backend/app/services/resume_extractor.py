@@ -1,13 +1,20 @@
 import os
+import asyncio
 import PyPDF2
 import tempfile
-import json
 import logging
 from typing import List, Tuple, Optional
 from fastapi import UploadFile
-from app.models.candidate import ResumeExtraction, Skill, Experience, Education
+from app.models.candidate import ResumeExtraction
 from app.config import settings
+from app.services.resume_storage import store_upload
+from app.services.llm_client import MistralClientManager, is_outage_error
+from app.services.resume_chunker import chunk_resume, merge_extractions
+from app.services.llm_json_recovery import JsonRecovery, JsonRecoveryError
+from app.services.fallback_parser import parse_resume_text
+from app.services.metrics import span
 from mistralai import Mistral
+from mistralai.extra import response_format_from_pydantic_model
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
@@ -17,85 +24,74 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Bump whenever the extraction prompt changes so cached extractions are invalidated
+PROMPT_VERSION = "2"
+
+
+def extract_pdf_text(file_path: str) -> Tuple[str, int]:
+    """
+    Extract text from PDF using PyPDF2.
+    
+    Single-process reference implementation; the upload path uses
+    PdfExtractionEngine instead.
+    """
+    try:
+        logger.debug(f"Extracting text from PDF: {file_path}")
+        
+        with open(file_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            num_pages = len(pdf_reader.pages)
+            logger.debug(f"PDF has {num_pages} pages")
+            
+            page_texts = []
+            for page_num, page in enumerate(pdf_reader.pages):
+                page_text = page.extract_text()
+                page_texts.append(page_text)
+                logger.debug(f"Page {page_num + 1}: {len(page_text)} characters")
+            
+            final_text = "\n".join(page_texts).strip()
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Total extracted text length: {len(final_text)} characters")
+                logger.debug(f"First 500 characters: {final_text[:500]}")
+                logger.debug(f"Last 500 characters: {final_text[-500:]}")
+            
+            return final_text, num_pages
+    except Exception as e:
+        logger.error(f"Failed to extract text from PDF: {str(e)}")
+        raise Exception(f"Failed to extract text from PDF: {str(e)}")
+
+
 class ResumeExtractor:
     """Service for extracting structured data from resume PDFs using LLM"""
     
-    def __init__(self, MISTRAL_API_KEY: Optional[str] = None):
+    def __init__(self, MISTRAL_API_KEY: Optional[str] = None, client_manager: Optional[MistralClientManager] = None):
         self.upload_dir = "uploads/resumes"
         os.makedirs(self.upload_dir, exist_ok=True)
         
-        # Initialize Mistral client
-        if MISTRAL_API_KEY:
-            logger.info(f"Using provided Mistral API key: {MISTRAL_API_KEY[:10]}...")
-            self.client = Mistral(api_key=MISTRAL_API_KEY)
-        elif settings.MISTRAL_API_KEY:
-            logger.info(f"Using settings Mistral API key: {settings.MISTRAL_API_KEY[:10]}...")
-            self.client = Mistral(api_key=settings.MISTRAL_API_KEY)
-        else:
-            # Try to get from environment variable
-            api_key = os.getenv("MISTRAL_API_KEY")
-            if api_key:
-                logger.info(f"Using environment Mistral API key: {api_key[:10]}...")
-                self.client = Mistral(api_key=api_key)
-            else:
-                logger.error("No Mistral API key found!")
-                self.client = None
-        
-        # Test the client
-        if self.client:
-            try:
-                logger.info("Testing Mistral client...")
-                # Try a simple test call
-                test_response = self.client.chat.complete(
-                    model="mistral-small-latest",
-                    messages=[{"role": "user", "content": "Hello"}],
-                    max_tokens=10
-                )
-                logger.info("Mistral client test successful!")
-            except Exception as e:
-                logger.error(f"Mistral client test failed: {e}")
-                self.client = None
-        
-        logger.info(f"Mistral client initialized: {self.client is not None}")
+        # The client is created lazily by the manager; nothing touches the network here
+        self.client_manager = client_manager or MistralClientManager(api_key=MISTRAL_API_KEY)
+        self.response_format = response_format_from_pydantic_model(ResumeExtraction)
+        self.json_recovery = JsonRecovery()
+    
+    @property
+    def client(self) -> Optional[Mistral]:
+        """The shared Mistral client, or None if no API key is configured"""
+        return self.client_manager.client
     
     def extract_text_from_pdf(self, file_path: str) -> Tuple[str, int]:
         """Extract text from PDF using PyPDF2"""
-        try:
-            logger.info(f"Extracting text from PDF: {file_path}")
-            
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                num_pages = len(pdf_reader.pages)
-                logger.info(f"PDF has {num_pages} pages")
-                
-                extracted_text = ""
-                for page_num, page in enumerate(pdf_reader.pages):
-                    page_text = page.extract_text()
-                    extracted_text += page_text + "\n"
-                    logger.info(f"Page {page_num + 1}: {len(page_text)} characters")
-                
-                final_text = extracted_text.strip()
-                logger.info(f"Total extracted text length: {len(final_text)} characters")
-                logger.info(f"First 500 characters: {final_text[:500]}")
-                logger.info(f"Last 500 characters: {final_text[-500:]}")
-                
-                return final_text, num_pages
-        except Exception as e:
-            logger.error(f"Failed to extract text from PDF: {str(e)}")
-            raise Exception(f"Failed to extract text from PDF: {str(e)}")
+        return extract_pdf_text(file_path)
     
-    def extract_resume_data(self, extracted_text: str, num_pages: int) -> ResumeExtraction:
-        """Extract structured resume data from text using LLM parsing"""
-        logger.info(f"Starting LLM extraction for {num_pages} page(s)")
-        logger.info(f"Input text length: {len(extracted_text)} characters")
-        
-        if self.client is None:
-            logger.warning("Mistral client not available, falling back to basic parsing")
-            return self._fallback_extraction(extracted_text, num_pages)
-        
-        logger.info("Mistral client is available, attempting LLM extraction...")
-        
-        prompt = f"""
+    def _build_prompt(self, extracted_text: str, part: Optional[Tuple[int, int]] = None) -> str:
+        """Build the extraction prompt for the given resume text, or for part (i, n) of it"""
+        scope = ""
+        if part:
+            scope = (
+                f"This is part {part[0]} of {part[1]} of a longer resume. Only extract information "
+                "that appears in this part; leave other fields empty and use an empty string for an "
+                "unknown full_name.\n"
+            )
+        return f"""{scope}
         Extract the following information from the resume text below and return it as a valid JSON object:
         {{
             "full_name": "candidate's full name",
@@ -137,292 +133,159 @@ class ResumeExtractor:
         Resume Text:
         {extracted_text}
         """
-
+    
+    def _build_messages(self, prompt: str) -> List[dict]:
+        """Wrap the prompt with the resume parsing system message"""
+        return [
+            {"role": "system", "content": "You are a resume parsing model. Extract structured information from resumes and return it as valid JSON."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _log_llm_result(self, resume_data: ResumeExtraction):
+        """Log a summary of a successful LLM extraction"""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        logger.debug("LLM extraction successful:")
+        logger.debug(f"  - Name: {resume_data.full_name}")
+        logger.debug(f"  - Email: {resume_data.email}")
+        logger.debug(f"  - Phone: {resume_data.phone}")
+        logger.debug(f"  - Skills count: {len(resume_data.skills)}")
+        logger.debug(f"  - Experience count: {len(resume_data.experience)}")
+        logger.debug(f"  - Education count: {len(resume_data.education)}")
+    
+    def _chunk_prompts(self, extracted_text: str) -> List[str]:
+        """Split long resumes into section-aligned chunks and build one prompt per chunk"""
+        chunks = chunk_resume(extracted_text, settings.LLM_CHUNK_TOKENS)
+        if len(chunks) == 1:
+            return [self._build_prompt(extracted_text)]
+        logger.info(f"Splitting resume into {len(chunks)} chunks of at most {settings.LLM_CHUNK_TOKENS} tokens")
+        return [self._build_prompt(chunk, part=(i + 1, len(chunks))) for i, chunk in enumerate(chunks)]
+    
+    def _recover_or_none(self, response) -> Optional[ResumeExtraction]:
+        """Salvage the response content, or None if it cannot be used"""
         try:
-            logger.info("Sending request to Mistral API...")
-            logger.info(f"Prompt length: {len(prompt)} characters")
-            
-            # First try with structured output
-            try:
-                logger.info("Attempting structured output...")
-                response = self.client.chat.parse(
-                    model="mistral-small-latest",
-                    messages=[
-                        {"role": "system", "content": "You are a resume parsing model. Extract structured information from resumes and return it as valid JSON."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    response_format=ResumeExtraction,
-                    temperature=0
-                )
-                
-                logger.info("Received structured response from Mistral API")
-                
-                # Handle the response - it might be a string or a structured object
-                content = response.choices[0].message.content
-                
-                if isinstance(content, str):
-                    # If it's a string, try to parse it as JSON
-                    logger.info("Response is a string, attempting JSON parsing")
-                    try:
-                        import json
-                        parsed_data = json.loads(content)
-                        # Convert the parsed data to ResumeExtraction model
-                        resume_data = ResumeExtraction(**parsed_data)
-                    except (json.JSONDecodeError, TypeError) as e:
-                        logger.error(f"Failed to parse JSON response: {e}")
-                        logger.error(f"Raw response content: {content[:500]}...")
-                        raise Exception(f"Invalid JSON response from LLM: {e}")
-                else:
-                    # If it's already a structured object
-                    logger.info("Response is already a structured object")
-                    resume_data = content
-                    
-            except Exception as structured_error:
-                logger.warning(f"Structured output failed: {structured_error}")
-                logger.info("Trying regular chat completion...")
-                
-                # Fallback to regular chat completion
-                response = self.client.chat.complete(
-                    model="mistral-small-latest",
-                    messages=[
-                        {"role": "system", "content": "You are a resume parsing model. Extract structured information from resumes and return it as valid JSON."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0
-                )
-                
-                logger.info("Received regular response from Mistral API")
-                
-                # Parse the JSON response
-                content = response.choices[0].message.content
-                logger.info(f"Raw response: {content[:200]}...")
-                
-                try:
-                    import json
-                    parsed_data = json.loads(content)
-                    # Convert the parsed data to ResumeExtraction model
-                    resume_data = ResumeExtraction(**parsed_data)
-                except (json.JSONDecodeError, TypeError) as e:
-                    logger.error(f"Failed to parse JSON response: {e}")
-                    logger.error(f"Raw response content: {content[:500]}...")
-                    raise Exception(f"Invalid JSON response from LLM: {e}")
-            
-            logger.info(f"LLM extraction successful:")
-            logger.info(f"  - Name: {resume_data.full_name}")
-            logger.info(f"  - Email: {resume_data.email}")
-            logger.info(f"  - Phone: {resume_data.phone}")
-            logger.info(f"  - Skills count: {len(resume_data.skills)}")
-            logger.info(f"  - Experience count: {len(resume_data.experience)}")
-            logger.info(f"  - Education count: {len(resume_data.education)}")
-            
-            return resume_data
-            
-        except Exception as e:
-            logger.error(f"LLM parsing failed: {str(e)}")
-            logger.error(f"Error type: {type(e).__name__}")
-            logger.error(f"Falling back to basic parsing")
-            return self._fallback_extraction(extracted_text, num_pages)
+            return self.json_recovery.recover(response.choices[0].message.content)
+        except JsonRecoveryError as e:
+            logger.warning(f"Could not recover LLM response: {e}")
+            return None
     
-    def _fallback_extraction(self, extracted_text: str, num_pages: int) -> ResumeExtraction:
-        """Fallback to basic parsing if LLM fails"""
-        logger.info("Using fallback extraction method")
-        lines = extracted_text.split('\n')
-        logger.info(f"Processing {len(lines)} lines of text")
+    async def _extract_chunk_async(self, client: Mistral, prompt: str) -> ResumeExtraction:
+        """
+        Run one prompt through the LLM; raises if no usable response is obtained.
         
-        # Basic extraction logic (original implementation)
-        full_name = self._extract_name(lines)
-        email = self._extract_email(lines)
-        phone = self._extract_phone(lines)
-        location = self._extract_location(lines)
-        summary = self._extract_summary(lines)
-        skills = self._extract_skills(lines)
-        experience = self._extract_experience(lines)
-        education = self._extract_education(lines)
+        The structured-output response is repaired locally when it is malformed.
+        A second request, in plain JSON mode, is only made if that fails.
+        """
+        messages = self._build_messages(prompt)
+        logger.debug(f"Prompt length: {len(prompt)} characters")
         
-        logger.info(f"Fallback extraction results:")
-        logger.info(f"  - Name: {full_name}")
-        logger.info(f"  - Email: {email}")
-        logger.info(f"  - Phone: {phone}")
-        logger.info(f"  - Skills count: {len(skills)}")
-        logger.info(f"  - Experience count: {len(experience)}")
-        logger.info(f"  - Education count: {len(education)}")
+        try:
+            response = await client.chat.complete_async(
+                model=settings.MISTRAL_MODEL,
+                messages=messages,
+                response_format=self.response_format,
+                temperature=0
+            )
+            resume_data = self._recover_or_none(response)
+            if resume_data is not None:
+                return resume_data
+        except Exception as structured_error:
+            if is_outage_error(structured_error):
+                raise
+            logger.warning(f"Structured output failed: {structured_error}")
         
-        return ResumeExtraction(
-            full_name=full_name or "Unknown",
-            email=email,
-            phone=phone,
-            location=location,
-            summary=summary,
-            skills=skills,
-            experience=experience,
-            education=education
+        logger.info("Retrying with a plain JSON completion...")
+        response = await client.chat.complete_async(
+            model=settings.MISTRAL_MODEL,
+            messages=messages,
+            response_format={"type": "json_object"},
+            temperature=0
         )
+        return self.json_recovery.recover(response.choices[0].message.content)
     
-    def _extract_name(self, lines: List[str]) -> str:
-        """Extract candidate name from first few lines"""
-        logger.info("Extracting name from first 5 lines")
-        for i, line in enumerate(lines[:5]):
-            line = line.strip()
-            logger.info(f"  Line {i+1}: '{line}'")
-            if line and len(line.split()) <= 4:  # Likely a name
-                logger.info(f"  Found name: '{line}'")
-                return line
-        logger.warning("No name found in first 5 lines")
-        return "Unknown"
-    
-    def _extract_email(self, lines: List[str]) -> str:
-        """Extract email address"""
-        import re
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        for line in lines:
-            emails = re.findall(email_pattern, line)
-            if emails:
-                logger.info(f"Found email: {emails[0]}")
-                return emails[0]
-        logger.warning("No email found")
-        return None
-    
-    def _extract_phone(self, lines: List[str]) -> str:
-        """Extract phone number"""
-        import re
-        phone_pattern = r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        for line in lines:
-            phones = re.findall(phone_pattern, line)
-            if phones:
-                logger.info(f"Found phone: {phones[0]}")
-                return phones[0]
-        logger.warning("No phone found")
-        return None
-    
-    def _extract_location(self, lines: List[str]) -> str:
-        """Extract location/city"""
-        location_keywords = ['location', 'city', 'address', 'based in']
-        for line in lines:
-            line_lower = line.lower()
-            for keyword in location_keywords:
-                if keyword in line_lower:
-                    logger.info(f"Found location: '{line.strip()}'")
-                    return line.strip()
-        logger.warning("No location found")
-        return None
+    async def extract_resume_data_async(self, extracted_text: str, num_pages: int) -> ResumeExtraction:
+        """
+        Extract structured resume data from text using LLM parsing.
+        
+        Uses the Mistral async API so that waiting on the LLM does not block the
+        event loop. Falls back to basic parsing when the LLM is unavailable or fails.
+        """
+        resume_data, _ = await self.extract_with_source_async(extracted_text, num_pages)
+        return resume_data
     
-    def _extract_summary(self, lines: List[str]) -> str:
-        """Extract professional summary"""
-        summary_keywords = ['summary', 'objective', 'profile', 'about']
-        for i, line in enumerate(lines):
-            line_lower = line.lower()
-            for keyword in summary_keywords:
-                if keyword in line_lower:
-                    logger.info(f"Found summary section at line {i+1}")
-                    # Get next few lines as summary
-                    summary_lines = []
-                    for j in range(i+1, min(i+5, len(lines))):
-                        if lines[j].strip():
-                            summary_lines.append(lines[j].strip())
-                    summary = ' '.join(summary_lines)
-                    logger.info(f"Summary: {summary[:100]}...")
-                    return summary
-        logger.warning("No summary found")
-        return None
+    async def extract_with_source_async(self, extracted_text: str, num_pages: int) -> Tuple[ResumeExtraction, str]:
+        """Extract resume data, also reporting whether it came from the "llm" or the "fallback" parser"""
+        with span("llm_call") as labels:
+            resume_data, source = await self._extract_with_source_async(extracted_text, num_pages)
+            labels["outcome"] = source
+        return resume_data, source
     
-    def _extract_skills(self, lines: List[str]) -> List[Skill]:
-        """Extract skills from resume"""
-        skills = []
-        skill_keywords = ['skills', 'technologies', 'programming', 'languages', 'tools']
+    async def _extract_with_source_async(self, extracted_text: str, num_pages: int) -> Tuple[ResumeExtraction, str]:
+        """
+        Extract resume data and its source, timed by extract_with_source_async.
         
-        for i, line in enumerate(lines):
-            line_lower = line.lower()
-            for keyword in skill_keywords:
-                if keyword in line_lower:
-                    logger.info(f"Found skills section at line {i+1}")
-                    # Extract skills from next few lines
-                    for j in range(i+1, min(i+10, len(lines))):
-                        skill_line = lines[j].strip()
-                        if skill_line and not any(kw in skill_line.lower() for kw in ['experience', 'education', 'work']):
-                            # Split by common separators
-                            skill_items = skill_line.replace(',', ' ').replace(';', ' ').split()
-                            for skill in skill_items:
-                                if len(skill) > 2:  # Filter out very short items
-                                    skills.append(Skill(name=skill))
-                                    logger.info(f"  Found skill: {skill}")
-        logger.info(f"Total skills found: {len(skills)}")
-        return skills
-    
-    def _extract_experience(self, lines: List[str]) -> List[Experience]:
-        """Extract work experience"""
-        experience = []
-        exp_keywords = ['experience', 'work history', 'employment']
+        Long resumes are split into section-aligned chunks that are extracted
+        concurrently and merged, so no single call exceeds LLM_CHUNK_TOKENS.
+        If any chunk fails the whole resume goes through the fallback parser.
+        """
+        logger.debug(f"Starting async LLM extraction for {num_pages} page(s)")
         
-        for i, line in enumerate(lines):
-            line_lower = line.lower()
-            for keyword in exp_keywords:
-                if keyword in line_lower:
-                    logger.info(f"Found experience section at line {i+1}")
-                    # Simple extraction - you might want to enhance this
-                    for j in range(i+1, min(i+20, len(lines))):
-                        exp_line = lines[j].strip()
-                        if exp_line and len(exp_line) > 10:
-                            # Basic parsing - you can enhance this
-                            exp = Experience(
-                                company="Company Name",
-                                position="Position",
-                                start_date="2020",
-                                end_date="Present",
-                                description=exp_line
-                            )
-                            experience.append(exp)
-                            logger.info(f"  Found experience: {exp_line[:50]}...")
-        logger.info(f"Total experience entries found: {len(experience)}")
-        return experience
-    
-    def _extract_education(self, lines: List[str]) -> List[Education]:
-        """Extract education information"""
-        education = []
-        edu_keywords = ['education', 'academic', 'degree', 'university']
+        client = self.client_manager.acquire()
+        if client is None:
+            logger.warning("Mistral client not available, falling back to basic parsing")
+            return self._fallback_extraction(extracted_text, num_pages), "fallback"
         
-        for i, line in enumerate(lines):
-            line_lower = line.lower()
-            for keyword in edu_keywords:
-                if keyword in line_lower:
-                    logger.info(f"Found education section at line {i+1}")
-                    # Simple extraction - you might want to enhance this
-                    for j in range(i+1, min(i+10, len(lines))):
-                        edu_line = lines[j].strip()
-                        if edu_line and len(edu_line) > 10:
-                            edu = Education(
-                                institution="Institution",
-                                degree="Degree",
-                                field_of_study="Field of Study"
-                            )
-                            education.append(edu)
-                            logger.info(f"  Found education: {edu_line[:50]}...")
-        logger.info(f"Total education entries found: {len(education)}")
-        return education
+        try:
+            prompts = self._chunk_prompts(extracted_text)
+            if len(prompts) == 1:
+                resume_data = await self._extract_chunk_async(client, prompts[0])
+            else:
+                semaphore = asyncio.Semaphore(settings.LLM_CHUNK_CONCURRENCY)
+                
+                async def extract(prompt: str) -> ResumeExtraction:
+                    async with semaphore:
+                        return await self._extract_chunk_async(client, prompt)
+                
+                parts = await asyncio.gather(*(extract(p) for p in prompts), return_exceptions=True)
+                for part in parts:
+                    if isinstance(part, BaseException):
+                        raise part
+                resume_data = merge_extractions(parts)
+            
+            self.client_manager.record_success()
+            self._log_llm_result(resume_data)
+            return resume_data, "llm"
+            
+        except Exception as e:
+            self.client_manager.record_error(e)
+            logger.error(f"LLM parsing failed: {str(e)}")
+            logger.error("Falling back to basic parsing")
+            return self._fallback_extraction(extracted_text, num_pages), "fallback"
+    
+    def _fallback_extraction(self, extracted_text: str, num_pages: int) -> ResumeExtraction:
+        """Fallback to basic parsing if LLM fails"""
+        with span("fallback_parse"):
+            resume_data = parse_resume_text(extracted_text)
+        logger.debug(
+            f"Fallback extraction: name={resume_data.full_name!r}, {len(resume_data.skills)} skills, "
+            f"{len(resume_data.experience)} jobs, {len(resume_data.education)} degrees"
+        )
+        return resume_data
     
     async def process_resume(self, file: UploadFile, uploaded_by: str) -> ResumeExtraction:
-        """Process a single resume file"""
+        """Process a single resume file without keeping it"""
         logger.info(f"Processing resume: {file.filename}")
-        logger.info(f"File size: {file.size} bytes")
         
-        # Save file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
-            logger.info(f"Saved temporary file: {temp_file_path}")
-        
-        try:
+        # Stream the upload to a scratch directory and parse it from there
+        with tempfile.TemporaryDirectory() as temp_dir:
+            stored = await store_upload(file, temp_dir)
+            logger.info(f"File size: {stored.size} bytes")
+            
             # Extract text from PDF
-            extracted_text, num_pages = self.extract_text_from_pdf(temp_file_path)
+            extracted_text, num_pages = self.extract_text_from_pdf(stored.path)
             
             # Extract structured data using LLM
-            resume_data = self.extract_resume_data(extracted_text, num_pages)
+            resume_data = await self.extract_resume_data_async(extracted_text, num_pages)
             
             logger.info(f"Resume processing completed for: {file.filename}")
             return resume_data
-            
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
-                logger.info(f"Cleaned up temporary file: {temp_file_path}") 
\ No newline at end of file
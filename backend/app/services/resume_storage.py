@@ -0,0 +1,55 @@
+import hashlib
+import logging
+import os
+import time
+import uuid
+
+from fastapi import UploadFile
+
+from app.schemas.ingestion import SpooledUpload
+from app.services.metrics import observe_stage
+
+logger = logging.getLogger(__name__)
+
+# Read size for streaming uploads; peak memory per upload stays at one chunk
+CHUNK_SIZE = 1024 * 1024
+
+
+async def store_upload(file: UploadFile, storage_dir: str) -> SpooledUpload:
+    """
+    Stream an upload to its final, content-addressed location in one pass.
+
+    The bytes are hashed while they are written to a temporary name in
+    ``storage_dir``, then renamed to ``<sha256>.pdf``. The rename is a metadata
+    operation, so each resume is written to disk exactly once.
+    """
+    hasher = hashlib.sha256()
+    size = 0
+    read_seconds = write_seconds = 0.0
+    part_path = os.path.join(storage_dir, f".{uuid.uuid4().hex}.part")
+    try:
+        with open(part_path, "wb") as out:
+            while True:
+                started = time.perf_counter()
+                chunk = await file.read(CHUNK_SIZE)
+                read_seconds += time.perf_counter() - started
+                if not chunk:
+                    break
+                started = time.perf_counter()
+                hasher.update(chunk)
+                out.write(chunk)
+                write_seconds += time.perf_counter() - started
+                size += len(chunk)
+        content_hash = hasher.hexdigest()
+        path = os.path.join(storage_dir, f"{content_hash}.pdf")
+        os.replace(part_path, path)
+    except Exception:
+        observe_stage("upload_read", read_seconds, "error")
+        if os.path.exists(part_path):
+            os.unlink(part_path)
+        raise
+
+    observe_stage("upload_read", read_seconds)
+    observe_stage("temp_write", write_seconds)
+    logger.debug(f"Stored {file.filename} ({size} bytes) as {path}")
+    return SpooledUpload(filename=file.filename, path=path, content_hash=content_hash, size=size)
@@ -0,0 +1,326 @@
+import asyncio
+import logging
+import re
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from beanie import PydanticObjectId
+from pydantic import BaseModel, Field
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.models.candidate import Candidate, Skill
+from app.models.skill import SkillTerm
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+# Unmatched skill strings longer than this are sentences, not skills, and are not interned
+MAX_SKILL_WORDS = 4
+# Shorter keys ("c", "r", "go") only match a whole skill string, never inside one
+MIN_SCAN_KEY_LENGTH = 3
+BACKFILL_BATCH = 1000
+
+# Canonical display name -> spellings seen in extracted resumes. Every name is
+# also an alias of itself; matching is on normalized tokens, so case and
+# trailing punctuation ("Python,") never need listing.
+CANONICAL_SKILLS: Dict[str, Sequence[str]] = {
+    "Python": ("python3", "python 3", "py"),
+    "Java": ("java 8", "java 11", "java 17", "core java"),
+    "JavaScript": ("js", "java script", "ecmascript", "es6"),
+    "TypeScript": ("ts",),
+    "C++": ("cpp", "c plus plus"),
+    "C#": ("c sharp", "csharp"),
+    "C": (),
+    "Go": ("golang",),
+    "Rust": (),
+    "Ruby": (),
+    "PHP": (),
+    "Kotlin": (),
+    "Swift": (),
+    "Scala": (),
+    "R": (),
+    "SQL": ("structured query language",),
+    "Bash": ("shell scripting", "shell", "bash scripting"),
+    "React": ("react.js", "reactjs", "react js"),
+    "Angular": ("angular.js", "angularjs"),
+    "Vue.js": ("vue", "vuejs", "vue js"),
+    "Node.js": ("node", "nodejs", "node js"),
+    "Next.js": ("nextjs",),
+    "Express": ("express.js", "expressjs"),
+    "Django": (),
+    "Flask": (),
+    "FastAPI": ("fast api",),
+    "Spring Boot": ("springboot", "spring"),
+    ".NET": ("dotnet", "asp.net", ".net core"),
+    "Ruby on Rails": ("rails", "ror"),
+    "HTML": ("html5",),
+    "CSS": ("css3",),
+    "Tailwind CSS": ("tailwind", "tailwindcss"),
+    "GraphQL": (),
+    "REST APIs": ("rest", "rest api", "restful", "restful apis", "restful api"),
+    "PostgreSQL": ("postgres", "postgresql", "psql"),
+    "MySQL": (),
+    "MongoDB": ("mongo",),
+    "Redis": (),
+    "Elasticsearch": ("elastic search", "elk"),
+    "Kafka": ("apache kafka",),
+    "RabbitMQ": ("rabbit mq",),
+    "Apache Spark": ("spark", "pyspark"),
+    "Hadoop": (),
+    "Airflow": ("apache airflow",),
+    "AWS": ("amazon web services",),
+    "Azure": ("microsoft azure",),
+    "Google Cloud": ("gcp", "google cloud platform"),
+    "Docker": (),
+    "Kubernetes": ("k8s",),
+    "Terraform": (),
+    "Ansible": (),
+    "Jenkins": (),
+    "CI/CD": ("ci cd", "continuous integration"),
+    "Git": ("github", "gitlab"),
+    "Linux": ("unix",),
+    "Machine Learning": ("ml",),
+    "Deep Learning": ("dl",),
+    "TensorFlow": ("tensor flow",),
+    "PyTorch": ("torch",),
+    "scikit-learn": ("sklearn", "scikit learn"),
+    "Pandas": (),
+    "NumPy": (),
+    "NLP": ("natural language processing",),
+    "Computer Vision": ("cv",),
+    "Data Analysis": ("data analytics",),
+    "Tableau": (),
+    "Power BI": ("powerbi",),
+    "Excel": ("microsoft excel", "ms excel"),
+    "Figma": (),
+    "Agile": ("scrum", "agile methodologies"),
+    "Jira": (),
+    "Project Management": (),
+    "Microservices": ("microservice architecture",),
+}
+
+
+def normalize_skill(name: Optional[str]) -> str:
+    """Lowercase tokens joined by single spaces; "Python," and " python " share a key"""
+    if not name:
+        return ""
+    return " ".join(TOKEN_RE.findall(name.lower()))
+
+
+_ALIASES: Dict[str, str] = {}
+for _name, _aliases in CANONICAL_SKILLS.items():
+    for _alias in (_name, *_aliases):
+        _ALIASES.setdefault(normalize_skill(_alias), normalize_skill(_name))
+
+
+def canonical_key(key: str) -> str:
+    """Canonical key for a normalized skill key; unknown keys map to themselves"""
+    return _ALIASES.get(key, key)
+
+
+class _TokenTrie:
+    """Trie over word tokens; finds the longest known skill starting at each position"""
+
+    __slots__ = ("root",)
+
+    def __init__(self):
+        self.root: dict = {}
+
+    def add(self, key: str, skill_id: int):
+        node = self.root
+        for token in key.split(" "):
+            node = node.setdefault(token, {})
+        node[None] = skill_id
+
+    def scan(self, tokens: List[str]) -> List[int]:
+        """Leftmost-longest matches, non-overlapping, in text order"""
+        found = []
+        i = 0
+        while i < len(tokens):
+            node, match, end = self.root, None, i
+            for j in range(i, len(tokens)):
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                if None in node:
+                    match, end = node[None], j + 1
+            if match is None:
+                i += 1
+            else:
+                found.append(match)
+                i = end
+        return found
+
+
+# Built-in skills only, for free text scanned without the database (job postings)
+_CANONICAL_NAMES = list(CANONICAL_SKILLS)
+_CANONICAL_TRIE = _TokenTrie()
+for _alias, _key in _ALIASES.items():
+    if len(_alias) >= MIN_SCAN_KEY_LENGTH:
+        _CANONICAL_TRIE.add(_alias, next(i for i, n in enumerate(_CANONICAL_NAMES) if normalize_skill(n) == _key))
+
+
+def find_skills(text: Optional[str]) -> List[str]:
+    """Canonical names of the built-in skills mentioned in ``text``, in order of first mention"""
+    found = _CANONICAL_TRIE.scan(normalize_skill(text).split(" ")) if text else []
+    return [_CANONICAL_NAMES[i] for i in dict.fromkeys(found)]
+
+
+class CandidateSkills(BaseModel):
+    """Projection of the fields the backfill reads"""
+    id: PydanticObjectId = Field(alias="_id")
+    skills: List[Skill] = []
+
+
+class SkillVocabulary:
+    """
+    Canonical skills with compact integer IDs, shared by every candidate.
+
+    IDs live in the skills collection and are assigned on first sight, so
+    they are stable across processes and restarts. A free-text skill resolves
+    by exact alias first ("python3" -> Python); failing that, a token trie
+    picks out known skills it contains ("Python/Django" -> Python, Django);
+    a short string with no known skill is interned as a new one.
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._terms: Dict[int, SkillTerm] = {}
+        self._trie = _TokenTrie()
+        self._lock = asyncio.Lock()
+        self._loaded = False
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def name(self, skill_id: int) -> Optional[str]:
+        term = self._terms.get(skill_id)
+        return term.name if term else None
+
+    def lookup(self, name: str) -> Optional[int]:
+        """ID of a known skill or alias, without interning"""
+        return self._ids.get(canonical_key(normalize_skill(name)))
+
+    def _register(self, term: SkillTerm):
+        self._terms[term.skill_id] = term
+        for key in (term.key, *term.aliases):
+            self._ids.setdefault(key, term.skill_id)
+            if len(key) >= MIN_SCAN_KEY_LENGTH:
+                self._trie.add(key, term.skill_id)
+
+    async def load(self):
+        """Read the vocabulary and make sure every built-in canonical skill has an ID"""
+        async with self._lock:
+            self._ids, self._terms, self._trie = {}, {}, _TokenTrie()
+            async for term in SkillTerm.find_all().sort("+skill_id"):
+                self._register(term)
+            await self._intern([
+                (normalize_skill(name), name) for name in CANONICAL_SKILLS
+                if normalize_skill(name) not in self._ids
+            ])
+            self._loaded = True
+            logger.info(f"Loaded skill vocabulary: {len(self._terms)} skills")
+
+    async def _intern(self, new: List[tuple]):
+        """Assign IDs to (key, display name) pairs; caller holds the lock"""
+        if not new:
+            return
+        next_id = max(self._terms, default=0) + 1
+        terms = []
+        for offset, (key, name) in enumerate(new):
+            aliases = sorted(alias for alias, canonical in _ALIASES.items() if canonical == key and alias != key)
+            terms.append(SkillTerm(skill_id=next_id + offset, key=key, name=name, aliases=aliases))
+        try:
+            await SkillTerm.insert_many(terms, ordered=False)
+        except BulkWriteError:
+            # Another process interned some keys or took some IDs first; adopt what was stored
+            async for term in SkillTerm.find({"$or": [
+                {"key": {"$in": [key for key, _ in new]}},
+                {"skill_id": {"$gte": next_id}}
+            ]}):
+                self._register(term)
+            return
+        for term in terms:
+            self._register(term)
+
+    def _match(self, key: str) -> List[int]:
+        skill_id = self._ids.get(canonical_key(key))
+        if skill_id is not None:
+            return [skill_id]
+        return self._trie.scan(key.split(" ")) if key else []
+
+    async def resolve_many(self, skill_lists: Sequence[Iterable[str]]) -> List[List[int]]:
+        """Skill IDs for each list of free-text skill names, interning unknown skills in one write"""
+        if not self._loaded:
+            await self.load()
+        lists = [[normalize_skill(name) for name in names] for names in skill_lists]
+        async with self._lock:
+            unknown: Dict[str, str] = {}
+            for names, keys in zip(skill_lists, lists):
+                for name, key in zip(names, keys):
+                    if key and not self._match(key) and len(key.split(" ")) <= MAX_SKILL_WORDS:
+                        unknown.setdefault(key, name.strip(" ,.;:"))
+            await self._intern(list(unknown.items()))
+
+        resolved = []
+        for keys in lists:
+            ids: List[int] = []
+            for key in keys:
+                for skill_id in self._match(key):
+                    if skill_id not in ids:
+                        ids.append(skill_id)
+            resolved.append(ids)
+        return resolved
+
+    async def resolve(self, names: Iterable[str]) -> List[int]:
+        return (await self.resolve_many([list(names)]))[0]
+
+    async def assign(self, candidates: Sequence[Candidate]):
+        """Set ``skill_ids`` on candidate documents before they are written"""
+        resolved = await self.resolve_many([[s.name for s in c.skills] for c in candidates])
+        for candidate, ids in zip(candidates, resolved):
+            candidate.skill_ids = ids
+
+    async def backfill(self, rebuild: bool = False) -> dict:
+        """
+        Resolve ``skill_ids`` for stored candidates in bulk; by default only
+        those without them, with ``rebuild`` all of them (after alias changes).
+        """
+        query = {} if rebuild else {"skill_ids": None}
+        collection = Candidate.get_pymongo_collection()
+        updated = 0
+        batch: List[CandidateSkills] = []
+
+        async def write(batch: List[CandidateSkills]) -> int:
+            resolved = await self.resolve_many([[s.name for s in c.skills] for c in batch])
+            result = await collection.bulk_write([
+                UpdateOne({"_id": c.id}, {"$set": {"skill_ids": ids}})
+                for c, ids in zip(batch, resolved)
+            ], ordered=False)
+            return result.modified_count
+
+        async for candidate in Candidate.find(query).project(CandidateSkills):
+            batch.append(candidate)
+            if len(batch) >= BACKFILL_BATCH:
+                updated += await write(batch)
+                batch = []
+        if batch:
+            updated += await write(batch)
+        logger.info(f"Backfilled skill IDs for {updated} candidates")
+        return {"updated": updated, "skills": len(self._terms)}
+
+    async def sync(self):
+        """Startup: load the vocabulary, then resolve candidates written without IDs"""
+        try:
+            await self.load()
+            await self.backfill()
+        except Exception as e:
+            logger.warning(f"Skill vocabulary sync failed: {e}")
+
+    def stats(self) -> dict:
+        return {"skills": len(self._terms), "aliases": len(self._ids), "loaded": self._loaded}
@@ -0,0 +1,303 @@
+import math
+import re
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from scipy import sparse
+
+from app.services.skill_vocabulary import TOKEN_RE
+
+# Same tokens as TOKEN_RE, located in the original (mixed-case) text for highlighting
+TOKEN_SPAN_RE = re.compile(TOKEN_RE.pattern, re.IGNORECASE)
+# Incrementally added documents are merged into the compressed segment past this many
+MAX_DELTA_DOCS = 5000
+
+FieldValue = Union[None, str, Sequence[str]]
+Analyzer = Callable[[str], List[str]]
+
+
+def analyze(text: Optional[str]) -> List[str]:
+    """
+    Lowercase search tokens. Dotted tokens also yield their parts, so
+    "john.doe@acme.com" is found by "john", "acme" or "john.doe", and
+    "node.js" by "node".
+    """
+    if not text:
+        return []
+    tokens = []
+    for token in TOKEN_RE.findall(text.lower()):
+        tokens.append(token)
+        if "." in token:
+            tokens.extend(part for part in token.split(".") if part)
+    return tokens
+
+
+# Suffixes stripped by ``stem``, longest first; each leaves at least MIN_STEM characters
+STEM_SUFFIXES = ("ments", "ment", "ings", "ing", "ers", "er", "ed", "ly", "es", "s", "e")
+MIN_STEM = 4
+
+
+def stem(token: str) -> str:
+    """
+    Light suffix-stripping stemmer for English search terms: "managing",
+    "managed", "manager" and "management" all stem to "manag". Only applied
+    to purely alphabetic tokens, so "c++", "node.js" and "k8s" stay intact.
+    """
+    if not token.isalpha() or len(token) <= MIN_STEM:
+        return token
+    if token.endswith("ies") and len(token) > MIN_STEM + 1:
+        token = token[:-3] + "y"
+    for _ in range(3):
+        for suffix in STEM_SUFFIXES:
+            if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM and not token.endswith(("ss", "us", "is")):
+                token = token[:-len(suffix)]
+                # "running" -> "runn" -> "run"
+                if len(token) >= MIN_STEM and token[-1] == token[-2] and token[-1] not in "aeiouslfz":
+                    token = token[:-1]
+                break
+        else:
+            break
+    return token
+
+
+def analyze_stemmed(text: Optional[str]) -> List[str]:
+    """``analyze`` followed by ``stem``"""
+    return [stem(token) for token in analyze(text)]
+
+
+def _field_text(value: FieldValue) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    return "\n".join(v for v in value if v)
+
+
+def highlight(text: Optional[str], terms: Iterable[str], analyzer: Analyzer = analyze,
+              window: int = 160, mark: Tuple[str, str] = ("<mark>", "</mark>")) -> Optional[str]:
+    """
+    Snippet of ``text`` around the first query term, with every matching
+    token wrapped in ``mark``; None when no term occurs.
+    """
+    if not text:
+        return None
+    terms = set(terms)
+    spans = [m.span() for m in TOKEN_SPAN_RE.finditer(text) if terms.intersection(analyzer(m.group(0)))]
+    if not spans:
+        return None
+    start = max(0, spans[0][0] - window // 4)
+    end = min(len(text), start + window)
+    pieces = ["…" if start > 0 else ""]
+    cursor = start
+    for span_start, span_end in spans:
+        if span_start < start or span_end > end:
+            continue
+        pieces.extend([text[cursor:span_start], mark[0], text[span_start:span_end], mark[1]])
+        cursor = span_end
+    pieces.append(text[cursor:end])
+    pieces.append("…" if end < len(text) else "")
+    return " ".join("".join(pieces).split())
+
+
+def highlight_fields(fields: Dict[str, FieldValue], terms: Iterable[str], analyzer: Analyzer = analyze) -> Dict[str, str]:
+    """Highlighted snippet per field that contains a query term; list fields snippet their first matching entry"""
+    terms = set(terms)
+    snippets = {}
+    for field, value in fields.items():
+        for text in ([value] if isinstance(value, str) or value is None else value):
+            snippet = highlight(text, terms, analyzer)
+            if snippet:
+                snippets[field] = snippet
+                break
+    return snippets
+
+
+class TextIndex:
+    """
+    Inverted index with BM25 ranking over weighted fields.
+
+    A term's frequency in a document is the sum of its counts per field
+    times the field weight, so a hit in a heavy field (a name, a job title)
+    outranks the same hit in a long description. Postings of the bulk-built
+    documents live in one compressed sparse column matrix (one column per
+    term); documents added later go to a small dictionary segment that is
+    merged into the matrix once it holds MAX_DELTA_DOCS documents. Deletes
+    from the matrix only clear a liveness flag until the next rebuild.
+    """
+
+    def __init__(self, fields: Dict[str, float], analyzer: Analyzer = analyze, k1: float = 1.2, b: float = 0.75):
+        self.fields = fields
+        self.analyzer = analyzer
+        self.k1 = k1
+        self.b = b
+        self.ids: List[str] = []
+        self._ordinals: Dict[str, int] = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self._lengths = np.zeros(0, dtype=np.float32)
+        self._total_length = 0.0
+        # Compressed segment: term -> column of a (documents x terms) CSC matrix
+        self._terms: Dict[str, int] = {}
+        self._postings = sparse.csc_matrix((0, 0), dtype=np.float32)
+        # Delta segment: term -> {ordinal: weighted tf}
+        self._delta: Dict[str, Dict[int, float]] = {}
+        self._delta_docs: Dict[int, Dict[str, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._ordinals
+
+    def _weighted_terms(self, fields: Dict[str, FieldValue]) -> Tuple[Dict[str, float], float]:
+        counts: Counter = Counter()
+        length = 0.0
+        for field, weight in self.fields.items():
+            tokens = self.analyzer(_field_text(fields.get(field)))
+            length += weight * len(tokens)
+            for token in tokens:
+                counts[token] += weight
+        return counts, length
+
+    def _grow(self, size: int):
+        if size > len(self._alive):
+            capacity = max(size, 2 * len(self._alive), 1024)
+            self._alive = np.concatenate([self._alive, np.zeros(capacity - len(self._alive), dtype=bool)])
+            self._lengths = np.concatenate([self._lengths, np.zeros(capacity - len(self._lengths), dtype=np.float32)])
+
+    @classmethod
+    def build(cls, documents: Iterable[Tuple[str, Dict[str, FieldValue]]], fields: Dict[str, float],
+              analyzer: Analyzer = analyze, **params) -> "TextIndex":
+        """Bulk-index (id, field values) pairs into the compressed segment"""
+        index = cls(fields, analyzer, **params)
+        rows: List[int] = []
+        columns: List[int] = []
+        values: List[float] = []
+        lengths: List[float] = []
+        for doc_id, doc_fields in documents:
+            counts, length = index._weighted_terms(doc_fields)
+            ordinal = len(index.ids)
+            index.ids.append(doc_id)
+            index._ordinals[doc_id] = ordinal
+            lengths.append(length)
+            for term, tf in counts.items():
+                column = index._terms.setdefault(term, len(index._terms))
+                rows.append(ordinal)
+                columns.append(column)
+                values.append(tf)
+        index._grow(len(index.ids))
+        index._alive[:len(index.ids)] = True
+        index._lengths[:len(index.ids)] = lengths
+        index._total_length = float(sum(lengths))
+        index._postings = sparse.csc_matrix(
+            (np.asarray(values, dtype=np.float32), (np.asarray(rows, dtype=np.int32), np.asarray(columns, dtype=np.int32))),
+            shape=(len(index.ids), len(index._terms))
+        )
+        return index
+
+    def add(self, doc_id: str, fields: Dict[str, FieldValue]):
+        """Index a document, replacing an earlier version with the same ID"""
+        self.remove(doc_id)
+        counts, length = self._weighted_terms(fields)
+        ordinal = len(self.ids)
+        self.ids.append(doc_id)
+        self._ordinals[doc_id] = ordinal
+        self._grow(ordinal + 1)
+        self._alive[ordinal] = True
+        self._lengths[ordinal] = length
+        self._total_length += length
+        self._delta_docs[ordinal] = dict(counts)
+        for term, tf in counts.items():
+            self._delta.setdefault(term, {})[ordinal] = tf
+        if len(self._delta_docs) >= MAX_DELTA_DOCS:
+            self._merge()
+
+    def remove(self, doc_id: str) -> bool:
+        ordinal = self._ordinals.pop(doc_id, None)
+        if ordinal is None:
+            return False
+        self._alive[ordinal] = False
+        self._total_length -= float(self._lengths[ordinal])
+        for term in self._delta_docs.pop(ordinal, {}):
+            postings = self._delta[term]
+            postings.pop(ordinal, None)
+            if not postings:
+                del self._delta[term]
+        return True
+
+    def _merge(self):
+        """Fold the delta segment into the compressed one"""
+        rows, columns, values = [], [], []
+        for ordinal, counts in self._delta_docs.items():
+            for term, tf in counts.items():
+                rows.append(ordinal)
+                columns.append(self._terms.setdefault(term, len(self._terms)))
+                values.append(tf)
+        shape = (len(self.ids), len(self._terms))
+        main = self._postings.tocoo()
+        self._postings = sparse.csc_matrix(
+            (
+                np.concatenate([main.data, np.asarray(values, dtype=np.float32)]),
+                (np.concatenate([main.row, np.asarray(rows, dtype=np.int32)]),
+                 np.concatenate([main.col, np.asarray(columns, dtype=np.int32)]))
+            ),
+            shape=shape
+        )
+        self._delta, self._delta_docs = {}, {}
+
+    def query_terms(self, query: str) -> List[str]:
+        return list(dict.fromkeys(self.analyzer(query)))
+
+    def search(self, query: str, limit: int, offset: int = 0,
+               where: Optional[Callable[[str], bool]] = None) -> Tuple[List[Tuple[str, float]], int]:
+        """
+        Documents containing any query term, best BM25 score first: one page
+        of (id, score) pairs and the total number of matching documents.
+        ``where`` further restricts the matches by document ID.
+        """
+        terms = self.query_terms(query)
+        live = len(self._ordinals)
+        if not terms or not live:
+            return [], 0
+        # Deleted documents keep their postings until a rebuild, so document
+        # frequencies count them too and so must the collection size
+        size = len(self.ids)
+        scores = np.zeros(size, dtype=np.float32)
+        avg_length = max(self._total_length / live, 1e-6)
+        norms = self.k1 * (1.0 - self.b + self.b * self._lengths[:size] / avg_length)
+        indptr, indices, data = self._postings.indptr, self._postings.indices, self._postings.data
+
+        for term in terms:
+            column = self._terms.get(term)
+            rows = indices[indptr[column]:indptr[column + 1]] if column is not None and column < self._postings.shape[1] \
+                else np.empty(0, dtype=np.int32)
+            delta = self._delta.get(term, {})
+            df = len(rows) + len(delta)
+            if df == 0:
+                continue
+            idf = math.log(1.0 + (size - df + 0.5) / (df + 0.5))
+            if len(rows):
+                tf = data[indptr[column]:indptr[column + 1]]
+                scores[rows] += idf * tf * (self.k1 + 1.0) / (tf + norms[rows])
+            for ordinal, tf in delta.items():
+                scores[ordinal] += idf * tf * (self.k1 + 1.0) / (tf + norms[ordinal])
+
+        scores[~self._alive[:size]] = 0.0
+        matching = np.flatnonzero(scores > 0)
+        if where is not None:
+            matching = matching[np.fromiter((where(self.ids[i]) for i in matching.tolist()), dtype=bool, count=len(matching))]
+        total = len(matching)
+        want = min(offset + limit, total)
+        if want <= 0:
+            return [], total
+        top = matching[np.argpartition(-scores[matching], want - 1)[:want]]
+        top = top[np.lexsort((top, -scores[top]))][offset:]
+        return [(self.ids[i], float(scores[i])) for i in top.tolist()], total
+
+    def stats(self) -> dict:
+        return {
+            "documents": len(self),
+            "terms": len(self._terms) + sum(1 for t in self._delta if t not in self._terms),
+            "postings": int(self._postings.nnz) + sum(len(p) for p in self._delta.values()),
+            "delta_documents": len(self._delta_docs)
+        }
@@ -0,0 +1,96 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Generic, List, Optional, TypeVar
+
+from beanie import PydanticObjectId
+from beanie.odm.queries.find import FindMany
+from pymongo import ASCENDING, DESCENDING
+
+T = TypeVar("T")
+
+# Stable list order: creation time, with the ID breaking ties between documents created in the same millisecond
+SORT_KEY = ("created_at", "_id")
+
+
+@dataclass
+class Cursor:
+    """Position between two documents in (created_at, _id) order; ``backward`` cursors page towards older ones"""
+    created_at: datetime
+    id: PydanticObjectId
+    backward: bool = False
+
+    def encode(self) -> str:
+        raw = json.dumps({"t": self.created_at.isoformat(), "i": str(self.id), "b": int(self.backward)})
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "Cursor":
+        try:
+            raw = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+            return cls(datetime.fromisoformat(raw["t"]), PydanticObjectId(raw["i"]), bool(raw.get("b")))
+        except Exception:
+            raise ValueError("Invalid cursor")
+
+    @classmethod
+    def at(cls, document, backward: bool = False) -> "Cursor":
+        return cls(document.created_at, document.id, backward)
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of documents with opaque cursors to the neighbouring pages, None at either end"""
+    items: List[T]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+def _beyond(cursor: Cursor) -> dict:
+    """Documents strictly after the cursor in its paging direction"""
+    op = "$lt" if cursor.backward else "$gt"
+    return {"$or": [
+        {"created_at": {op: cursor.created_at}},
+        {"created_at": cursor.created_at, "_id": {op: cursor.id}}
+    ]}
+
+
+async def paginate(query: FindMany[T], size: int, page: int = 1, cursor: Optional[str] = None) -> Page[T]:
+    """
+    A page of ``query`` in (created_at, _id) order.
+
+    With a cursor the page is found by seeking an index on the sort key, so
+    every page costs the same however deep it is and inserts elsewhere do
+    not shift it. Without one, ``page`` is skipped to as before; its result
+    still carries cursors for continuing by keyset. One extra document is
+    read to tell whether another page follows.
+    """
+    if cursor is None:
+        order = [(field, ASCENDING) for field in SORT_KEY]
+        items = await query.sort(order).skip((page - 1) * size).limit(size + 1).to_list()
+        more = len(items) > size
+        items = items[:size]
+        return Page(
+            items,
+            next_cursor=Cursor.at(items[-1]).encode() if more else None,
+            prev_cursor=Cursor.at(items[0], backward=True).encode() if items and page > 1 else None
+        )
+
+    position = Cursor.decode(cursor)
+    direction = DESCENDING if position.backward else ASCENDING
+    items = await query.find(_beyond(position)).sort([(field, direction) for field in SORT_KEY]).limit(size + 1).to_list()
+    more = len(items) > size
+    items = items[:size]
+    if position.backward:
+        items.reverse()
+        # Coming back from a later page, so there is always one after this
+        return Page(
+            items,
+            next_cursor=(Cursor.at(items[-1]) if items else Cursor(position.created_at, position.id)).encode(),
+            prev_cursor=Cursor.at(items[0], backward=True).encode() if more else None
+        )
+    return Page(
+        items,
+        next_cursor=Cursor.at(items[-1]).encode() if more else None,
+        prev_cursor=(Cursor.at(items[0], backward=True) if items else Cursor(position.created_at, position.id, True)).encode()
+    )
@@ -0,0 +1,97 @@
+"""
+Recall and latency of the IVF candidate index against exact search.
+
+Builds an index over clustered synthetic unit vectors (the shape real resume
+embeddings have: many near-duplicates around a few hundred profiles), then
+sweeps nprobe and reports recall@k against brute-force search, query
+latency and how many vectors each query scored. Run from backend/:
+
+    python -m benchmarks.bench_ann_index --vectors 100000 --nprobe 1 2 4 8 16 32
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from app.services.ann_index import IVFIndex, default_nlist
+
+
+def make_vectors(rng: np.random.Generator, count: int, dim: int, clusters: int, spread: float) -> np.ndarray:
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, clusters, count)] + spread * rng.standard_normal((count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def exact_top_k(vectors: np.ndarray, query: np.ndarray, k: int) -> np.ndarray:
+    scores = vectors @ query
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--vectors", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=0, help="0 = sqrt(vectors)")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--clusters", type=int, default=300)
+    parser.add_argument("--spread", type=float, default=1.0, help="Noise around cluster centres; higher is harder")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(13)
+    vectors = make_vectors(rng, args.vectors, args.dim, args.clusters, args.spread)
+    ids = [f"{i:024x}" for i in range(args.vectors)]
+    # Queries are perturbed copies of stored points, like a job close to some resumes
+    picks = rng.integers(0, args.vectors, args.queries)
+    queries = vectors[picks] + 0.5 * args.spread * rng.standard_normal((args.queries, args.dim)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    start = time.perf_counter()
+    index = IVFIndex.build(ids, vectors, nlist=args.nlist or default_nlist(args.vectors))
+    build = time.perf_counter() - start
+    print(f"{args.vectors} x {args.dim} vectors, nlist={index.nlist}, built in {build:.2f}s")
+
+    start = time.perf_counter()
+    truth = [set(exact_top_k(vectors, q, args.k).tolist()) for q in queries]
+    exact_ms = (time.perf_counter() - start) / args.queries * 1000
+
+    print(f"{'nprobe':>8} {'recall@' + str(args.k):>10} {'ms/query':>10} {'scanned':>10}")
+    print(f"{'exact':>8} {1.0:>10.3f} {exact_ms:>10.2f} {args.vectors:>10}")
+    for nprobe in args.nprobe:
+        hits = scanned = 0
+        start = time.perf_counter()
+        results = [index.search(q, args.k, nprobe) for q in queries]
+        elapsed = (time.perf_counter() - start) / args.queries * 1000
+        for (found, count), expected in zip(results, truth):
+            hits += len({int(doc_id, 16) for doc_id, _ in found} & expected)
+            scanned += count
+        print(f"{nprobe:>8} {hits / (args.k * args.queries):>10.3f} {elapsed:>10.2f} {scanned // args.queries:>10}")
+
+    extra = make_vectors(rng, 1000, args.dim, args.clusters, args.spread)
+    extra_ids = [f"{args.vectors + i:024x}" for i in range(1000)]
+    start = time.perf_counter()
+    for doc_id, vector in zip(extra_ids, extra):
+        index.add([doc_id], vector)
+    insert_us = (time.perf_counter() - start) / 1000 * 1e6
+    start = time.perf_counter()
+    index.remove(extra_ids)
+    delete_us = (time.perf_counter() - start) / 1000 * 1e6
+    print(f"insert {insert_us:.0f} us, delete {delete_us:.0f} us per vector")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "candidates.ivf.npz")
+        start = time.perf_counter()
+        index.save(path)
+        saved = time.perf_counter() - start
+        start = time.perf_counter()
+        IVFIndex.load(path)
+        loaded = time.perf_counter() - start
+    print(f"save {saved:.2f}s, load {loaded:.2f}s (vs {build:.2f}s to rebuild)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Typeahead lookups on sorted-array prefix ranges at a million entries.
+
+Builds a prefix index over synthetic person names with Zipf-like
+frequencies, then times warm completions for prefixes of one to five
+characters (short prefixes match the widest ranges) and incremental
+inserts of unseen names. Run from backend/:
+
+    python -m benchmarks.bench_autocomplete --entries 1000000
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from app.services.autocomplete import PrefixIndex, normalize_text
+
+SYLLABLES = ["an", "bel", "car", "da", "el", "fi", "gor", "ha", "is", "jo", "ka", "li", "mar", "no", "ol",
+             "pe", "qui", "ro", "sa", "ti", "ul", "vi", "wen", "xa", "yo", "zu"]
+
+
+def make_name(rng: random.Random) -> str:
+    def word():
+        return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+    return f"{word()} {word()}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(29)
+    counts, display = {}, {}
+    while len(counts) < args.entries:
+        name = make_name(rng)
+        normalized = normalize_text(name)
+        counts[normalized] = counts.get(normalized, 0) + max(1, int(1000 / rng.randint(1, 1000)))
+        display.setdefault(normalized, name)
+
+    start = time.perf_counter()
+    index = PrefixIndex.build(counts, display)
+    print(f"{len(index)} entries, {len(index._keys)} prefix keys, built in {time.perf_counter() - start:.2f}s")
+
+    names = list(display.values())
+    for length in (1, 2, 3, 5):
+        # Either word of a name can be typed first
+        prefixes = [rng.choice(rng.choice(names).split())[:length] for _ in range(args.queries)]
+        timings = []
+        for prefix in prefixes:
+            start = time.perf_counter()
+            index.complete(prefix, args.limit)
+            timings.append(time.perf_counter() - start)
+        timings = np.array(timings) * 1000
+        print(f"prefix length {length}: mean {timings.mean():.3f} ms, p99 {np.percentile(timings, 99):.3f} ms, "
+              f"max {timings.max():.3f} ms")
+
+    fresh = [make_name(rng) + " Jr" for _ in range(5000)]
+    start = time.perf_counter()
+    for name in fresh:
+        index.add(name)
+    print(f"insert {(time.perf_counter() - start) / len(fresh) * 1e6:.1f} us per new entry")
+    timings = []
+    for name in fresh[:args.queries]:
+        start = time.perf_counter()
+        assert any(text == name for text, _ in index.complete(name, args.limit))
+        timings.append(time.perf_counter() - start)
+    print(f"lookup with pending inserts: mean {np.mean(timings) * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
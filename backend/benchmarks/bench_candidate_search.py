@@ -0,0 +1,104 @@
+"""
+Full-text candidate search on the BM25 index versus an unanchored regex scan.
+
+Indexes synthetic candidates (name, email, summary, skills, experience) and
+times ranked queries against a per-candidate case-insensitive regex over the
+same fields, which is what the unanchored $regex $or query costs on the
+server before it even ranks anything. Run from backend/:
+
+    python -m benchmarks.bench_candidate_search --candidates 100000
+"""
+import argparse
+import random
+import re
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.services.candidate_search import CANDIDATE_FIELDS, candidate_fields
+from app.services.text_index import TextIndex, highlight_fields
+from benchmarks.bench_matching import make_candidates
+from benchmarks.corpus import FIRST_NAMES, LAST_NAMES, SKILLS, COMPANIES
+
+SUMMARIES = [
+    "Engineer with a track record of shipping reliable distributed systems.",
+    "Backend developer focused on APIs, data pipelines and observability.",
+    "Full-stack engineer who enjoys mentoring and building developer tooling.",
+    "Data scientist turning messy data into forecasting and recommendation models.",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--candidates", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--size", type=int, default=20, help="Results per page")
+    args = parser.parse_args()
+
+    rng = random.Random(19)
+    candidates = []
+    for candidate_id, skills, experience in make_candidates(rng, args.candidates):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        candidates.append(SimpleNamespace(
+            id=candidate_id,
+            full_name=f"{first} {last}",
+            email=f"{first.lower()}.{last.lower()}{rng.randint(1, 999)}@example.com",
+            summary=rng.choice(SUMMARIES),
+            skills=skills,
+            experience=experience
+        ))
+
+    start = time.perf_counter()
+    index = TextIndex.build(((c.id, candidate_fields(c)) for c in candidates), CANDIDATE_FIELDS)
+    build = time.perf_counter() - start
+    stats = index.stats()
+    print(f"{args.candidates} candidates, {stats['terms']} terms, {stats['postings']} postings, indexed in {build:.2f}s")
+
+    pool = SKILLS + FIRST_NAMES + LAST_NAMES + COMPANIES + ["forecasting", "kubernetes docker", "python fastapi"]
+    queries = [rng.choice(pool) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    index_totals = []
+    for query in queries:
+        page, total = index.search(query, args.size)
+        index_totals.append(total)
+    index_ms = (time.perf_counter() - start) / args.queries * 1000
+
+    by_id = {c.id: c for c in candidates}
+    start = time.perf_counter()
+    for query in queries:
+        page, _ = index.search(query, args.size)
+        terms = index.query_terms(query)
+        for candidate_id, _ in page:
+            highlight_fields(candidate_fields(by_id[candidate_id]), terms)
+    highlight_ms = (time.perf_counter() - start) / args.queries * 1000
+
+    # The scan gets each candidate's text pre-joined, so it only pays for matching
+    texts = [
+        (c.id, "\n".join(text for value in candidate_fields(c).values() if value
+                          for text in ([value] if isinstance(value, str) else value) if text))
+        for c in candidates
+    ]
+    start = time.perf_counter()
+    scan_totals = []
+    for query in queries:
+        pattern = re.compile(re.escape(query), re.IGNORECASE)
+        scan_totals.append(sum(1 for _, text in texts if pattern.search(text)))
+    scan_ms = (time.perf_counter() - start) / args.queries * 1000
+
+    extra = [SimpleNamespace(**{**vars(c), "id": f"x{i}"}) for i, c in enumerate(candidates[:1000])]
+    start = time.perf_counter()
+    for c in extra:
+        index.add(c.id, candidate_fields(c))
+    add_us = (time.perf_counter() - start) / len(extra) * 1e6
+
+    print(f"{'bm25 index':20} {index_ms:>9.2f} ms/query  (mean {np.mean(index_totals):.0f} hits, ranked)")
+    print(f"{'bm25 + highlights':20} {highlight_ms:>9.2f} ms/query")
+    print(f"{'regex scan':20} {scan_ms:>9.2f} ms/query  (mean {np.mean(scan_totals):.0f} hits, unranked, "
+          f"{scan_ms / index_ms:.0f}x slower)")
+    print(f"insert {add_us:.1f} us per candidate")
+
+
+if __name__ == "__main__":
+    main()
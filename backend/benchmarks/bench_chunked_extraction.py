@@ -0,0 +1,78 @@
+"""
+Single-prompt versus section-chunked LLM extraction on long resumes.
+
+Runs against the fake Mistral server with latency that grows with prompt
+length, the way model prefill does. Reports end-to-end and worst per-call
+latency, and checks that the merged chunked result has the same skills and
+jobs as the single-prompt result. Run from backend/:
+
+    python -m benchmarks.bench_chunked_extraction --jobs 80 --token-latency 0.0005
+"""
+import argparse
+import asyncio
+import logging
+import random
+import time
+
+from app.config import settings
+from app.services.llm_client import MistralClientManager
+from app.services.resume_chunker import chunk_resume, estimate_tokens
+from app.services.resume_extractor import ResumeExtractor
+from benchmarks.corpus import make_resume_text
+from benchmarks.fake_mistral import FakeMistralState, running_fake_mistral
+
+
+def make_long_cv(rng: random.Random, jobs: int) -> str:
+    """A long academic-style CV: many positions plus a publications list"""
+    text = make_resume_text(rng, experience_entries=jobs)
+    publications = [f"[{i}] Results on scalable systems, Journal of Computing, {2000 + i % 20}" for i in range(jobs * 2)]
+    return text + "\n\nPublications\n" + "\n".join(publications)
+
+
+async def timed_extract(extractor: ResumeExtractor, state: FakeMistralState, text: str):
+    calls_before = state.chat_requests
+    start = time.perf_counter()
+    result, source = await extractor.extract_with_source_async(text, 1)
+    return result, source, time.perf_counter() - start, state.chat_requests - calls_before
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--jobs", type=int, default=80, help="Positions on the CV")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fixed seconds per API call")
+    parser.add_argument("--token-latency", type=float, default=0.0005, help="Extra seconds per prompt token")
+    parser.add_argument("--chunk-tokens", type=int, default=settings.LLM_CHUNK_TOKENS)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    text = make_long_cv(random.Random(5), args.jobs)
+    state = FakeMistralState(latency=args.latency, token_latency=args.token_latency)
+
+    async with running_fake_mistral(state) as url:
+        manager = MistralClientManager(api_key="fake", server_url=url)
+        extractor = ResumeExtractor(client_manager=manager)
+        try:
+            settings.LLM_CHUNK_TOKENS = 10 ** 9
+            single, single_source, single_time, single_calls = await timed_extract(extractor, state, text)
+            settings.LLM_CHUNK_TOKENS = args.chunk_tokens
+            chunks = chunk_resume(text, args.chunk_tokens)
+            chunked, chunked_source, chunked_time, chunked_calls = await timed_extract(extractor, state, text)
+        finally:
+            await manager.aclose()
+
+    assert single_source == chunked_source == "llm"
+    assert sorted(s.name for s in single.skills) == sorted(s.name for s in chunked.skills), "skills differ"
+    assert {(e.company, e.position, e.start_date) for e in single.experience} == \
+        {(e.company, e.position, e.start_date) for e in chunked.experience}, "experience differs"
+    assert chunked.full_name == single.full_name and chunked.email == single.email
+
+    largest = max(estimate_tokens(chunk) for chunk in chunks)
+    print(f"CV: ~{estimate_tokens(text)} tokens, {args.jobs} positions, {len(single.experience)} unique jobs extracted")
+    print(f"{'':12} {'calls':>6} {'largest chunk':>15} {'time (s)':>9}")
+    print(f"{'single':12} {single_calls:>6} {estimate_tokens(text):>15} {single_time:>9.2f}")
+    print(f"{'chunked':12} {chunked_calls:>6} {largest:>15} {chunked_time:>9.2f}")
+    print(f"speedup {single_time / chunked_time:.1f}x, merged result matches single-prompt result")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,75 @@
+"""
+Cold start from the memory-mapped embedding store versus re-encoding the corpus.
+
+Encodes synthetic candidates once into a store in a temporary directory, then
+compares reopening it (map the files, build the ID index, read every vector)
+with embedding all texts again, which is what a store-less service pays on
+every start. Also times incremental upserts and deletes. Run from backend/:
+
+    python -m benchmarks.bench_embedding_store --candidates 20000
+"""
+import argparse
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from app.services.embedding_store import EmbeddingStore, HashedNgramEmbedder
+from benchmarks.corpus import make_resume_text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--candidates", type=int, default=20_000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--updates", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(12)
+    texts = [make_resume_text(rng, experience_entries=2) for _ in range(args.candidates)]
+    ids = [f"{i:024x}" for i in range(args.candidates)]
+    embedder = HashedNgramEmbedder(args.dim)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = f"{directory}/candidates"
+        start = time.perf_counter()
+        vectors = embedder.embed(texts)
+        encode = time.perf_counter() - start
+
+        store = EmbeddingStore(path, embedder.name, embedder.dim)
+        start = time.perf_counter()
+        store.upsert(ids, vectors)
+        write = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reopened = EmbeddingStore(path, embedder.name, embedder.dim)
+        reopened.capacity
+        mapped = time.perf_counter() - start
+        start = time.perf_counter()
+        stored_ids, stored = reopened.snapshot()
+        loaded = time.perf_counter() - start
+        assert stored_ids == ids and np.allclose(stored, vectors)
+
+        new_ids = [f"{args.candidates + i:024x}" for i in range(args.updates)]
+        new_vectors = embedder.embed(texts[:args.updates])
+        start = time.perf_counter()
+        for doc_id, vector in zip(new_ids, new_vectors):
+            reopened.upsert([doc_id], vector[None, :])
+        upsert = (time.perf_counter() - start) / args.updates
+        start = time.perf_counter()
+        for doc_id in new_ids:
+            reopened.delete([doc_id])
+        delete = (time.perf_counter() - start) / args.updates
+
+    print(f"{args.candidates} candidates, {args.dim}-d vectors ({embedder.name})")
+    print(f"re-encode corpus      {encode * 1000:>10.1f} ms")
+    print(f"initial store write   {write * 1000:>10.1f} ms")
+    print(f"cold start: map files {mapped * 1000:>10.2f} ms")
+    print(f"cold start: ids+read  {loaded * 1000:>10.1f} ms")
+    print(f"single upsert         {upsert * 1000:>10.3f} ms")
+    print(f"single delete         {delete * 1000:>10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
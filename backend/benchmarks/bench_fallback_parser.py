@@ -0,0 +1,249 @@
+"""
+Single-pass fallback parser versus the original eight-pass keyword scanner.
+
+The fallback parser runs for every resume while Mistral is unavailable, so its
+cost matters on large inputs. The baseline below is the original
+``_fallback_extraction`` and its ``_extract_*`` helpers, copied verbatim. Run
+from backend/:
+
+    python -m benchmarks.bench_fallback_parser --sizes 4 40 400
+"""
+import argparse
+import logging
+import random
+import time
+from typing import List
+
+from app.models.candidate import ResumeExtraction, Skill, Experience, Education
+from app.services.fallback_parser import parse_resume_text
+from benchmarks.corpus import make_resume_text
+
+logger = logging.getLogger(__name__)
+
+
+class LegacyFallbackParser:
+    """The pre-rewrite fallback parser"""
+
+    def _fallback_extraction(self, extracted_text: str, num_pages: int) -> ResumeExtraction:
+        """Fallback to basic parsing if LLM fails"""
+        logger.info("Using fallback extraction method")
+        lines = extracted_text.split('\n')
+        logger.info(f"Processing {len(lines)} lines of text")
+        
+        # Basic extraction logic (original implementation)
+        full_name = self._extract_name(lines)
+        email = self._extract_email(lines)
+        phone = self._extract_phone(lines)
+        location = self._extract_location(lines)
+        summary = self._extract_summary(lines)
+        skills = self._extract_skills(lines)
+        experience = self._extract_experience(lines)
+        education = self._extract_education(lines)
+        
+        logger.info("Fallback extraction results:")
+        logger.info(f"  - Name: {full_name}")
+        logger.info(f"  - Email: {email}")
+        logger.info(f"  - Phone: {phone}")
+        logger.info(f"  - Skills count: {len(skills)}")
+        logger.info(f"  - Experience count: {len(experience)}")
+        logger.info(f"  - Education count: {len(education)}")
+        
+        return ResumeExtraction(
+            full_name=full_name or "Unknown",
+            email=email,
+            phone=phone,
+            location=location,
+            summary=summary,
+            skills=skills,
+            experience=experience,
+            education=education
+        )
+    
+    def _extract_name(self, lines: List[str]) -> str:
+        """Extract candidate name from first few lines"""
+        logger.info("Extracting name from first 5 lines")
+        for i, line in enumerate(lines[:5]):
+            line = line.strip()
+            logger.info(f"  Line {i+1}: '{line}'")
+            if line and len(line.split()) <= 4:  # Likely a name
+                logger.info(f"  Found name: '{line}'")
+                return line
+        logger.warning("No name found in first 5 lines")
+        return "Unknown"
+    
+    def _extract_email(self, lines: List[str]) -> str:
+        """Extract email address"""
+        import re
+        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+        for line in lines:
+            emails = re.findall(email_pattern, line)
+            if emails:
+                logger.info(f"Found email: {emails[0]}")
+                return emails[0]
+        logger.warning("No email found")
+        return None
+    
+    def _extract_phone(self, lines: List[str]) -> str:
+        """Extract phone number"""
+        import re
+        phone_pattern = r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
+        for line in lines:
+            phones = re.findall(phone_pattern, line)
+            if phones:
+                logger.info(f"Found phone: {phones[0]}")
+                return phones[0]
+        logger.warning("No phone found")
+        return None
+    
+    def _extract_location(self, lines: List[str]) -> str:
+        """Extract location/city"""
+        location_keywords = ['location', 'city', 'address', 'based in']
+        for line in lines:
+            line_lower = line.lower()
+            for keyword in location_keywords:
+                if keyword in line_lower:
+                    logger.info(f"Found location: '{line.strip()}'")
+                    return line.strip()
+        logger.warning("No location found")
+        return None
+    
+    def _extract_summary(self, lines: List[str]) -> str:
+        """Extract professional summary"""
+        summary_keywords = ['summary', 'objective', 'profile', 'about']
+        for i, line in enumerate(lines):
+            line_lower = line.lower()
+            for keyword in summary_keywords:
+                if keyword in line_lower:
+                    logger.info(f"Found summary section at line {i+1}")
+                    # Get next few lines as summary
+                    summary_lines = []
+                    for j in range(i+1, min(i+5, len(lines))):
+                        if lines[j].strip():
+                            summary_lines.append(lines[j].strip())
+                    summary = ' '.join(summary_lines)
+                    logger.info(f"Summary: {summary[:100]}...")
+                    return summary
+        logger.warning("No summary found")
+        return None
+    
+    def _extract_skills(self, lines: List[str]) -> List[Skill]:
+        """Extract skills from resume"""
+        skills = []
+        skill_keywords = ['skills', 'technologies', 'programming', 'languages', 'tools']
+        
+        for i, line in enumerate(lines):
+            line_lower = line.lower()
+            for keyword in skill_keywords:
+                if keyword in line_lower:
+                    logger.info(f"Found skills section at line {i+1}")
+                    # Extract skills from next few lines
+                    for j in range(i+1, min(i+10, len(lines))):
+                        skill_line = lines[j].strip()
+                        if skill_line and not any(kw in skill_line.lower() for kw in ['experience', 'education', 'work']):
+                            # Split by common separators
+                            skill_items = skill_line.replace(',', ' ').replace(';', ' ').split()
+                            for skill in skill_items:
+                                if len(skill) > 2:  # Filter out very short items
+                                    skills.append(Skill(name=skill))
+                                    logger.info(f"  Found skill: {skill}")
+        logger.info(f"Total skills found: {len(skills)}")
+        return skills
+    
+    def _extract_experience(self, lines: List[str]) -> List[Experience]:
+        """Extract work experience"""
+        experience = []
+        exp_keywords = ['experience', 'work history', 'employment']
+        
+        for i, line in enumerate(lines):
+            line_lower = line.lower()
+            for keyword in exp_keywords:
+                if keyword in line_lower:
+                    logger.info(f"Found experience section at line {i+1}")
+                    # Simple extraction - you might want to enhance this
+                    for j in range(i+1, min(i+20, len(lines))):
+                        exp_line = lines[j].strip()
+                        if exp_line and len(exp_line) > 10:
+                            # Basic parsing - you can enhance this
+                            exp = Experience(
+                                company="Company Name",
+                                position="Position",
+                                start_date="2020",
+                                end_date="Present",
+                                description=exp_line
+                            )
+                            experience.append(exp)
+                            logger.info(f"  Found experience: {exp_line[:50]}...")
+        logger.info(f"Total experience entries found: {len(experience)}")
+        return experience
+    
+    def _extract_education(self, lines: List[str]) -> List[Education]:
+        """Extract education information"""
+        education = []
+        edu_keywords = ['education', 'academic', 'degree', 'university']
+        
+        for i, line in enumerate(lines):
+            line_lower = line.lower()
+            for keyword in edu_keywords:
+                if keyword in line_lower:
+                    logger.info(f"Found education section at line {i+1}")
+                    # Simple extraction - you might want to enhance this
+                    for j in range(i+1, min(i+10, len(lines))):
+                        edu_line = lines[j].strip()
+                        if edu_line and len(edu_line) > 10:
+                            edu = Education(
+                                institution="Institution",
+                                degree="Degree",
+                                field_of_study="Field of Study"
+                            )
+                            education.append(edu)
+                            logger.info(f"  Found education: {edu_line[:50]}...")
+        logger.info(f"Total education entries found: {len(education)}")
+        return education
+
+
+def make_large_resume(rng: random.Random, jobs: int) -> str:
+    """A corpus resume with ``jobs`` positions, each with keyword-heavy bullet points"""
+    lines = make_resume_text(rng, experience_entries=jobs).split("\n")
+    out = []
+    for line in lines:
+        out.append(line)
+        if " at " in line and "(" in line:
+            out.append("Gained experience with cloud tools and programming languages.")
+            out.append("Mentored university interns on work practices.")
+    return "\n".join(out)
+
+
+def best_of(repeat: int, func, *args) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 40, 400], help="Jobs per resume")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    legacy = LegacyFallbackParser()
+    rng = random.Random(9)
+    print(f"{'jobs':>5} {'lines':>6} {'legacy (ms)':>12} {'new (ms)':>9} {'speedup':>8} {'legacy entries':>15} {'new entries':>12}")
+    for jobs in args.sizes:
+        text = make_large_resume(rng, jobs)
+        legacy_time = best_of(args.repeat, legacy._fallback_extraction, text, 1)
+        new_time = best_of(args.repeat, parse_resume_text, text)
+        old, new = legacy._fallback_extraction(text, 1), parse_resume_text(text)
+        old_entries = len(old.skills) + len(old.experience) + len(old.education)
+        new_entries = len(new.skills) + len(new.experience) + len(new.education)
+        print(
+            f"{jobs:>5} {text.count(chr(10)) + 1:>6} {legacy_time * 1000:>12.2f} {new_time * 1000:>9.2f} "
+            f"{legacy_time / new_time:>7.1f}x {old_entries:>15} {new_entries:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
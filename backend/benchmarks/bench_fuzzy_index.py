@@ -0,0 +1,108 @@
+"""
+Fuzzy candidate lookup on trigram postings over a synthetic noisy-name corpus.
+
+Indexes candidate names garbled the way PDF text extraction garbles them
+(ligatures, hyphenated line breaks, soft hyphens, OCR confusions, dropped
+or doubled letters), queries with the clean names, and reports recall@10
+and latency against a brute-force similarity scan over every value. Run
+from backend/:
+
+    python -m benchmarks.bench_fuzzy_index --candidates 100000
+"""
+import argparse
+import difflib
+import random
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.services.fuzzy_index import CandidateFuzzyIndex, TrigramIndex, normalize_noisy
+from benchmarks.bench_autocomplete import make_name
+
+OCR_CONFUSIONS = [("m", "rn"), ("l", "1"), ("o", "0"), ("e", "c"), ("i", "l"), ("cl", "d")]
+LIGATURES = [("fi", "ﬁ"), ("fl", "ﬂ"), ("ff", "ﬀ")]
+
+
+def garble(rng: random.Random, name: str) -> str:
+    """One to three extraction artifacts applied to a name"""
+    for _ in range(rng.randint(1, 3)):
+        kind = rng.randrange(6)
+        if kind == 0:
+            for plain, ligature in LIGATURES:
+                name = name.replace(plain, ligature)
+            name = name.replace("a", "á", 1)
+        elif kind == 1 and len(name) > 6:
+            cut = rng.randrange(2, len(name) - 2)
+            name = f"{name[:cut]}-\n{name[cut:]}" if rng.random() < 0.5 else f"{name[:cut]}­{name[cut:]}"
+        elif kind == 2:
+            plain, noisy = rng.choice(OCR_CONFUSIONS)
+            name = name.replace(plain, noisy, 1)
+        elif kind == 3 and len(name) > 4:
+            i = rng.randrange(1, len(name) - 1)
+            name = name[:i] + name[i + 1:]
+        elif kind == 4:
+            i = rng.randrange(len(name))
+            name = name[:i] + name[i] + name[i:]
+        else:
+            name = name.upper() if rng.random() < 0.5 else name.replace(" ", "  ")
+    return name
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--candidates", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--scan-queries", type=int, default=20, help="Queries for the (slow) brute-force scan")
+    args = parser.parse_args()
+
+    rng = random.Random(31)
+    # Seed "fi"/"fl" into the syllable names so ligature artifacts have something to replace
+    clean = [make_name(rng).replace("ka", "fi", 1).replace("li", "fl", 1) for _ in range(args.candidates)]
+    candidates = [
+        SimpleNamespace(id=f"c{i}", full_name=garble(rng, name), email=None, skills=[])
+        for i, name in enumerate(clean)
+    ]
+
+    index = CandidateFuzzyIndex()
+    start = time.perf_counter()
+    index.add(candidates)
+    print(f"{args.candidates} noisy names indexed in {time.perf_counter() - start:.2f}s")
+
+    sample = rng.sample(range(args.candidates), args.queries)
+    hits, timings = 0, []
+    for i in sample:
+        start = time.perf_counter()
+        found = index.search(clean[i], ["name"], limit=10)
+        timings.append(time.perf_counter() - start)
+        hits += any(cid == f"c{i}" for cid, *_ in found)
+    timings = np.array(timings) * 1000
+    print(f"{'trigram index':22} recall@10 {hits / args.queries:.3f}  mean {timings.mean():.2f} ms  "
+          f"p99 {np.percentile(timings, 99):.2f} ms")
+
+    # Same postings without the extraction-aware normalization: casefold only
+    raw = TrigramIndex.build(list(dict.fromkeys(" ".join(c.full_name.casefold().split()) for c in candidates)))
+    owners = {" ".join(c.full_name.casefold().split()): c.id for c in candidates}
+    raw_hits = 0
+    for i in sample:
+        ids, _ = raw.search(clean[i].casefold())
+        raw_hits += any(owners[raw.values[v]] == f"c{i}" for v in ids[:10].tolist())
+    print(f"{'without normalization':22} recall@10 {raw_hits / args.queries:.3f}")
+
+    values = [(c.id, normalize_noisy(c.full_name)) for c in candidates]
+    start = time.perf_counter()
+    for i in sample[:args.scan_queries]:
+        query = normalize_noisy(clean[i])
+        matcher = difflib.SequenceMatcher(None, query)
+        scored = []
+        for cid, value in values:
+            matcher.set_seq2(value)
+            if matcher.real_quick_ratio() >= 0.6 and matcher.quick_ratio() >= 0.6:
+                scored.append((matcher.ratio(), cid))
+        sorted(scored, reverse=True)[:10]
+    scan_ms = (time.perf_counter() - start) / args.scan_queries * 1000
+    print(f"{'brute-force scan':22} mean {scan_ms:.2f} ms ({scan_ms / timings.mean():.0f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
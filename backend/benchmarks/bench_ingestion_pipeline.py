@@ -0,0 +1,105 @@
+"""
+Throughput of the staged ingestion pipeline versus LLM concurrency.
+
+The LLM is simulated with a fixed async latency and MongoDB with in-memory
+stubs, so the numbers isolate the pipeline's scheduling. Run from backend/:
+
+    python -m benchmarks.bench_ingestion_pipeline --files 50 --latency 0.5
+"""
+import argparse
+import asyncio
+import hashlib
+import logging
+import os
+import random
+import tempfile
+import time
+
+from app.models.candidate import ResumeExtraction
+from app.schemas.ingestion import SpooledUpload
+from app.services.ingestion_pipeline import IngestionPipeline
+from app.services.metrics import stage_seconds
+from benchmarks.corpus import make_resume_pdf
+
+
+class FakeExtractor:
+    """Stands in for ResumeExtractor with a fixed LLM round-trip latency"""
+
+    def __init__(self, latency: float, upload_dir: str):
+        self.latency = latency
+        self.upload_dir = upload_dir
+
+    async def extract_with_source_async(self, extracted_text: str, num_pages: int):
+        await asyncio.sleep(self.latency)
+        return ResumeExtraction(full_name=extracted_text.split("\n", 1)[0]), "llm"
+
+
+class InMemoryPipeline(IngestionPipeline):
+    """Pipeline with MongoDB replaced by in-memory stubs"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.inserted = []
+
+    async def _find_existing(self, content_hashes):
+        return {}
+
+    async def _insert_candidates(self, candidates):
+        self.inserted.extend(candidates)
+
+    def _build_candidate(self, outcome, resume_data, file_path, uploaded_by, job_id):
+        return resume_data
+
+
+def store(pdfs, upload_dir: str):
+    uploads = []
+    for i, pdf in enumerate(pdfs):
+        content_hash = hashlib.sha256(pdf).hexdigest()
+        path = os.path.join(upload_dir, f"{content_hash}.pdf")
+        with open(path, "wb") as f:
+            f.write(pdf)
+        uploads.append(SpooledUpload(filename=f"resume_{i}.pdf", path=path, content_hash=content_hash, size=len(pdf)))
+    return uploads
+
+
+async def run_once(pdfs, concurrency: int, latency: float, upload_dir: str) -> float:
+    pipeline = InMemoryPipeline(FakeExtractor(latency, upload_dir), llm_concurrency=concurrency)
+    try:
+        # Warm the worker processes so pool start-up is not measured
+        await pipeline.pdf_engine.warm_up()
+        uploads = store(pdfs, upload_dir)
+        start = time.perf_counter()
+        result = await pipeline.run(uploads, "bench@example.com")
+        elapsed = time.perf_counter() - start
+        assert result.succeeded == len(pdfs), result.failed_files
+        return elapsed
+    finally:
+        pipeline.shutdown()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.5, help="Simulated LLM latency in seconds")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    rng = random.Random(42)
+    pdfs = [make_resume_pdf(rng, pages=2) for _ in range(args.files)]
+
+    print(f"{args.files} resumes, simulated LLM latency {args.latency:.2f}s")
+    print(f"{'concurrency':>12} {'seconds':>9} {'resumes/s':>10}")
+    with tempfile.TemporaryDirectory() as upload_dir:
+        for concurrency in args.concurrency:
+            elapsed = await run_once(pdfs, concurrency, args.latency, upload_dir)
+            print(f"{concurrency:>12} {elapsed:>9.2f} {args.files / elapsed:>10.1f}")
+
+    # Where the time went, across all runs, from the ingestion_stage_seconds histogram
+    print(f"\n{'stage':>14} {'outcome':>8} {'count':>6} {'mean (ms)':>10}")
+    for (stage, outcome), (count, total) in sorted(stage_seconds.snapshot().items()):
+        print(f"{stage:>14} {outcome:>8} {count:>6} {total / count * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,64 @@
+"""
+Ranked job search on the stemmed BM25 index versus three case-insensitive regexes.
+
+For growing numbers of synthetic postings, times a page of ranked results
+from the index against scanning title, company and description with a
+regex each, which is what the $regex $or filter plus its count() do on the
+server. Run from backend/:
+
+    python -m benchmarks.bench_job_search --jobs 5000 20000 50000
+"""
+import argparse
+import random
+import re
+import time
+from types import SimpleNamespace
+
+from app.services.job_search import JOB_FIELDS, job_fields
+from app.services.text_index import TextIndex, analyze_stemmed
+from benchmarks.bench_matching import make_job
+from benchmarks.corpus import COMPANIES, SKILLS
+
+QUERIES = ["python", "developer", "engineers", "data platform", "kubernetes", "Globex", "managing", "react developer"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--jobs", type=int, nargs="+", default=[5000, 20000, 50000])
+    parser.add_argument("--size", type=int, default=10, help="Results per page")
+    args = parser.parse_args()
+
+    rng = random.Random(23)
+    print(f"{'jobs':>8} {'build s':>8} {'index ms':>9} {'regex ms':>9} {'speedup':>8}")
+    for count in args.jobs:
+        jobs = []
+        for i in range(count):
+            title, requirements, description = make_job(rng)
+            jobs.append(SimpleNamespace(
+                id=f"j{i}",
+                title=f"{rng.choice(['Senior', 'Junior', 'Lead', ''])} {title}".strip(),
+                company=rng.choice(COMPANIES),
+                description=f"{description} " + " ".join(rng.sample(SKILLS, 6)) * 3,
+                requirements=requirements
+            ))
+
+        start = time.perf_counter()
+        index = TextIndex.build(((j.id, job_fields(j)) for j in jobs), JOB_FIELDS, analyze_stemmed)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for query in QUERIES:
+            index.search(query, args.size)
+        index_ms = (time.perf_counter() - start) / len(QUERIES) * 1000
+
+        start = time.perf_counter()
+        for query in QUERIES:
+            pattern = re.compile(re.escape(query), re.IGNORECASE)
+            [j for j in jobs if pattern.search(j.title) or pattern.search(j.company) or pattern.search(j.description)]
+        regex_ms = (time.perf_counter() - start) / len(QUERIES) * 1000
+
+        print(f"{count:>8} {build:>8.2f} {index_ms:>9.2f} {regex_ms:>9.2f} {regex_ms / index_ms:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+API calls and latency with local JSON recovery versus the old parse-then-retry flow.
+
+The fake Mistral server returns a share of malformed answers (code fences,
+surrounding prose, truncation, wrong field types). The baseline is the
+pre-recovery flow: ``chat.parse``, and on any error a second full
+``chat.complete`` whose content must be strict JSON. Run from backend/:
+
+    python -m benchmarks.bench_json_recovery --resumes 60 --malformed-rate 0.3
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+
+from app.config import settings
+from app.models.candidate import ResumeExtraction
+from app.services.llm_client import MistralClientManager
+from app.services.resume_extractor import ResumeExtractor
+from benchmarks.corpus import make_resume_text
+from benchmarks.fake_mistral import FakeMistralState, running_fake_mistral
+
+
+async def legacy_extract(extractor: ResumeExtractor, client, text: str) -> str:
+    """The original two-call flow; returns "llm" or "fallback\""""
+    messages = extractor._build_messages(extractor._build_prompt(text))
+    try:
+        try:
+            response = await client.chat.parse_async(
+                model=settings.MISTRAL_MODEL,
+                messages=messages,
+                response_format=ResumeExtraction,
+                temperature=0
+            )
+            content = response.choices[0].message.content
+            if isinstance(content, str):
+                ResumeExtraction(**json.loads(content))
+        except Exception:
+            response = await client.chat.complete_async(
+                model=settings.MISTRAL_MODEL,
+                messages=messages,
+                temperature=0
+            )
+            ResumeExtraction(**json.loads(response.choices[0].message.content))
+        return "llm"
+    except Exception:
+        return "fallback"
+
+
+async def _source(extraction):
+    _, source = await extraction
+    return source
+
+
+async def run(label, state, texts, concurrency, extract):
+    semaphore = asyncio.Semaphore(concurrency)
+    sources = []
+
+    async def one(text):
+        async with semaphore:
+            sources.append(await extract(text))
+
+    calls_before = state.chat_requests
+    start = time.perf_counter()
+    await asyncio.gather(*(one(text) for text in texts))
+    elapsed = time.perf_counter() - start
+    calls = state.chat_requests - calls_before
+    print(f"{label:10} {calls:>6} {calls / len(texts):>10.2f} {sources.count('fallback'):>9} {elapsed:>9.2f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--resumes", type=int, default=60)
+    parser.add_argument("--malformed-rate", type=float, default=0.3)
+    parser.add_argument("--latency", type=float, default=0.1, help="Seconds per API call")
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(3)
+    texts = [make_resume_text(rng) for _ in range(args.resumes)]
+    state = FakeMistralState(latency=args.latency, malformed_rate=args.malformed_rate)
+
+    async with running_fake_mistral(state) as url:
+        manager = MistralClientManager(api_key="fake", server_url=url)
+        extractor = ResumeExtractor(client_manager=manager)
+        try:
+            print(f"{args.resumes} resumes, {args.malformed_rate:.0%} malformed answers")
+            print(f"{'':10} {'calls':>6} {'per resume':>10} {'fallback':>9} {'time (s)':>9}")
+            await run("legacy", state, texts, args.concurrency,
+                      lambda text: legacy_extract(extractor, manager.client, text))
+            await run("recovery", state, texts, args.concurrency,
+                      lambda text: _source(extractor.extract_with_source_async(text, 1)))
+        finally:
+            await manager.aclose()
+    print(f"recovery counters: {extractor.json_recovery.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+"""
+Extraction latency through the Mistral client manager while the API goes down and recovers.
+
+Starts the fake Mistral server in-process and runs three phases of concurrent
+extractions: healthy, outage, recovered. Without the circuit breaker every
+extraction in the outage phase pays for a failed request; with it, only the
+first few do and the rest go straight to the fallback parser. Run from backend/:
+
+    python -m benchmarks.bench_llm_breaker --resumes 40 --latency 0.2
+"""
+import argparse
+import asyncio
+import logging
+import random
+import time
+
+from app.services.llm_client import CircuitBreaker, MistralClientManager
+from app.services.resume_extractor import ResumeExtractor
+from benchmarks.corpus import make_resume_text
+from benchmarks.fake_mistral import FakeMistralState, running_fake_mistral
+
+
+async def run_phase(extractor: ResumeExtractor, texts, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    sources = []
+
+    async def one(text):
+        async with semaphore:
+            _, source = await extractor.extract_with_source_async(text, 1)
+            sources.append(source)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(text) for text in texts))
+    return time.perf_counter() - start, sources.count("llm"), sources.count("fallback")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--resumes", type=int, default=40, help="Extractions per phase")
+    parser.add_argument("--latency", type=float, default=0.2, help="Fake API latency in seconds")
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(11)
+    texts = [make_resume_text(rng) for _ in range(args.resumes)]
+
+    state = FakeMistralState(latency=args.latency)
+    async with running_fake_mistral(state) as url:
+        manager = MistralClientManager(
+            api_key="fake",
+            server_url=url,
+            breaker=CircuitBreaker(failure_threshold=3, reset_timeout=1.0)
+        )
+        extractor = ResumeExtractor(client_manager=manager)
+        try:
+            print(f"{'phase':10} {'time (s)':>9} {'llm':>5} {'fallback':>9} {'API calls':>10} {'circuit':>10}")
+            for phase, outage in (("healthy", False), ("outage", True), ("recovered", False)):
+                state.outage = outage
+                if phase == "recovered":
+                    # Let the circuit reach half-open, then the probe closes it
+                    await asyncio.sleep(manager.breaker.reset_timeout)
+                    await manager.probe()
+                calls_before = state.requests
+                elapsed, llm, fallback = await run_phase(extractor, texts, args.concurrency)
+                print(f"{phase:10} {elapsed:>9.2f} {llm:>5} {fallback:>9} {state.requests - calls_before:>10} {manager.breaker.state:>10}")
+        finally:
+            await manager.aclose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+"""
+Incremental match updates versus a full job x candidate recompute.
+
+Precomputes top-k lists for every job, then applies the two changes the
+updater handles between full runs: a batch of new candidates (append to the
+matrix, score against all jobs, merge into the lists) and an edited job
+(rescore one row). Each is checked against recomputing everything on the
+updated matrix. Database writes are not included. Run from backend/:
+
+    python -m benchmarks.bench_match_updates --candidates 100000 --jobs 1000 --new 50
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from app.services.match_precompute import blocked_top_k
+from app.services.matching import CandidateMatrix
+from benchmarks.bench_matching import make_candidates, make_job
+
+
+def merge(rows: np.ndarray, scores: np.ndarray, new_rows: np.ndarray, new_scores: np.ndarray, k: int):
+    """What $push with $each/$sort/$slice does to every stored list"""
+    all_rows = np.concatenate([rows, np.broadcast_to(new_rows, (len(rows), len(new_rows)))], axis=1)
+    all_scores = np.concatenate([scores, new_scores], axis=1)
+    all_scores = np.where(all_rows >= 0, all_scores, -np.inf)
+    order = np.argsort(-all_scores, axis=1, kind="stable")[:, :k]
+    return np.take_along_axis(all_rows, order, axis=1), np.take_along_axis(all_scores, order, axis=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--candidates", type=int, default=100_000)
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--new", type=int, default=50, help="Candidates in one upload batch")
+    parser.add_argument("--k", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = random.Random(15)
+    people = list(make_candidates(rng, args.candidates + args.new))
+    matrix = CandidateMatrix.build(people[:args.candidates], 262144)
+    jobs = [make_job(rng) for _ in range(args.jobs)]
+    queries = matrix.query_matrix(jobs)
+    rows, scores = blocked_top_k(matrix, queries, args.k, workers=1)
+    print(f"{args.jobs} jobs x {args.candidates} candidates, top {args.k} per job")
+
+    start = time.perf_counter()
+    matrix.append(people[args.candidates:])
+    vectors = matrix.matrix[args.candidates:]
+    new_scores = (queries @ vectors.T).toarray()
+    new_rows = np.arange(args.candidates, matrix.size)
+    merged_rows, merged_scores = merge(rows, scores, new_rows, np.where(new_scores > 0, new_scores, -np.inf), args.k)
+    incremental = time.perf_counter() - start
+
+    start = time.perf_counter()
+    full_rows, full_scores = blocked_top_k(matrix, queries, args.k, workers=1)
+    full = time.perf_counter() - start
+    same = sum(
+        np.allclose(m[m > 0], f[f > 0], atol=1e-5)
+        for m, f in zip(merged_scores, full_scores)
+    )
+    print(f"{args.new} new candidates: incremental {incremental * 1000:>8.1f} ms, "
+          f"full {full * 1000:>8.1f} ms ({full / incremental:.0f}x), same lists for {same}/{args.jobs} jobs")
+
+    edited = make_job(rng)
+    start = time.perf_counter()
+    one_rows, one_scores = blocked_top_k(matrix, matrix.query_matrix([edited]), args.k, workers=1)
+    single = time.perf_counter() - start
+    expected = matrix.top_k(matrix.query_vector(*edited), args.k)
+    assert np.allclose([s for _, s in expected], one_scores[0][one_rows[0] >= 0], atol=1e-5)
+    print(f"1 edited job:    incremental {single * 1000:>8.1f} ms, "
+          f"full {full * 1000:>8.1f} ms ({full / single:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
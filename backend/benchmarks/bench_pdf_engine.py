@@ -0,0 +1,140 @@
+"""
+PdfExtractionEngine versus the original sequential PyPDF2 loop.
+
+Parses a synthetic corpus of short resumes plus long, CV-style documents.
+The baseline is the pre-engine implementation: one page after another on the
+calling thread, building the text with repeated ``+=``. Run from backend/:
+
+    python -m benchmarks.bench_pdf_engine --docs 40 --long-docs 8 --long-pages 40
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import tempfile
+import time
+
+import PyPDF2
+
+from app.services.pdf_engine import PdfExtractionEngine, PdfExtractionError
+from benchmarks.corpus import make_resume_pdf
+
+
+def legacy_extract_text(file_path: str):
+    """The original extract_text_from_pdf loop"""
+    with open(file_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        num_pages = len(pdf_reader.pages)
+        extracted_text = ""
+        for page in pdf_reader.pages:
+            extracted_text += page.extract_text() + "\n"
+        return extracted_text.strip(), num_pages
+
+
+async def max_loop_stall(work) -> float:
+    """Run ``work`` while measuring the longest gap between event loop ticks"""
+    stall = 0.0
+    done = False
+
+    async def heartbeat():
+        nonlocal stall
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            stall = max(stall, now - last)
+            last = now
+
+    ticker = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0)
+    try:
+        result = await work
+    finally:
+        done = True
+        await ticker
+    return result, stall
+
+
+def write_corpus(directory: str, docs: int, long_docs: int, long_pages: int):
+    rng = random.Random(7)
+    paths = []
+    for i in range(docs + long_docs):
+        pages = long_pages if i >= docs else rng.randint(1, 3)
+        path = os.path.join(directory, f"doc_{i}.pdf")
+        with open(path, "wb") as f:
+            f.write(make_resume_pdf(rng, pages=pages))
+        paths.append(path)
+    return paths
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--docs", type=int, default=40, help="Short resumes (1-3 pages)")
+    parser.add_argument("--long-docs", type=int, default=8, help="Long documents")
+    parser.add_argument("--long-pages", type=int, default=40, help="Pages per long document")
+    parser.add_argument("--workers", type=int, default=0, help="Engine workers, 0 = one per CPU")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_corpus(directory, args.docs, args.long_docs, args.long_pages)
+        total_pages = args.docs * 2 + args.long_docs * args.long_pages
+
+        start = time.perf_counter()
+        legacy = [legacy_extract_text(path) for path in paths]
+        legacy_time = time.perf_counter() - start
+
+        engine = PdfExtractionEngine(workers=args.workers or None)
+        workers = engine.pool._max_workers
+        try:
+            await engine.warm_up()
+            start = time.perf_counter()
+            results, engine_stall = await max_loop_stall(
+                asyncio.gather(*(engine.extract(path) for path in paths))
+            )
+            engine_time = time.perf_counter() - start
+
+            # Longest single document on its own, to show page-level parallelism
+            longest = paths[-1]
+            start = time.perf_counter()
+            legacy_extract_text(longest)
+            legacy_single = time.perf_counter() - start
+            start = time.perf_counter()
+            await engine.extract(longest)
+            engine_single = time.perf_counter() - start
+
+            # A document that cannot finish within its budget fails fast
+            tight = PdfExtractionEngine(workers=1, timeout=0.001)
+            await tight.warm_up()
+            start = time.perf_counter()
+            try:
+                await tight.extract(longest)
+                timeout_outcome = "completed"
+            except PdfExtractionError as e:
+                timeout_outcome = f"failed: {e}"
+            timeout_time = time.perf_counter() - start
+            tight.shutdown()
+
+            # Queueing behind other documents is not charged against a document's budget
+            queued = PdfExtractionEngine(workers=1, timeout=max(engine_single * 3, 0.02))
+            await queued.warm_up()
+            outcomes = await asyncio.gather(*(queued.extract(path) for path in paths), return_exceptions=True)
+            queued.shutdown()
+            assert not any(isinstance(o, Exception) for o in outcomes), "a queued document timed out"
+        finally:
+            engine.shutdown()
+
+        assert [r for r in results] == legacy, "engine output differs from the sequential loop"
+
+        print(f"{len(paths)} documents, ~{total_pages} pages, {workers} workers")
+        print(f"{'':24} {'legacy':>9} {'engine':>9} {'speedup':>8}")
+        print(f"{'whole corpus (s)':24} {legacy_time:>9.2f} {engine_time:>9.2f} {legacy_time / engine_time:>7.1f}x")
+        print(f"{f'{args.long_pages}-page document (s)':24} {legacy_single:>9.3f} {engine_single:>9.3f} {legacy_single / engine_single:>7.1f}x")
+        print(f"{'max event-loop stall (s)':24} {legacy_time:>9.3f} {engine_stall:>9.3f}")
+        print(f"timeout=1ms document: {timeout_outcome} after {timeout_time:.3f}s")
+        print(f"all {len(paths)} documents queued on one worker with a {queued.timeout:.3g}s budget: none timed out")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+"""
+Synthetic resume corpus shared by the benchmark scripts.
+
+Generates plausible resume text and minimal, valid text PDFs without any
+third-party PDF writer so the benchmarks run anywhere PyPDF2 is installed.
+"""
+import random
+from typing import List
+
+FIRST_NAMES = ["Alice", "Bob", "Carla", "Deepak", "Elena", "Farid", "Grace", "Hiro", "Ines", "Jonas"]
+LAST_NAMES = ["Nguyen", "Smith", "Kowalski", "Patel", "Garcia", "Okafor", "Muller", "Tanaka", "Rossi", "Berg"]
+SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "React", "Node.js", "Docker", "Kubernetes",
+    "AWS", "GCP", "SQL", "MongoDB", "PostgreSQL", "FastAPI", "Django", "Go", "Rust", "Terraform",
+    "Spark", "Pandas", "NumPy", "PyTorch", "TensorFlow", "Kafka", "Redis", "GraphQL", "C++", "Linux"
+]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises"]
+POSITIONS = ["Software Engineer", "Senior Software Engineer", "Data Scientist", "DevOps Engineer", "Tech Lead"]
+UNIVERSITIES = ["State University", "Institute of Technology", "City College", "Polytechnic University"]
+
+
+def make_resume_text(rng: random.Random, experience_entries: int = 4) -> str:
+    """Build the text of one synthetic resume"""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    lines = [
+        name,
+        f"{name.split()[0].lower()}.{name.split()[1].lower()}@example.com",
+        f"+1 555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        "Location: San Francisco, CA",
+        "",
+        "Summary",
+        "Engineer with a track record of shipping reliable distributed systems.",
+        "Enjoys mentoring and building developer tooling.",
+        "",
+        "Skills",
+        ", ".join(rng.sample(SKILLS, 8)),
+        ", ".join(rng.sample(SKILLS, 6)),
+        "",
+        "Experience",
+    ]
+    for _ in range(experience_entries):
+        start = rng.randint(2005, 2020)
+        lines.append(f"{rng.choice(POSITIONS)} at {rng.choice(COMPANIES)} ({start} - {start + rng.randint(1, 4)})")
+        lines.append(f"Built services in {rng.choice(SKILLS)} and {rng.choice(SKILLS)} serving millions of users.")
+        lines.append(f"Reduced infrastructure cost by {rng.randint(10, 60)} percent through profiling and caching.")
+    lines += [
+        "",
+        "Education",
+        f"B.Sc. Computer Science, {rng.choice(UNIVERSITIES)}, {rng.randint(2000, 2018)}",
+    ]
+    return "\n".join(lines)
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages: List[List[str]]) -> bytes:
+    """Build a minimal text PDF with one list of lines per page"""
+    objects = []
+    page_count = len(pages)
+    # 1: catalog, 2: pages, 3: font, then (page, content) pairs
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(page_count))
+    objects.append("<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {page_count} >>")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for i, lines in enumerate(pages):
+        ops = ["BT", "/F1 10 Tf", "14 TL", "50 780 Td"]
+        for line in lines:
+            ops.append(f"({_escape(line)}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return bytes(out)
+
+
+def make_resume_pdf(rng: random.Random, pages: int = 1) -> bytes:
+    """Build a synthetic resume PDF, splitting the text across pages"""
+    page_lines = []
+    for _ in range(pages):
+        page_lines.append(make_resume_text(rng).split("\n"))
+    return make_pdf(page_lines)
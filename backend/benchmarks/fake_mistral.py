@@ -0,0 +1,176 @@
+"""
+Local stand-in for the Mistral chat API.
+
+Answers ``GET /v1/models`` and ``POST /v1/chat/completions`` with a canned
+resume extraction built from the prompt, after an optional delay. The outage
+switch makes every endpoint return 503 until it is turned off again, which is
+enough to exercise the client manager's health probe and circuit breaker.
+A malformed rate makes some answers come back the way real models sometimes
+answer: fenced, wrapped in prose, truncated, or with the wrong field types.
+Point the backend at it with MISTRAL_SERVER_URL. Run from backend/:
+
+    python -m benchmarks.fake_mistral --port 8089 --latency 0.5
+    MISTRAL_API_KEY=fake MISTRAL_SERVER_URL=http://127.0.0.1:8089 uvicorn app.main:app
+
+Toggle an outage with ``curl -X POST 127.0.0.1:8089/_fake/outage?enabled=true``.
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import socket
+import time
+import uuid
+from contextlib import asynccontextmanager
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from benchmarks.corpus import SKILLS
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.]+")
+JOB_RE = re.compile(r"^(.+?) at (.+?) \((\d{4}) - (\d{4})\)$", re.MULTILINE)
+
+
+class FakeMistralState:
+    """Knobs and counters shared by the fake endpoints"""
+
+    def __init__(self, latency: float = 0.0, outage: bool = False, token_latency: float = 0.0, malformed_rate: float = 0.0):
+        self.latency = latency
+        self.token_latency = token_latency
+        self.outage = outage
+        self.malformed_rate = malformed_rate
+        self.rng = random.Random(0)
+        self.requests = 0
+        self.chat_requests = 0
+
+
+def fake_extraction(prompt: str) -> dict:
+    """
+    A plausible ResumeExtraction for the resume text embedded in ``prompt``.
+
+    Understands the layout of benchmarks.corpus resumes: the name is the first
+    line, skills are the known skill names present, jobs are "<position> at
+    <company> (<start> - <end>)" lines.
+    """
+    text = prompt.split("Resume Text:", 1)[-1].strip()
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    email = EMAIL_RE.search(text)
+    partial = prompt.startswith("This is part")
+    return {
+        "full_name": "" if partial and not email else (lines[0] if lines else "Unknown"),
+        "email": email.group(0) if email else None,
+        "skills": [{"name": skill} for skill in SKILLS if skill in text],
+        "experience": [
+            {"position": position, "company": company, "start_date": start, "end_date": end}
+            for position, company, start, end in JOB_RE.findall(text)
+        ],
+        "education": [],
+        "certifications": [],
+        "languages": ["English"]
+    }
+
+
+def malform(extraction: dict, kind: str) -> str:
+    """Serialize ``extraction`` with one of the defects seen in real model output"""
+    body = json.dumps(extraction)
+    if kind == "fence":
+        return f"```json\n{body}\n```"
+    if kind == "prose":
+        return f"Here is the extracted data:\n{body}\nLet me know if you need anything else."
+    if kind == "truncated":
+        return body[:int(len(body) * 0.8)]
+    # Wrong types: bare skill names and a scalar where a list is expected
+    wrong = dict(extraction, skills=[s["name"] for s in extraction["skills"]], languages="English")
+    return json.dumps(wrong)
+
+
+MALFORMATIONS = ("fence", "prose", "truncated", "types")
+
+
+def create_app(state: FakeMistralState) -> FastAPI:
+    app = FastAPI(title="Fake Mistral")
+
+    @app.middleware("http")
+    async def simulate(request: Request, call_next):
+        if request.url.path.startswith("/_fake"):
+            return await call_next(request)
+        state.requests += 1
+        if state.outage:
+            return JSONResponse({"message": "Service unavailable"}, status_code=503)
+        if state.latency:
+            await asyncio.sleep(state.latency)
+        return await call_next(request)
+
+    @app.get("/v1/models")
+    async def list_models():
+        return {"object": "list", "data": [{"id": "mistral-small-latest", "object": "model", "type": "base", "capabilities": {"completion_chat": True}}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        state.chat_requests += 1
+        body = await request.json()
+        prompt = body["messages"][-1]["content"]
+        if state.token_latency:
+            # Models take longer on longer prompts
+            await asyncio.sleep(state.token_latency * len(prompt) / 4)
+        extraction = fake_extraction(prompt)
+        if state.rng.random() < state.malformed_rate:
+            content = malform(extraction, state.rng.choice(MALFORMATIONS))
+        else:
+            content = json.dumps(extraction)
+        return {
+            "id": uuid.uuid4().hex,
+            "object": "chat.completion",
+            "model": body.get("model", "mistral-small-latest"),
+            "created": int(time.time()),
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": 100, "total_tokens": len(prompt) // 4 + 100},
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }]
+        }
+
+    @app.post("/_fake/outage")
+    async def set_outage(enabled: bool = True):
+        state.outage = enabled
+        return {"outage": state.outage}
+
+    @app.get("/_fake/stats")
+    async def stats():
+        return {"requests": state.requests, "chat_requests": state.chat_requests, "outage": state.outage}
+
+    return app
+
+
+@asynccontextmanager
+async def running_fake_mistral(state: FakeMistralState):
+    """Serve the fake API on a free local port for the duration of the block, yielding its URL"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(create_app(state), port=port, log_level="error"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        await serving
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each response")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Extra seconds per prompt token")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Fraction of malformed answers")
+    parser.add_argument("--outage", action="store_true", help="Start with the API returning 503")
+    args = parser.parse_args()
+    state = FakeMistralState(args.latency, args.outage, args.token_latency, args.malformed_rate)
+    uvicorn.run(create_app(state), host=args.host, port=args.port)
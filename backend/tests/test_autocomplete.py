@@ -0,0 +1,117 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.services import autocomplete as autocomplete_module
+from app.services.autocomplete import AutocompleteService
+
+ADA = "65a000000000000000000001"
+GRACE = "65a000000000000000000002"
+
+
+class Vocabulary:
+    loaded = True
+
+    def name(self, skill_id):
+        return {1: "Python", 2: "Rust"}.get(skill_id)
+
+
+def candidate(candidate_id: str, name: str, company: str, skill_ids=()):
+    return SimpleNamespace(
+        id=candidate_id,
+        full_name=name,
+        skill_ids=list(skill_ids),
+        experience=[SimpleNamespace(company=company)]
+    )
+
+
+def row(c):
+    return {"_id": c.id, "full_name": c.full_name, "skill_ids": c.skill_ids,
+            "companies": [e.company for e in c.experience]}
+
+
+class FakeCollection:
+    """Yields stored rows, running ``during_read`` before the first one as if writes raced the read"""
+
+    def __init__(self, rows, during_read):
+        self.rows, self.during_read = rows, during_read
+
+    async def aggregate(self, pipeline):
+        self.during_read()
+        for r in self.rows:
+            await asyncio.sleep(0)
+            yield r
+
+
+class FakeJobs:
+    def __init__(self, jobs):
+        self.jobs = jobs
+
+    def find_all(self):
+        return self
+
+    def project(self, model):
+        return self
+
+    async def __aiter__(self):
+        for job in self.jobs:
+            yield job
+
+
+def run_rebuild(monkeypatch, service, candidate_rows, jobs, during_read):
+    collection = FakeCollection(candidate_rows, during_read)
+    monkeypatch.setattr(autocomplete_module, "Candidate", SimpleNamespace(get_pymongo_collection=lambda: collection))
+    fake_jobs = FakeJobs(jobs)
+    monkeypatch.setattr(autocomplete_module, "Job", SimpleNamespace(find_all=fake_jobs.find_all))
+    asyncio.run(service.rebuild())
+
+
+def suggested(service, prefix, kind):
+    return dict((text, count) for k, text, count in service.suggest(prefix, [kind]) if k == kind)
+
+
+def test_candidate_added_and_deleted_around_a_rebuild(monkeypatch):
+    service = AutocompleteService(Vocabulary())
+    ada = candidate(ADA, "Ada Lovelace", "Initech", [1])
+    grace = candidate(GRACE, "Grace Hopper", "Initech", [1, 2])
+    # Grace is inserted while the rebuild runs and is already in the rows it reads
+    run_rebuild(monkeypatch, service, [row(ada), row(grace)], [],
+                during_read=lambda: service.add_candidates([grace]))
+
+    assert suggested(service, "gra", "name") == {"Grace Hopper": 1}
+    assert suggested(service, "ini", "company") == {"Initech": 2}
+
+    service.remove_candidate(grace)
+    assert suggested(service, "gra", "name") == {}
+    assert suggested(service, "rus", "skill") == {}
+    assert suggested(service, "ini", "company") == {"Initech": 1}
+
+
+def test_delete_the_read_already_missed_is_not_subtracted_again(monkeypatch):
+    service = AutocompleteService(Vocabulary())
+    ada = candidate(ADA, "Ada Lovelace", "Initech")
+    grace = candidate(GRACE, "Grace Hopper", "Initech")
+    service.add_candidates([ada, grace])
+    # Grace is deleted during the rebuild, before the read reaches her
+    run_rebuild(monkeypatch, service, [row(ada)], [],
+                during_read=lambda: service.remove_candidate(grace))
+
+    assert suggested(service, "ini", "company") == {"Initech": 1}
+    assert suggested(service, "ada", "name") == {"Ada Lovelace": 1}
+
+
+def test_job_title_changes_during_a_rebuild(monkeypatch):
+    service = AutocompleteService(Vocabulary())
+    jobs = [SimpleNamespace(id="j1", title="Data Engineer"), SimpleNamespace(id="j2", title="Data Engineer")]
+
+    def writes():
+        service.job_title_changed("j2", "Data Engineer")  # created; the read sees it
+        service.job_title_changed("j3", "Data Analyst")   # created and deleted before the read
+        service.job_title_changed("j3", None)
+
+    run_rebuild(monkeypatch, service, [], jobs, during_read=writes)
+    assert suggested(service, "data", "job_title") == {"Data Engineer": 2}
+
+    service.job_title_changed("j1", "Platform Engineer")
+    service.job_title_changed("j2", None)
+    assert suggested(service, "data", "job_title") == {}
+    assert suggested(service, "plat", "job_title") == {"Platform Engineer": 1}
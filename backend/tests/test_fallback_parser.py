@@ -0,0 +1,35 @@
+import pytest
+
+from app.services.fallback_parser import parse_resume_text
+
+
+def experience_of(line: str):
+    [job] = parse_resume_text(f"Jane Doe\nExperience\n{line}").experience
+    return job
+
+
+@pytest.mark.parametrize("line, position, company, start, end", [
+    ("Software Engineer, Google 2019 - Present", "Software Engineer", "Google", "2019", "Present"),
+    ("Analyst at Deloitte Consulting 2016 - 2019", "Analyst", "Deloitte Consulting", "2016", "2019"),
+    ("Manager | Marketing Corp | Mar 2012 - Sept. 2015", "Manager", "Marketing Corp", "Mar 2012", "Sept. 2015"),
+    ("Data Scientist @ Initech (January 2020 to now)", "Data Scientist", "Initech", "January 2020", "Present"),
+])
+def test_date_range_keeps_company(line, position, company, start, end):
+    job = experience_of(line)
+    assert (job.position, job.company, job.start_date, job.end_date) == (position, company, start, end)
+
+
+def test_institution_excludes_date_range():
+    [school] = parse_resume_text("Jane Doe\nEducation\nStanford University 2011 - 2015").education
+    assert school.institution == "Stanford University"
+    assert (school.start_date, school.end_date) == ("2011", "2015")
+
+
+def test_degree_and_institution_on_one_line():
+    [school] = parse_resume_text(
+        "Jane Doe\nEducation\nB.S. Computer Science, Massachusetts Institute of Technology (2007-2011)"
+    ).education
+    assert school.degree == "B.S."
+    assert school.field_of_study == "Computer Science"
+    assert school.institution == "Massachusetts Institute of Technology"
+    assert school.end_date == "2011"
@@ -0,0 +1,34 @@
+from types import SimpleNamespace
+
+from app.services.fuzzy_index import CandidateFuzzyIndex
+
+
+def candidate(candidate_id: str, name: str):
+    return SimpleNamespace(id=candidate_id, full_name=name, email=None, skills=[])
+
+
+def test_add_during_rebuild_survives_replay():
+    index = CandidateFuzzyIndex()
+    # What rebuild() does around its MongoDB read: record writes, swap in the fresh index, replay
+    pending = index._pending = []
+    index.add([candidate("c1", "Margaret Hamilton")])
+    index._pending = None
+    index.indexes, index._holders, index._values = CandidateFuzzyIndex().indexes, {}, {}
+    for op, arg in pending:
+        op(arg)
+
+    assert len(index) == 1
+    assert [hit[0] for hit in index.search("Margret Hamilton", ["name"])] == ["c1"]
+
+
+def test_remove_during_rebuild_is_replayed():
+    index = CandidateFuzzyIndex()
+    index.add([candidate("c1", "Margaret Hamilton")])
+    pending = index._pending = []
+    index.remove("c1")
+    index._pending = None
+    for op, arg in pending:
+        op(arg)
+
+    assert len(index) == 0
+    assert index.search("Margaret Hamilton", ["name"]) == []
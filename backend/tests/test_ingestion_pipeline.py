@@ -0,0 +1,23 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.services.ingestion_pipeline import FileOutcome, IngestionPipeline
+
+
+def test_failing_post_insert_hook_does_not_fail_the_batch():
+    async def no_write(candidates):
+        pass
+
+    async def broken_hook(candidates):
+        raise RuntimeError("index unavailable")
+
+    pipeline = IngestionPipeline(extractor=None, on_inserted=broken_hook)
+    pipeline._insert_candidates = no_write
+    upload = SimpleNamespace(filename="a.pdf", path="/tmp/a.pdf", content_hash="abc")
+    buffer = [(FileOutcome(0, upload), SimpleNamespace(id="c1"))]
+
+    asyncio.run(pipeline._flush(buffer))
+
+    outcome = buffer[0][0]
+    assert outcome.state == "succeeded"
+    assert outcome.keep_file
@@ -0,0 +1,35 @@
+import pytest
+
+from app.services.job_parser import parse_job_text, parse_salary
+
+
+@pytest.mark.parametrize("text", [
+    "3-5 years of experience; competitive salary",
+    "Competitive pay and 25-30 days of paid holiday",
+    "Base: Berlin office, 2-3 days on site",
+    "Call 555-1234 for pay details",
+    "10-15% travel, rate of growth",
+    "Pay grade 7-8",
+    "Team of 8-12 engineers, salary to be discussed",
+])
+def test_ranges_that_are_not_pay(text):
+    assert parse_salary(text) is None
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("$120k-$150k", (120000, 150000, "USD", None)),
+    ("USD 90,000 - 110,000", (90000, 110000, "USD", None)),
+    ("Salary: 80,000 - 100,000 per year", (80000, 100000, None, "year")),
+    ("Salary range 80-100k", (80000, 100000, None, None)),
+    ("€60.000 - €75.000 p.a.", (60000, 75000, "EUR", "year")),
+    ("£40 - 50 per hour", (40, 50, "GBP", "hour")),
+    ("Hourly rate: 45-60", (45, 60, None, None)),
+    ("Up to $200k", (None, 200000, "USD", None)),
+])
+def test_salaries(text, expected):
+    assert parse_salary(text) == expected
+
+
+def test_salary_found_after_experience_range():
+    job = parse_job_text("Senior Data Engineer\n3-5 years of experience\nSalary: $130,000 - $160,000 per year")
+    assert (job.salary_min, job.salary_max, job.salary_currency, job.salary_period) == (130000, 160000, "USD", "year")
@@ -0,0 +1,108 @@
+import asyncio
+import random
+
+import httpx
+
+from app.services.llm_client import CircuitBreaker, MistralClientManager
+from app.services.resume_extractor import ResumeExtractor
+from benchmarks.corpus import make_resume_text
+from benchmarks.fake_mistral import FakeMistralState, running_fake_mistral
+
+FAILURE_THRESHOLD = 3
+RESET_TIMEOUT = 0.3
+
+
+async def run_against_fake_api(scenario):
+    """Run ``scenario(state, manager, extractor)`` against the fake Mistral API on a local port"""
+    state = FakeMistralState()
+    async with running_fake_mistral(state) as url:
+        manager = MistralClientManager(
+            api_key="fake",
+            server_url=url,
+            breaker=CircuitBreaker(failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT)
+        )
+        extractor = ResumeExtractor(client_manager=manager)
+        try:
+            await scenario(state, manager, extractor)
+        finally:
+            await manager.aclose()
+
+
+def resume_texts(count: int):
+    rng = random.Random(5)
+    return [make_resume_text(rng) for _ in range(count)]
+
+
+def test_breaker_opens_after_outage_errors_and_skips_the_api():
+    async def scenario(state, manager, extractor):
+        texts = resume_texts(FAILURE_THRESHOLD + 3)
+        _, source = await extractor.extract_with_source_async(texts[0], 1)
+        assert source == "llm"
+
+        state.outage = True
+        for text in texts[:FAILURE_THRESHOLD]:
+            assert manager.breaker.state == CircuitBreaker.CLOSED
+            _, source = await extractor.extract_with_source_async(text, 1)
+            assert source == "fallback"
+        assert manager.breaker.state == CircuitBreaker.OPEN
+
+        # While open, extractions go to the fallback parser without reaching the endpoint
+        fallback_calls = []
+        parse = extractor._fallback_extraction
+        extractor._fallback_extraction = lambda *args: fallback_calls.append(args) or parse(*args)
+        requests_before = state.requests
+        for text in texts[FAILURE_THRESHOLD:]:
+            _, source = await extractor.extract_with_source_async(text, 1)
+            assert source == "fallback"
+        assert state.requests == requests_before
+        assert len(fallback_calls) == 3
+
+    asyncio.run(run_against_fake_api(scenario))
+
+
+def test_half_open_probe_closes_the_breaker():
+    async def scenario(state, manager, extractor):
+        state.outage = True
+        for _ in range(FAILURE_THRESHOLD):
+            assert not await manager.probe()
+        assert manager.breaker.state == CircuitBreaker.OPEN
+
+        state.outage = False
+        await asyncio.sleep(RESET_TIMEOUT)
+        assert manager.breaker.state == CircuitBreaker.HALF_OPEN
+        assert await manager.probe()
+        assert manager.breaker.state == CircuitBreaker.CLOSED
+
+        _, source = await extractor.extract_with_source_async(resume_texts(1)[0], 1)
+        assert source == "llm"
+
+    asyncio.run(run_against_fake_api(scenario))
+
+
+def test_failed_half_open_probe_reopens_the_breaker():
+    async def scenario(state, manager, extractor):
+        state.outage = True
+        for _ in range(FAILURE_THRESHOLD):
+            await manager.probe()
+        await asyncio.sleep(RESET_TIMEOUT)
+        assert manager.breaker.state == CircuitBreaker.HALF_OPEN
+        assert not await manager.probe()
+        assert manager.breaker.state == CircuitBreaker.OPEN
+
+    asyncio.run(run_against_fake_api(scenario))
+
+
+def test_non_outage_error_counts_as_success():
+    # The API answered, so a bad request or an unparseable reply says nothing about availability
+    manager = MistralClientManager(api_key="fake", breaker=CircuitBreaker(failure_threshold=FAILURE_THRESHOLD))
+    for _ in range(FAILURE_THRESHOLD - 1):
+        manager.record_error(httpx.ConnectError("refused"))
+    assert manager.breaker.failures == FAILURE_THRESHOLD - 1
+
+    manager.record_error(ValueError("response is not valid JSON"))
+    assert manager.breaker.failures == 0
+    assert manager.breaker.state == CircuitBreaker.CLOSED
+
+    for _ in range(FAILURE_THRESHOLD):
+        manager.record_error(httpx.ConnectError("refused"))
+    assert manager.breaker.state == CircuitBreaker.OPEN
@@ -1,6 +1,7 @@
 import React, { useState, useCallback } from 'react';
 import { useDropzone } from 'react-dropzone';
 import { Upload, CheckCircle, FileText } from 'lucide-react';
+import apiService from '../../services/api';
 
 const CandidateUpload = ({ onUploadSuccess, onUploadError }) => {
   const [uploading, setUploading] = useState(false);
@@ -36,7 +37,8 @@ const CandidateUpload = ({ onUploadSuccess, onUploadError }) => {
         throw new Error(`Upload failed: ${response.statusText}`);
       }
 
-      const result = await response.json();
+      const batch = await response.json();
+      const result = await apiService.waitForUploadBatch(batch.batch_id);
       setUploadResults(result.results || []);
       
       if (onUploadSuccess) {
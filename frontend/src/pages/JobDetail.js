@@ -85,7 +85,8 @@ const JobDetail = () => {
         throw new Error(errorData.detail || `Upload failed: ${response.statusText}`);
       }
 
-      await response.json();
+      const batch = await response.json();
+      await apiService.waitForUploadBatch(batch.batch_id);
       alert('Resume uploaded successfully!');
       setUploadedFile(null);
       fetchJobCandidates();
@@ -97,6 +97,24 @@ class ApiService {
     return this.request(`/candidates/${candidateId}`);
   }
 
+  async getUploadBatch(batchId) {
+    return this.request(`/candidates/batches/${batchId}`);
+  }
+
+  // Poll an upload batch until processing finishes, returning its BatchExtractionResult
+  async waitForUploadBatch(batchId, intervalMs = 1000) {
+    for (;;) {
+      const batch = await this.getUploadBatch(batchId);
+      if (batch.status === 'completed') {
+        return batch.result;
+      }
+      if (batch.status === 'failed') {
+        throw new Error('Resume processing failed');
+      }
+      await new Promise((resolve) => setTimeout(resolve, intervalMs));
+    }
+  }
+
   // Applications API
   async getApplications(params = {}) {
     const queryParams = new URLSearchParams();
@@ -7,7 +7,8 @@ db.createCollection('users');
 db.createCollection('jobs');
 
 // Create indexes for better performance
-db.candidates.createIndex({ "filename": 1 }, { unique: true });
+db.candidates.createIndex({ "filename": 1 });
+db.candidates.createIndex({ "content_hash": 1 });
 db.candidates.createIndex({ "email": 1 });
 db.candidates.createIndex({ "full_name": 1 });
 db.candidates.createIndex({ "uploaded_by": 1 });